@@ -78,12 +78,15 @@ setup(
     extras_require={
         'dev': ['check-manifest'],
         'test': ['coverage'],
+        'fast': ['simplejson'],
+        'numpy': ['numpy'],
     },
 
     entry_points={
         'console_scripts': [
             'krakencli=krakencli.main:main',
             'venice=venice.venice:main',
+            'venice-backfill=venice.store.backfill:main',
         ],
     },
 
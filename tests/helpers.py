@@ -0,0 +1,66 @@
+import random
+
+from decimal import Decimal
+from urllib.parse import parse_qs, urlsplit
+
+from venice.api.ohlc import OHLC
+
+# Time of the first fake candle and candle lengths, in milliseconds
+TIME = 1514764800000
+PERIOD = 900000
+HOUR = 3600000
+
+
+def prices(count, seed=1, start=50, step=100000, places=5, minimum=1):
+    """Random walk of count Decimal prices with places decimals, moving at most step units of the
+    last place each time and kept above minimum."""
+    generator = random.Random(seed)
+    price = Decimal(start)
+    result = []
+
+    for _ in range(count):
+        price = max(price + Decimal(generator.randint(-step, step)).scaleb(-places),
+                    Decimal(minimum))
+        result.append(price)
+
+    return result
+
+
+def flat_candles(close, period=PERIOD):
+    """Candles with open, high, low and close all at each of the close prices."""
+    return [OHLC(TIME + x * period, y, y, y, y, 1) for x, y in enumerate(close)]
+
+
+class FakeAPI:
+    """Exchange API serving the latest of a list of candles, counting the requests."""
+    def __init__(self, candles, precision=5):
+        self.candles = candles
+        self.pairs = {'ltcusd': type('Pair', (), {'precision': precision})}
+        self.requests = 0
+
+    def ohlc(self, pair, period, limit=100):
+        self.requests += 1
+        return self.candles[-limit:]
+
+
+class FakeCandles:
+    """Bitfinex candles endpoint serving count candles, honouring limit, start, end and sort.
+
+    The number of candles of each response is kept in ``returned``.
+    """
+    def __init__(self, count, period=PERIOD):
+        self.candles = [[TIME + x * period, 50, 50 + x, 52 + x, 49, 10] for x in range(count)]
+        self.returned = []
+
+    def __call__(self, path):
+        query = {x: y[0] for x, y in parse_qs(urlsplit(path).query).items()}
+        result = [x for x in self.candles if int(query.get('start', 0)) <= x[0] <= int(
+            query.get('end', x[0]))]
+
+        if query.get('sort') != '1':
+            result = result[::-1]
+
+        result = result[:int(query['limit'])]
+        self.returned.append(len(result))
+
+        return 200, result
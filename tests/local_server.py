@@ -0,0 +1,165 @@
+import json
+import os
+import tempfile
+import threading
+import time
+
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from websockets.sync.server import serve
+from urllib.parse import urlsplit
+
+from venice.api.bitfinex import BitfinexAPI
+
+# Bitfinex responses shared by the tests
+TICKER = {
+    'mid': '50.5', 'bid': '50.0', 'ask': '51.0', 'last_price': '50.2', 'low': '49.0',
+    'high': '52.0', 'volume': '1000.0', 'timestamp': '1514764800.0',
+}
+
+CANDLES = [[1514764800000 - x * 900000, 50, 51, 52, 49, 10] for x in range(5)]
+
+FEES = {'maker_fee': '0.001', 'taker_fee': '0.002'}
+
+ROUTES = {
+    '/v1/pubticker/ltcusd': TICKER,
+    '/v1/summary': FEES,
+    '/v1/orders': [],
+    '/v2/candles/trade:15m:tLTCUSD/hist': CANDLES,
+}
+
+
+class LocalServer:
+    """Local stand-in for an exchange HTTP API.
+
+    Routes map a path (without query string) to either a JSON serializable body or a callable
+    receiving the request path and returning ``(status, body)``. Every request is recorded and the
+    number of accepted TCP connections is counted.
+    """
+    def __init__(self, routes=None, delay=0):
+        self.routes = routes or {}
+        self.delay = delay
+
+        self.requests = []
+        self.connections = 0
+
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, type_, value, traceback):
+        self._server.shutdown()
+        self._server.server_close()
+
+    @property
+    def uri(self):
+        return 'http://127.0.0.1:{}/'.format(self._server.server_address[1])
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def setup(self):
+                super().setup()
+
+                with server._lock:
+                    server.connections += 1
+
+            def do_GET(self):
+                self._respond()
+
+            def do_POST(self):
+                self._respond()
+
+            def log_message(self, *args):
+                pass
+
+            def _respond(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length) if length else b''
+
+                with server._lock:
+                    server.requests.append((self.command, self.path, dict(self.headers), body))
+
+                if server.delay:
+                    time.sleep(server.delay)
+
+                route = server.routes.get(urlsplit(self.path).path)
+
+                if route is None:
+                    status, result = 404, {'message': 'not found'}
+
+                elif callable(route):
+                    status, result = route(self.path)
+
+                else:
+                    status, result = 200, route
+
+                data = result if isinstance(result, bytes) else json.dumps(result).encode('utf-8')
+
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
+
+
+class FakeKeyHome:
+    """Point HOME to a temporary directory holding dummy exchange key files."""
+    def __init__(self, names=('.bitfinex.key', '.kraken.key')):
+        self.names = names
+
+    def __enter__(self):
+        self._home = tempfile.TemporaryDirectory()
+
+        for name in self.names:
+            with open(os.path.join(self._home.name, name), 'w') as f:
+                f.write('key\nc2VjcmV0\n')
+
+        self._environ = mock.patch.dict(os.environ, {'HOME': self._home.name})
+        self._environ.start()
+
+        return self._home.name
+
+    def __exit__(self, type_, value, traceback):
+        self._environ.stop()
+        self._home.cleanup()
+
+
+class LocalWebSocketServer:
+    """Local stand-in for an exchange WebSocket API, calling handler for each connection."""
+    def __init__(self, handler):
+        self._server = serve(handler, '127.0.0.1', 0)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, type_, value, traceback):
+        self._server.shutdown()
+
+    @property
+    def uri(self):
+        return 'ws://127.0.0.1:{}'.format(self._server.socket.getsockname()[1])
+
+
+@contextmanager
+def local_bitfinex(routes=None, **kwargs):
+    """Yield a LocalServer answering routes (ROUTES by default) and a BitfinexAPI using it, with
+    dummy key files."""
+    with FakeKeyHome(), LocalServer(ROUTES if routes is None else routes, **kwargs) as server, \
+            BitfinexAPI(uri=server.uri) as api:
+        yield server, api
@@ -0,0 +1,101 @@
+import logging
+import logging.config
+import unittest
+
+from decimal import Decimal
+
+from venice.api.aggregator import CandleAggregator, resample
+from venice.api.api import ExchangeAPI
+from venice.api.ohlc import OHLC
+
+from .helpers import HOUR, TIME, FakeCandles
+from .local_server import local_bitfinex
+
+logging.config.fileConfig('logging_tests.conf')
+
+
+def hours(count, first=0):
+    return [OHLC(TIME + x * HOUR, 50 + x, 60 + x, 40 - x, 51 + x, 10) for x in range(
+        first, first + count)]
+
+
+class TestCandleAggregator(unittest.TestCase):
+    def test_resample(self):
+        candles = resample(hours(10), 4 * HOUR)
+
+        self.assertEqual([x.time for x in candles], [TIME, TIME + 4 * HOUR, TIME + 8 * HOUR])
+        self.assertEqual([x.open_ for x in candles], [50, 54, 58])
+        self.assertEqual([x.close for x in candles], [54, 58, 60])
+        self.assertEqual([x.high for x in candles], [63, 67, 69])
+        self.assertEqual([x.low for x in candles], [37, 33, 31])
+        self.assertEqual([x.volume for x in candles], [40, 40, 20])
+
+    def test_incremental(self):
+        aggregator = CandleAggregator(4 * HOUR, size=10)
+        aggregator.add_candles(hours(6))
+
+        # Forming candle replaced and a new one added
+        forming = OHLC(TIME + 5 * HOUR, 55, 100, 35, 80, 20)
+        aggregator.add_candles([forming] + hours(1, 6))
+
+        # Sources of a closed candle are ignored
+        aggregator.add_candles([OHLC(TIME, 1, 1, 1, 1, 1)])
+
+        candles = aggregator.ohlc(2)
+
+        self.assertEqual(candles[0].high, 63)
+        self.assertEqual(candles[1].high, 100)
+        self.assertEqual(candles[1].close, 57)
+        self.assertEqual(candles[1].volume, 40)
+
+    def test_trades(self):
+        aggregator = CandleAggregator(60000)
+        trades = [(1, TIME, 1, 50), (2, TIME + 1000, -2, 52), (3, TIME + 2000, Decimal('0.5'), 49)]
+
+        aggregator.add_trades(trades)
+        aggregator.add_trades(trades[1:] + [(4, TIME + 60000, 1, 51)])
+
+        candles = aggregator.ohlc(2)
+
+        self.assertEqual([(x.open_, x.high, x.low, x.close) for x in candles], [
+            (50, 52, 49, 49), (51, 51, 51, 51)])
+        self.assertEqual(candles[0].volume, Decimal('3.5'))
+        self.assertEqual(candles[0].count, 3)
+
+    def test_period_seconds(self):
+        self.assertEqual(ExchangeAPI.period_seconds('15'), 900)
+        self.assertEqual(ExchangeAPI.period_seconds('15m'), 900)
+        self.assertEqual(ExchangeAPI.period_seconds('4h'), 14400)
+        self.assertEqual(ExchangeAPI.period_seconds('1D'), 86400)
+        self.assertEqual(ExchangeAPI.period_seconds('2w'), 1209600)
+
+        for period in ('0', '0h', '-15', '-1d'):
+            with self.assertRaises(ValueError):
+                ExchangeAPI.period_seconds(period)
+
+    def test_api(self):
+        candles = FakeCandles(100, HOUR)
+
+        with local_bitfinex({'/v2/candles/trade:1h:tLTCUSD/hist': candles}) as (server, api):
+            result = api.ohlc(ExchangeAPI.LTCUSD, ExchangeAPI.P4H, limit=10)
+
+            candles.candles.append([TIME + 100 * HOUR, 150, 150, 152, 49, 10])
+            updated = api.ohlc(ExchangeAPI.LTCUSD, ExchangeAPI.P4H, limit=10)
+            history = api.ohlc_history(ExchangeAPI.LTCUSD, ExchangeAPI.P4H, TIME + HOUR,
+                                       TIME + 12 * HOUR)
+
+        self.assertEqual([x.time for x in result], [TIME + x * 4 * HOUR for x in range(15, 25)])
+        self.assertEqual(result[-1].close, 149)
+        self.assertEqual(updated[-1].time, TIME + 100 * HOUR)
+        self.assertEqual(updated[-1].volume, 10)
+        self.assertEqual([x.time for x in history], [TIME + 4 * HOUR, TIME + 8 * HOUR])
+        self.assertEqual(history[-1].volume, 40)
+
+    def test_trades_endpoint(self):
+        routes = {'/v2/trades/tLTCUSD/hist': [[2, TIME + 1, -0.5, 50.1], [1, TIME, 0.2, 50.0]]}
+
+        with local_bitfinex(routes) as (server, api):
+            trades = api.trades(ExchangeAPI.LTCUSD, limit=2)
+
+        self.assertEqual([x[0] for x in trades], [1, 2])
+        self.assertEqual(server.requests[0][1], '/v2/trades/tLTCUSD/hist?limit=2&sort=0')
@@ -0,0 +1,85 @@
+import asyncio
+import logging
+import logging.config
+import time
+import unittest
+
+from venice.api import AsyncBitfinexAPI
+from venice.api.api import ExchangeAPI
+
+from .local_server import ROUTES, TICKER, FakeKeyHome, LocalServer, local_bitfinex
+
+logging.config.fileConfig('logging_tests.conf')
+
+DELAY = 0.3
+
+
+class TestAsyncBitfinexAPI(unittest.TestCase):
+    def test_cycle(self):
+        async def cycle(api):
+            return await asyncio.gather(
+                api.ticker(ExchangeAPI.LTCUSD),
+                api.ohlc(ExchangeAPI.LTCUSD, ExchangeAPI.P15, limit=5),
+                api.fees(),
+                api.active_orders(ExchangeAPI.LTCUSD))
+
+        async def run(uri):
+            async with AsyncBitfinexAPI(uri=uri) as api:
+                return await cycle(api)
+
+        with FakeKeyHome(), LocalServer(ROUTES, delay=DELAY) as server:
+            start_time = time.time()
+            ticker, ohlc, fees, orders = asyncio.run(run(server.uri))
+            elapsed = time.time() - start_time
+
+        self.assertEqual(len(server.requests), 4)
+        self.assertLess(elapsed, 2 * DELAY)
+
+        self.assertEqual(ticker.bid, 50)
+        self.assertEqual(len(ohlc), 5)
+        self.assertEqual(len(fees), 2)
+        self.assertEqual(orders, [])
+
+    def test_wrappers(self):
+        routes = dict(ROUTES, **{
+            '/v2/tickers': [['tLTCUSD', 49, 10, 51, 10, 0.5, 0.01, 50, 1000, 55, 45]],
+            '/v2/book/tLTCUSD/P0': [[50.1, 2, 1.5], [49.9, 1, -2]],
+            '/v1/order/new/multi': lambda path: (400, {'message': 'no'}),
+        })
+
+        async def run(uri):
+            async with AsyncBitfinexAPI(uri=uri) as api:
+                return await asyncio.gather(
+                    api.tickers([ExchangeAPI.LTCUSD]),
+                    api.order_book(ExchangeAPI.LTCUSD, length=25),
+                    api.ohlc_history(ExchangeAPI.LTCUSD, ExchangeAPI.P15, 0, 10 ** 13, limit=5),
+                    api.add_orders([{
+                        'pair': ExchangeAPI.LTCUSD, 'direction': ExchangeAPI.BUY,
+                        'type_': ExchangeAPI.LIMIT, 'volume': 1, 'price': 50}]))
+
+        with FakeKeyHome(), LocalServer(routes) as server:
+            tickers, book, ohlc, orders = asyncio.run(run(server.uri))
+
+        self.assertEqual(tickers[ExchangeAPI.LTCUSD].last, 50)
+        self.assertEqual(len(book.bids), 1)
+        self.assertEqual(len(ohlc), 5)
+        self.assertIsInstance(orders[0], Exception)
+
+    def test_connection(self):
+        async def run(uri):
+            async with AsyncBitfinexAPI(uri=uri) as api:
+                return await api.connection().query_public('pubticker/ltcusd')
+
+        with LocalServer(ROUTES) as server:
+            self.assertEqual(asyncio.run(run(server.uri)), TICKER)
+
+    def test_borrowed_api(self):
+        async def run(api):
+            async with AsyncBitfinexAPI(api=api) as async_api:
+                return await async_api.ticker(ExchangeAPI.LTCUSD)
+
+        with local_bitfinex() as (server, api):
+            asyncio.run(run(api))
+
+            # The sessions of an API passed in stay open
+            self.assertTrue(api.pool._sessions)
@@ -0,0 +1,118 @@
+import logging
+import logging.config
+import tempfile
+import threading
+import unittest
+
+from venice.api.api import ExchangeAPI
+from venice.api.ohlc import OHLC
+from venice.store import Backfill, CandleStore
+
+logging.config.fileConfig('logging_tests.conf')
+
+LENGTH = 300000
+
+
+class FakeAPI:
+    """Candle history with one candle per period, except for the missing times."""
+    period_seconds = staticmethod(ExchangeAPI.period_seconds)
+
+    def __init__(self, missing=(), fail=None):
+        self.missing = set(missing)
+        self.fail = fail
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def ohlc_history(self, pair, period, start, end, limit=1000):
+        with self._lock:
+            self.requests.append((start, end))
+
+        if self.fail is not None and start <= self.fail < end:
+            raise ValueError('request failed')
+
+        times = [x for x in range(start - start % LENGTH, end, LENGTH) if x >= start and
+                 x not in self.missing]
+        return [OHLC(x, 1, 2, 0, 1, 1) for x in times[:limit]]
+
+
+class TestBackfill(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = CandleStore(self.directory.name)
+
+    def tearDown(self):
+        self.store.close()
+        self.directory.cleanup()
+
+    def test_run(self):
+        api = FakeAPI()
+        backfill = Backfill(api, self.store, 'fake', chunk=10)
+
+        gaps = backfill.run(ExchangeAPI.BTCUSD, ExchangeAPI.P5, 0, 95 * LENGTH)
+
+        self.assertEqual(gaps, [])
+        self.assertEqual(len(api.requests), 10)
+        self.assertEqual(self.store.file('fake', ExchangeAPI.BTCUSD, ExchangeAPI.P5).times(),
+                         [x * LENGTH for x in range(95)])
+
+    def test_pagination(self):
+        api = FakeAPI()
+        backfill = Backfill(api, self.store, 'fake', chunk=10)
+
+        self.assertEqual(len(backfill._fetch(ExchangeAPI.BTCUSD, ExchangeAPI.P5, 0,
+                                             25 * LENGTH)), 25)
+        self.assertEqual(len(api.requests), 3)
+
+    def test_resume(self):
+        api = FakeAPI(fail=55 * LENGTH)
+        backfill = Backfill(api, self.store, 'fake', chunk=10, workers=1)
+
+        with self.assertRaises(ValueError):
+            backfill.run(ExchangeAPI.BTCUSD, ExchangeAPI.P5, 0, 100 * LENGTH)
+
+        api = FakeAPI()
+        backfill = Backfill(api, self.store, 'fake', chunk=10)
+        backfill.run(ExchangeAPI.BTCUSD, ExchangeAPI.P5, 0, 100 * LENGTH)
+
+        self.assertEqual(sorted(api.requests), [(x * LENGTH, (x + 10) * LENGTH) for x in range(
+            50, 100, 10)])
+        self.assertEqual(len(self.store.file('fake', ExchangeAPI.BTCUSD, ExchangeAPI.P5)), 100)
+
+    def test_gaps(self):
+        missing = [x * LENGTH for x in [0, 31, 32, 70]]
+        backfill = Backfill(FakeAPI(missing=missing), self.store, 'fake', chunk=10)
+
+        gaps = backfill.run(ExchangeAPI.BTCUSD, ExchangeAPI.P5, 0, 80 * LENGTH)
+
+        self.assertEqual(gaps, [(0, LENGTH), (31 * LENGTH, 33 * LENGTH),
+                                (70 * LENGTH, 71 * LENGTH)])
+
+        # Gaps are refilled once, when the candles became available
+        api = FakeAPI()
+        backfill = Backfill(api, self.store, 'fake', chunk=10)
+
+        self.assertEqual(backfill.refill(ExchangeAPI.BTCUSD, ExchangeAPI.P5, 0, 80 * LENGTH), gaps)
+        self.assertEqual(api.requests, [])
+
+        self.store.file('fake', ExchangeAPI.BTCUSD, ExchangeAPI.P5).merge(
+            [OHLC(x, 1, 1, 1, 1, 1) for x in missing])
+        self.assertEqual(backfill.gaps(ExchangeAPI.BTCUSD, ExchangeAPI.P5, 0, 80 * LENGTH), [])
+
+    def test_refill(self):
+        candle_file = self.store.file('fake', ExchangeAPI.BTCUSD, ExchangeAPI.P5)
+        candle_file.append([OHLC(x * LENGTH, 1, 2, 0, 1, 1) for x in range(40) if x % 10])
+
+        merges = []
+        merge = candle_file.merge
+        candle_file.merge = lambda candles: merges.append(candles) or merge(candles)
+
+        api = FakeAPI()
+        backfill = Backfill(api, self.store, 'fake', chunk=10)
+
+        self.assertEqual(backfill.refill(ExchangeAPI.BTCUSD, ExchangeAPI.P5, 0, 40 * LENGTH), [])
+        self.assertEqual(sorted(api.requests), [(x * LENGTH, (x + 1) * LENGTH) for x in range(
+            0, 40, 10)])
+
+        # The candles of all gaps are merged at once
+        self.assertEqual(len(merges), 1)
+        self.assertEqual(candle_file.times(), [x * LENGTH for x in range(40)])
@@ -0,0 +1,96 @@
+import logging
+import logging.config
+import os
+import tempfile
+import time
+import unittest
+
+from decimal import Decimal
+
+from venice.api.api import ExchangeAPI
+from venice.api.balance import Balance
+from venice.api.cache import TTLCache
+from venice.api.pair import Pair
+
+from .local_server import FEES, local_bitfinex
+
+logging.config.fileConfig('logging_tests.conf')
+
+ROUTES = {
+    '/v1/summary': FEES,
+    '/v1/balances': [{'type': 'exchange', 'currency': 'btc', 'amount': '1.5', 'available': '1'}],
+    '/v1/order/cancel/multi': {'result': 'ok'},
+}
+
+
+class TestTTLCache(unittest.TestCase):
+    def test_expire(self):
+        cache = TTLCache({'fees': 0.1})
+        cache.set('fees', (), 1)
+
+        self.assertEqual(cache.get('fees', ()), (True, 1))
+        time.sleep(0.15)
+        self.assertEqual(cache.get('fees', ()), (False, None))
+        self.assertEqual(cache.stats(), {'fees': (1, 1)})
+
+    def test_invalidate(self):
+        cache = TTLCache({'fees': 60, 'balance': 60})
+        cache.set('fees', (), 1)
+        cache.set('balance', (), 2)
+
+        cache.invalidate('balance')
+        self.assertEqual(cache.get('fees', ()), (True, 1))
+        self.assertEqual(cache.get('balance', ()), (False, None))
+
+        cache.invalidate()
+        self.assertEqual(cache.get('fees', ()), (False, None))
+
+    def test_persistence(self):
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, 'cache')
+
+            with TTLCache({'fees': 60, 'pairs': 60, 'balance': 60}, path) as cache:
+                cache.set('fees', (), (Decimal('0.001'), Decimal('0.002')))
+                cache.set('pairs', (), {'ltcusd': Pair('ltcusd', 5, '0.2', '5000.0')})
+                cache.set('balance', ((ExchangeAPI.LTCUSD,), ()), {
+                    ExchangeAPI.LTC: Balance(ExchangeAPI.LTC, '1.5', '1')})
+
+            with open(path) as f:
+                self.assertIn('"0.001"', f.read())
+
+            cache = TTLCache({'fees': 60}, path)
+            pair = cache.get('pairs', ())[1]['ltcusd']
+            balance = cache.get('balance', ((ExchangeAPI.LTCUSD,), ()))[1][ExchangeAPI.LTC]
+
+            self.assertEqual(cache.get('fees', ()), (True, (Decimal('0.001'), Decimal('0.002'))))
+            self.assertEqual((pair.name, pair.precision, pair.order_max),
+                             ('ltcusd', 5, Decimal('5000.0')))
+            self.assertEqual((balance.amount, balance.available), (Decimal('1.5'), Decimal(1)))
+
+    def test_save_interval(self):
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, 'cache')
+            cache = TTLCache({'fees': 60}, path, interval=0.1)
+
+            # Changes are only written once the interval has passed
+            cache.set('fees', (), 1)
+            self.assertFalse(os.path.exists(path))
+
+            time.sleep(0.15)
+            cache.set('fees', (), 2)
+            self.assertEqual(TTLCache({'fees': 60}, path).get('fees', ()), (True, 2))
+
+    def test_api(self):
+        with local_bitfinex(ROUTES) as (server, api):
+            self.assertEqual(api.fees(), api.fees())
+            self.assertEqual(api.balance()[ExchangeAPI.BTC].amount,
+                             api.balance()[ExchangeAPI.BTC].amount)
+            self.assertEqual(len(server.requests), 2)
+
+            api.cancel_orders([1])
+            api.fees()
+            api.balance()
+
+        self.assertEqual([x[1] for x in server.requests[2:]], [
+            '/v1/order/cancel/multi', '/v1/balances'])
+        self.assertEqual(api.cache.stats(), {'fees': (2, 1), 'balance': (1, 2)})
@@ -0,0 +1,82 @@
+import logging
+import logging.config
+import unittest
+
+from venice.api.api import ExchangeAPI
+from venice.api.candle_buffer import CandleBuffer
+from venice.api.ohlc import OHLC
+
+from .helpers import PERIOD, TIME, FakeCandles
+from .local_server import local_bitfinex
+
+logging.config.fileConfig('logging_tests.conf')
+
+
+class TestCandleBuffer(unittest.TestCase):
+    def test_merge(self):
+        buffer = CandleBuffer(3)
+        buffer.merge([OHLC(x, 1, 1, 1, 1, 1) for x in [1, 2, 3]])
+        buffer.merge([OHLC(3, 2, 2, 2, 2, 2), OHLC(4, 1, 1, 1, 1, 1)])
+        buffer.merge([OHLC(0, 1, 1, 1, 1, 1)])
+
+        self.assertEqual([x.time for x in buffer.ohlc(3)], [2, 3, 4])
+        self.assertEqual(buffer.candles[1].close, 2)
+
+    def test_incremental(self):
+        candles = FakeCandles(100)
+        path = '/v2/candles/trade:15m:tLTCUSD/hist'
+
+        with local_bitfinex({path: candles}) as (server, api):
+            first = api.ohlc(ExchangeAPI.LTCUSD, ExchangeAPI.P15, limit=50)
+
+            # Forming candle updated and a new one started
+            candles.candles[-1][2] = 200
+            candles.candles.append([TIME + 100 * PERIOD, 200, 201, 202, 199, 1])
+
+            second = api.ohlc(ExchangeAPI.LTCUSD, ExchangeAPI.P15, limit=50)
+
+        self.assertEqual(candles.returned, [50, 2])
+        self.assertEqual(first[-1].time, TIME + 99 * PERIOD)
+        self.assertEqual(second[0].time, first[1].time)
+        self.assertEqual(second[-2].close, 200)
+        self.assertEqual(second[-1].time, TIME + 100 * PERIOD)
+        self.assertEqual([x.time for x in second], sorted(x.time for x in second))
+
+    def test_gap(self):
+        candles = FakeCandles(10)
+        path = '/v2/candles/trade:15m:tLTCUSD/hist'
+
+        with local_bitfinex({path: candles}) as (server, api):
+            api.ohlc(ExchangeAPI.LTCUSD, ExchangeAPI.P15, limit=5)
+
+            candles.candles += [[TIME + x * PERIOD, 1, 1, 1, 1, 1] for x in range(10, 20)]
+            result = api.ohlc(ExchangeAPI.LTCUSD, ExchangeAPI.P15, limit=5)
+
+        self.assertEqual(candles.returned, [5, 5, 5])
+        self.assertEqual(result[-1].time, TIME + 19 * PERIOD)
+
+    def test_gap_smaller_limit(self):
+        candles = FakeCandles(100)
+        path = '/v2/candles/trade:15m:tLTCUSD/hist'
+
+        with local_bitfinex({path: candles}) as (server, api):
+            api.ohlc(ExchangeAPI.LTCUSD, ExchangeAPI.P15, limit=100)
+
+            candles.candles += [[TIME + x * PERIOD, 1, 1, 1, 1, 1] for x in range(100, 103)]
+            api.ohlc(ExchangeAPI.LTCUSD, ExchangeAPI.P15, limit=2)
+            result = api.ohlc(ExchangeAPI.LTCUSD, ExchangeAPI.P15, limit=100)
+
+        self.assertEqual(candles.returned, [100, 2, 100, 1])
+        self.assertEqual([x.time for x in result], [TIME + x * PERIOD for x in range(3, 103)])
+
+    def test_larger_limit(self):
+        candles = FakeCandles(20)
+        path = '/v2/candles/trade:15m:tLTCUSD/hist'
+
+        with local_bitfinex({path: candles}) as (server, api):
+            api.ohlc(ExchangeAPI.LTCUSD, ExchangeAPI.P15, limit=5)
+            result = api.ohlc(ExchangeAPI.LTCUSD, ExchangeAPI.P15, limit=10)
+            api.ohlc(ExchangeAPI.LTCUSD, ExchangeAPI.P15, limit=5)
+
+        self.assertEqual(candles.returned, [5, 10, 1])
+        self.assertEqual(len(result), 10)
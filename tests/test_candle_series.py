@@ -0,0 +1,106 @@
+import logging
+import logging.config
+import unittest
+
+from decimal import Decimal
+
+from venice.api.candle_series import CandleSeries
+from venice.api.ohlc import OHLC
+from venice.strategy import SimulatedStrategyAPI
+from venice.strategy.indicator import crossover, ema
+
+from .helpers import PERIOD, TIME, FakeAPI
+
+logging.config.fileConfig('logging_tests.conf')
+
+
+def candles(count, first=0):
+    return [OHLC(TIME + x * PERIOD, '50', str(51 + x), '49.5', '50.12345678', '10.5') for x in
+            range(first, first + count)]
+
+
+class TestCandleSeries(unittest.TestCase):
+    def test_columns(self):
+        series = CandleSeries(candles(5))
+
+        self.assertEqual(len(series), 5)
+        self.assertEqual(series.close()[-1], Decimal('50.12345678'))
+        self.assertEqual(list(series.high()), [51, 52, 53, 54, 55])
+        self.assertEqual(series.time()[0], TIME)
+        self.assertEqual(series[-1].volume, Decimal('10.5'))
+        self.assertEqual(series[1:3].high(), [52, 53])
+        self.assertEqual(series.high()[1:3][-1], 53)
+
+    def test_scale(self):
+        series = CandleSeries([OHLC(TIME, 1, 1, 1, '0.123456789012', 1)])
+        exact = CandleSeries([OHLC(TIME, 1, 1, 1, '0.123456789012', 1)], scale=12)
+
+        self.assertEqual(series.close().list(), [Decimal('0.12345679')])
+        self.assertEqual(exact.close().list(), [Decimal('0.123456789012')])
+        self.assertEqual(exact[0].close, Decimal('0.123456789012'))
+        self.assertEqual(list(exact.close().fixed(8).values), [12345679])
+
+    def test_replace_last(self):
+        series = CandleSeries(candles(3))
+        view = series[-2:]
+        version = series.version
+
+        series.append(OHLC(series.last_time, 50, 60, 49, 58, 11))
+        series.append(OHLC(series.last_time + PERIOD, 58, 59, 57, 58, 1))
+
+        self.assertEqual(len(series), 4)
+        self.assertEqual(series.version, version + 2)
+        self.assertEqual(list(view.close()), [Decimal('50.12345678'), 58])
+        self.assertRaises(ValueError, series.append, candles(1)[0])
+        self.assertRaises(ValueError, view.append, candles(1)[0])
+
+    def test_size(self):
+        series = CandleSeries(candles(10), size=4)
+        view = series[:]
+
+        self.assertEqual(len(series), 6)
+        self.assertEqual(series.first_time, TIME + 4 * PERIOD)
+        self.assertEqual(len(view), 6)
+
+        series.extend(candles(2, 10))
+        self.assertEqual(len(series), 4)
+        self.assertEqual(view.first_time, TIME + 4 * PERIOD)
+
+    def test_indicators(self):
+        series = CandleSeries(candles(30))
+        close = [x.close for x in candles(30)]
+
+        self.assertEqual(ema(series.close(), 10), ema(close, 10))
+        self.assertFalse(crossover(series.close(), series.high()))
+
+    def test_strategy_api(self):
+        api = FakeAPI(candles(50))
+        strategy_api = SimulatedStrategyAPI(api, 'ltcusd', '15', 1000)
+
+        self.assertEqual(len(strategy_api.close(20)), 20)
+        self.assertIsInstance(strategy_api.close(20), list)
+        self.assertEqual(strategy_api.high(20)[-1], 100)
+        self.assertEqual(strategy_api.hl2(2), [(99 + Decimal('49.5'))/2, (100 + Decimal(
+            '49.5'))/2])
+
+        strategy_api.update()
+        api.candles += candles(1, 50)
+
+        self.assertEqual(strategy_api.high(20)[-1], 101)
+        self.assertEqual(strategy_api.high(40)[0], 62)
+        self.assertEqual(api.requests, 3)
+
+    def test_strategy_api_gap(self):
+        api = FakeAPI(candles(100))
+        strategy_api = SimulatedStrategyAPI(api, 'ltcusd', '15', 1000)
+
+        strategy_api.close(100)
+        strategy_api.update()
+
+        # The latest candles fetched do not reach the series
+        api.candles += candles(3, 100)
+        strategy_api.high(2)
+        strategy_api.update()
+
+        self.assertEqual(list(strategy_api.candles(100).time()),
+                         [TIME + x * PERIOD for x in range(3, 103)])
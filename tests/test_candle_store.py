@@ -0,0 +1,116 @@
+import logging
+import logging.config
+import os
+import tempfile
+import unittest
+
+from decimal import Decimal
+
+from venice.api.ohlc import OHLC
+from venice.store import CandleFile, CandleStore, CandleStoreException
+
+logging.config.fileConfig('logging_tests.conf')
+
+PERIOD = 60000
+
+
+def candle(i, close='50.12345678'):
+    return OHLC(i * PERIOD, '50.1', '51', '49.5', close, '10.5')
+
+
+class TestCandleStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'test.candles')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        with CandleFile(self.path) as f:
+            f.append([candle(x) for x in range(10)])
+
+        with CandleFile(self.path) as f:
+            result = f.last(2)
+
+            self.assertEqual(len(f), 10)
+            self.assertEqual(f.first_time, 0)
+            self.assertEqual(f.last_time, 9 * PERIOD)
+
+        self.assertEqual([x.time for x in result], [8 * PERIOD, 9 * PERIOD])
+        self.assertEqual(result[0].close, Decimal('50.12345678'))
+        self.assertEqual(result[0].open_, Decimal('50.1'))
+        self.assertEqual(result[0].volume, Decimal('10.5'))
+
+    def test_range(self):
+        with CandleFile(self.path) as f:
+            f.append([candle(x) for x in range(0, 1000, 2)])
+
+            self.assertEqual(f.index(3 * PERIOD), 2)
+            self.assertEqual(f.index(-1), 0)
+            self.assertEqual(f.index(10000 * PERIOD), 500)
+            self.assertEqual([x.time // PERIOD for x in f.range(10 * PERIOD, 17 * PERIOD)],
+                             [10, 12, 14, 16])
+            self.assertEqual(len(f.range(start=990 * PERIOD)), 5)
+            self.assertEqual(len(f.range(end=10 * PERIOD)), 5)
+
+    def test_append(self):
+        with CandleFile(self.path) as f:
+            f.append([candle(x) for x in range(3)])
+            f.append([candle(2, close='60'), candle(3)])
+
+            self.assertEqual(len(f), 4)
+            self.assertEqual(f.last(2)[0].close, 60)
+
+            with self.assertRaises(CandleStoreException):
+                f.append([candle(1)])
+
+    def test_merge(self):
+        with CandleFile(self.path) as f:
+            f.append([candle(x) for x in [0, 1, 4, 5]])
+            f.merge([candle(2), candle(3), candle(4, close='70')])
+
+            self.assertEqual(f.times(), [x * PERIOD for x in range(6)])
+            self.assertEqual(f.range(4 * PERIOD, 5 * PERIOD)[0].close, 70)
+
+            f.append([candle(6)])
+            self.assertEqual(len(f), 7)
+
+    def test_series(self):
+        with CandleFile(self.path) as f:
+            f.append([candle(x, close=str(50 + x)) for x in range(0, 100, 2)])
+
+            series = f.series(10 * PERIOD, 17 * PERIOD)
+            candles = f.range(10 * PERIOD, 17 * PERIOD)
+
+            self.assertEqual(list(series.time()), [x.time for x in candles])
+            self.assertEqual(list(series.close().array()), [60., 62., 64., 66.])
+            self.assertEqual(series.close().list(), [x.close for x in candles])
+            self.assertEqual(series[-1].open_, Decimal('50.1'))
+            self.assertEqual(len(f.series()), 50)
+            self.assertEqual(len(f.series(start=200 * PERIOD)), 0)
+
+            # Series read from the file take new candles like any other
+            series = f.series(size=10)
+            series.append(candle(100))
+
+            self.assertEqual(series.last_time, 100 * PERIOD)
+            self.assertEqual(series.close()[-2], 148)
+
+    def test_invalid(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'x' * 32)
+
+        with self.assertRaises(CandleStoreException):
+            CandleFile(self.path)
+
+    def test_store(self):
+        with CandleStore(self.directory.name) as store:
+            store.file('bitfinex', 'btcusd', '15').append([candle(1)])
+
+            self.assertIs(store.file('bitfinex', 'btcusd', '15'),
+                          store.file('bitfinex', 'btcusd', '15'))
+            self.assertEqual(len(store.file('bitfinex', 'ltcusd', '15')), 0)
+
+        self.assertTrue(os.path.exists(os.path.join(
+            self.directory.name, 'bitfinex-btcusd-15.candles')))
@@ -0,0 +1,56 @@
+import logging
+import logging.config
+import unittest
+
+from venice.api.api import ExchangeAPI
+from venice.connection import ConnectionPool
+from venice.connection.bitfinex import BitfinexConnection
+
+from .local_server import CANDLES, TICKER, LocalServer, local_bitfinex
+
+logging.config.fileConfig('logging_tests.conf')
+
+def candles(path):
+    return 200, CANDLES[:1] if 'start=' in path else CANDLES
+
+
+class TestConnectionPool(unittest.TestCase):
+    def test_reuse(self):
+        with LocalServer({'/v1/symbols': ['ltcusd']}) as server, ConnectionPool() as pool:
+            for _ in range(5):
+                c = BitfinexConnection(uri=server.uri, pool=pool)
+                self.assertEqual(c.query_public('symbols'), ['ltcusd'])
+
+            self.assertEqual(server.connections, 1)
+
+    def test_without_pool(self):
+        with LocalServer({'/v1/symbols': ['ltcusd']}) as server:
+            for _ in range(3):
+                c = BitfinexConnection(uri=server.uri)
+                c.query_public('symbols')
+
+            self.assertEqual(server.connections, 3)
+
+    def test_close(self):
+        with LocalServer({'/v1/symbols': ['ltcusd']}) as server:
+            pool = ConnectionPool()
+            session = pool.session(server.uri)
+            pool.close()
+
+            self.assertIsNot(pool.session(server.uri), session)
+
+
+class TestBitfinexAPIPool(unittest.TestCase):
+    def test_cycle(self):
+        routes = {
+            '/v1/pubticker/ltcusd': TICKER,
+            '/v2/candles/trade:15m:tLTCUSD/hist': candles,
+        }
+
+        with local_bitfinex(routes) as (server, api):
+            for _ in range(3):
+                api.ticker(ExchangeAPI.LTCUSD)
+                api.ohlc(ExchangeAPI.LTCUSD, ExchangeAPI.P15, limit=5)
+
+            self.assertEqual(len(server.requests), 6)
+            self.assertEqual(server.connections, 1)
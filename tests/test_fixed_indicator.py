@@ -0,0 +1,86 @@
+import logging
+import logging.config
+import unittest
+
+from decimal import Decimal
+
+from venice.api.candle_series import CandleSeries
+from venice.fixed import FixedSeries, div_round, from_fixed, to_fixed
+from venice.strategy import SimulatedStrategyAPI, indicator
+
+from .helpers import FakeAPI, flat_candles, prices
+
+logging.config.fileConfig('logging_tests.conf')
+
+PLACES = 5
+
+
+class TestFixedIndicator(unittest.TestCase):
+    def assertParity(self, fixed, decimal, ulps=1):
+        self.assertIsInstance(fixed, FixedSeries)
+        self.assertEqual(len(fixed), len(decimal))
+
+        for x, y in zip(fixed, decimal):
+            self.assertLessEqual(abs(x - y), ulps * Decimal(10) ** -fixed.places,
+                                 '{} != {}'.format(x, y))
+
+    def setUp(self):
+        self.close = prices(300, minimum=Decimal(10) ** -PLACES)
+        self.fixed = FixedSeries([to_fixed(x, PLACES) for x in self.close], PLACES)
+
+    def test_conversion(self):
+        self.assertEqual(list(self.fixed), self.close)
+        self.assertEqual(to_fixed(Decimal('1.000005'), PLACES), 100000)
+        self.assertEqual(to_fixed(Decimal('1.000015'), PLACES), 100002)
+        self.assertEqual(from_fixed(-150, 2), Decimal('-1.5'))
+        self.assertEqual([div_round(x, 2) for x in [1, 3, 5, -1, -3]], [0, 2, 2, 0, -2])
+
+    def test_sma(self):
+        for length in [1, 10, 50]:
+            self.assertParity(indicator.sma(self.fixed, length), indicator.sma(self.close, length))
+
+    def test_ema(self):
+        for length in [1, 10, 50]:
+            self.assertParity(indicator.ema(self.fixed, length), indicator.ema(self.close, length))
+
+    def test_macd(self):
+        for fixed, decimal in zip(indicator.macd(12, 26, self.fixed, 9),
+                                  indicator.macd(12, 26, self.close, 9)):
+            self.assertParity(fixed, decimal, ulps=3)
+
+    def test_mom(self):
+        self.assertParity(indicator.mom(self.fixed, 10), indicator.mom(self.close, 10), ulps=0)
+
+    def test_rsi(self):
+        self.assertParity(indicator.rsi(self.fixed, 14), indicator.rsi(self.close, 14))
+
+    def test_rsi_precision(self):
+        # Changes of a few units, with few or many places
+        for start, step, places in (('0.01', 3, PLACES), (50, 100000, 8), ('0.0001', 5, 8)):
+            close = prices(300, start=start, step=step, places=places,
+                           minimum=Decimal(10) ** -places)
+            fixed = FixedSeries([to_fixed(x, places) for x in close], places)
+
+            for length in (2, 14, 50):
+                self.assertParity(indicator.rsi(fixed, length), indicator.rsi(close, length))
+
+    def test_crossover(self):
+        fast, slow = indicator.ema(self.fixed, 5), indicator.ema(self.fixed, 20)
+        fast_decimal, slow_decimal = indicator.ema(self.close, 5), indicator.ema(self.close, 20)
+
+        for i in range(2, len(slow)):
+            self.assertEqual(
+                indicator.crossover(fast[:len(fast) - len(slow) + i], slow[:i]),
+                indicator.crossover(fast_decimal[:len(fast) - len(slow) + i], slow_decimal[:i]))
+
+    def test_strategy_api(self):
+        api = FakeAPI(flat_candles(self.close))
+        strategy_api = SimulatedStrategyAPI(api, 'ltcusd', '15', 1000, backend='fixed')
+        close = strategy_api.close(100)
+
+        self.assertIsInstance(close, FixedSeries)
+        self.assertEqual(list(close), self.close[-100:])
+        self.assertIsInstance(strategy_api.hl2(100), FixedSeries)
+        self.assertEqual(list(strategy_api.hlc3(100)), self.close[-100:])
+        self.assertEqual(list(CandleSeries(flat_candles(self.close)).close().fixed(2))[-1],
+                         self.close[-1].quantize(Decimal('0.01')))
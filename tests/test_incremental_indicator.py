@@ -0,0 +1,83 @@
+import logging
+import logging.config
+import unittest
+
+from venice.strategy import indicator
+
+from .helpers import prices
+
+logging.config.fileConfig('logging_tests.conf')
+
+
+class TestIncrementalIndicator(unittest.TestCase):
+    def setUp(self):
+        self.close = prices(120, step=1000, places=3)
+
+    def test_sma(self):
+        for length in (1, 5, 20):
+            self.assertEqual(indicator.SMA(length).extend(self.close),
+                             indicator.sma(self.close, length))
+
+    def test_ema(self):
+        for length in (1, 5, 20):
+            for count in (3, length, 60):
+                self.assertEqual(indicator.EMA(length).extend(self.close[:count]),
+                                 indicator.ema(self.close[:count], length))
+
+    def test_macd(self):
+        for count in (20, 26, 40, 120):
+            macd = indicator.MACD(12, 26, 9)
+            macd.extend(self.close[:count])
+
+            self.assertEqual((macd.macd, macd.signal, macd.histogram),
+                             indicator.macd(12, 26, self.close[:count], 9))
+
+    def test_rsi(self):
+        for length in (3, 14):
+            for count in (1, length, length + 1, 60):
+                self.assertEqual(indicator.RSI(length).extend(self.close[:count]),
+                                 indicator.rsi(self.close[:count], length))
+
+    def test_replace(self):
+        indicators = [indicator.SMA(5), indicator.EMA(5), indicator.RSI(5)]
+        functions = [indicator.sma, indicator.ema, indicator.rsi]
+
+        for i, value in enumerate(self.close[:40]):
+            for x in indicators:
+                x.update(value + 1)
+                x.update(value, replace=True)
+
+            for x, function in zip(indicators, functions):
+                self.assertEqual(x.result, function(self.close[:i + 1], x.length))
+
+    def test_replace_macd(self):
+        macd = indicator.MACD(3, 6, 4)
+
+        for i, value in enumerate(self.close[:40]):
+            macd.update(value - 1)
+            macd.update(value, replace=True)
+
+            self.assertEqual((macd.macd, macd.signal, macd.histogram),
+                             indicator.macd(3, 6, self.close[:i + 1], 4))
+
+    def test_feed(self):
+        times = list(range(0, 120 * 60, 60))
+        ema = indicator.EMA(10)
+        last_time = None
+
+        # Overlapping windows, with the last bar still forming in each of them
+        for end in range(20, 121, 7):
+            window = self.close[max(0, end - 30):end]
+            window[-1] += 1
+
+            last_time = indicator.feed([ema], times[max(0, end - 30):end], window, last_time)
+            self.assertEqual(last_time, times[end - 1])
+
+        last_time = indicator.feed([ema], times, self.close, last_time)
+
+        self.assertEqual(last_time, times[-1])
+        self.assertEqual(ema.result, indicator.ema(self.close, 10))
+
+
+if __name__ == '__main__':
+    unittest.main()
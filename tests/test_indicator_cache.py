@@ -0,0 +1,153 @@
+import logging
+import logging.config
+import unittest
+
+from decimal import Decimal
+
+from venice.api.candle_series import CandleSeries
+from venice.api.ohlc import OHLC
+from venice.strategy import IndicatorCache, SimulatedStrategyAPI
+from venice.strategy.ema import EMAStrategy
+from venice.strategy.indicator import ema, macd, macd_ema, sma
+from venice.strategy.macd import MACDStrategy
+
+from .helpers import PERIOD, TIME, FakeAPI
+
+logging.config.fileConfig('logging_tests.conf')
+
+
+def candle(index, price):
+    price = Decimal(price)
+    return OHLC(TIME + index * PERIOD, price, price, price, price, 1)
+
+
+class Counter:
+    def __init__(self, function):
+        self.function = function
+        self.calls = 0
+
+    def __call__(self, *args):
+        self.calls += 1
+        return self.function(*args)
+
+
+class TestIndicatorCache(unittest.TestCase):
+    def setUp(self):
+        self.api = FakeAPI([candle(x, 50 + x % 7) for x in range(100)])
+        self.strategy_api = SimulatedStrategyAPI(self.api, 'ltcusd', '15', 1000)
+
+    def test_memoize(self):
+        counter = Counter(ema)
+        first = self.strategy_api.indicator(counter, 10, limit=50)
+
+        self.assertEqual(first, ema(self.strategy_api.close(50), 10))
+        self.assertIs(self.strategy_api.indicator(counter, 10, limit=50), first)
+        self.assertEqual(counter.calls, 1)
+
+        # Other parameters, fields and windows are separate entries
+        self.strategy_api.indicator(counter, 20, limit=50)
+        self.strategy_api.indicator(counter, 10, field='high', limit=50)
+        self.strategy_api.indicator(counter, 10, limit=60)
+
+        self.assertEqual(counter.calls, 4)
+        self.assertEqual((self.strategy_api.indicators.hits,
+                          self.strategy_api.indicators.misses), (1, 4))
+
+    def test_new_candle(self):
+        counter = Counter(sma)
+        self.strategy_api.indicator(counter, 10, limit=50)
+
+        self.api.candles.append(candle(100, 60))
+        self.strategy_api._ohlc = None
+
+        self.assertEqual(self.strategy_api.indicator(counter, 10, limit=50)[-1],
+                         sma(self.strategy_api.close(50), 10)[-1])
+        self.assertEqual(counter.calls, 2)
+        self.assertEqual(len(self.strategy_api.indicators), 1)
+
+    def test_replaced_candle(self):
+        counter = Counter(sma)
+        self.strategy_api.indicator(counter, 10, limit=50)
+
+        self.api.candles[-1] = candle(99, 70)
+        self.strategy_api._ohlc = None
+
+        self.assertEqual(self.strategy_api.indicator(counter, 10, limit=50)[-1],
+                         sma(self.strategy_api.close(50), 10)[-1])
+        self.assertEqual(counter.calls, 2)
+
+    def test_eviction(self):
+        cache = IndicatorCache(size=2)
+        series = CandleSeries(self.api.candles)
+
+        for length in (1, 2, 3, 1):
+            cache.get('ltcusd', series, length, lambda: length)
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual((cache.hits, cache.misses), (0, 4))
+
+        self.assertEqual(cache.get('ltcusd', series, 1, lambda: None), 1)
+        self.assertEqual(cache.get('ltcusd', series, 3, lambda: None), 3)
+
+    def test_stale_view(self):
+        cache = IndicatorCache()
+        series = CandleSeries(self.api.candles)
+        view = series[-10:]
+
+        series.append(candle(100, 60))
+        cache.get('ltcusd', series, 'latest', lambda: 1)
+        cache.get('ltcusd', view, 'latest', lambda: 2)
+
+        self.assertEqual(cache.get('ltcusd', series, 'latest', lambda: None), 1)
+        self.assertEqual(cache.get('ltcusd', view, 'latest', lambda: None), 2)
+
+        # A replaced last candle drops the entries of its source only
+        cache.get('btcusd', series, 'latest', lambda: 3)
+        series.append(candle(100, 61))
+
+        self.assertEqual(cache.get('ltcusd', series, 'latest', lambda: 4), 4)
+        self.assertEqual(len(cache), 2)
+
+    def test_shared(self):
+        cache = IndicatorCache()
+        series = CandleSeries(self.api.candles)
+
+        self.assertEqual(cache.get('ltcusd', series[-20:], 'sma', lambda: 1), 1)
+        self.assertEqual(cache.get('ltcusd', series[-20:], 'sma', lambda: None), 1)
+        self.assertEqual(cache.get('ltcusd', series[-30:], 'sma', lambda: 2), 2)
+        self.assertEqual(cache.get('btcusd', series[-20:], 'sma', lambda: 3), 3)
+
+    def test_strategies(self):
+        counter = Counter(ema)
+        other = SimulatedStrategyAPI(self.api, 'ltcusd', '15', 1000,
+                                     indicators=self.strategy_api.indicators)
+
+        first = self.strategy_api.indicator(counter, 10, limit=50)
+
+        # Another strategy on the same exchange, pair and period, with its own series
+        self.assertIs(other.indicator(counter, 10, limit=50), first)
+        self.assertEqual(counter.calls, 1)
+
+        other = SimulatedStrategyAPI(self.api, 'ltcusd', '1h', 1000,
+                                     indicators=self.strategy_api.indicators)
+        other.indicator(counter, 10, limit=50)
+
+        self.assertEqual(counter.calls, 2)
+
+    def test_ema_macd(self):
+        other = SimulatedStrategyAPI(self.api, 'ltcusd', '15', 1000,
+                                     indicators=self.strategy_api.indicators)
+
+        EMAStrategy(self.strategy_api, 12, 26, False, None).run()
+        self.assertEqual(len(self.strategy_api.indicators), 2)
+
+        # The MACD strategy reuses both averages of the EMA strategy
+        MACDStrategy(other, 12, 26, 9, False, None).run()
+        self.assertEqual(len(self.strategy_api.indicators), 2)
+
+        averages = [other.indicator(ema, x, limit=100) for x in [12, 26]]
+        self.assertEqual(macd_ema(*averages, 9), macd(12, 26, other.close(100), 9))
+
+
+if __name__ == '__main__':
+    unittest.main()
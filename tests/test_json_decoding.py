@@ -0,0 +1,50 @@
+import logging
+import logging.config
+import unittest
+
+from decimal import Decimal
+
+from venice.api.api import ExchangeAPI
+from venice.connection import ExchangeConnection
+from venice.util import to_decimal
+
+from .local_server import local_bitfinex
+
+logging.config.fileConfig('logging_tests.conf')
+
+CANDLES = b'[[1514765700000,50.1,50.3,50.7,49.9,10.123456789],[1514764800000,50,50.1,51,49,7]]'
+
+
+class TestJSONDecoding(unittest.TestCase):
+    def test_decode(self):
+        result = ExchangeConnection.decode(b'{"price": 0.1, "amount": "0.2", "id": 12}')
+
+        self.assertEqual(result['price'], Decimal('0.1'))
+        self.assertIsInstance(result['price'], Decimal)
+        self.assertEqual(result['amount'], '0.2')
+        self.assertIsInstance(result['id'], int)
+
+    def test_to_decimal(self):
+        value = Decimal('1.5')
+
+        self.assertIs(to_decimal(value), value)
+        self.assertEqual(to_decimal('1.5'), value)
+        self.assertEqual(to_decimal(2), Decimal(2))
+
+    def test_ohlc(self):
+        routes = {
+            '/v2/candles/trade:15m:tLTCUSD/hist': lambda path: (200, CANDLES),
+            '/v1/summary': lambda path: (200, b'{"maker_fee": 0.001, "taker_fee": 0.002}'),
+        }
+
+        with local_bitfinex(routes) as (server, api):
+            ohlc = api.ohlc(ExchangeAPI.LTCUSD, ExchangeAPI.P15, limit=2)
+            fees = api.fees()
+
+        self.assertEqual([x.time for x in ohlc], [1514764800000, 1514765700000])
+        self.assertEqual(ohlc[1].open_, Decimal('50.1'))
+        self.assertEqual(ohlc[1].close, Decimal('50.3'))
+        self.assertEqual(ohlc[1].high, Decimal('50.7'))
+        self.assertEqual(ohlc[1].low, Decimal('49.9'))
+        self.assertEqual(ohlc[1].volume, Decimal('10.123456789'))
+        self.assertEqual(fees, (Decimal('0.001'), Decimal('0.002')))
@@ -0,0 +1,166 @@
+import base64
+import json
+import logging
+import logging.config
+import unittest
+
+from decimal import Decimal
+
+from venice.api.api import ExchangeAPI
+from venice.api.order_status import OrderStatus
+from venice.strategy import LiveStrategyAPI, StrategyAPIError
+
+from .local_server import FEES, TICKER, local_bitfinex
+
+logging.config.fileConfig('logging_tests.conf')
+
+
+def order(id_, is_live=True, is_cancelled=False):
+    return {
+        'id': id_, 'side': 'buy', 'type': 'exchange limit', 'symbol': 'ltcusd',
+        'is_live': is_live, 'is_cancelled': is_cancelled, 'original_amount': '1',
+        'executed_amount': '0' if is_live else '1', 'price': '50', 'avg_execution_price': '50',
+        'remaining_amount': '1' if is_live else '0',
+    }
+
+
+def payload(request):
+    return json.loads(base64.b64decode(request[2]['X-BFX-PAYLOAD']))
+
+
+ROUTES = {
+    '/v1/summary': FEES,
+    '/v1/pubticker/ltcusd': dict(TICKER, last_price='50'),
+    '/v1/symbols_details': [{
+        'pair': 'ltcusd', 'price_precision': 5, 'minimum_order_size': '0.2',
+        'maximum_order_size': '5000.0'}],
+    '/v1/order/new/multi': lambda path: (200, {'order_ids': [order(x) for x in range(3)]}),
+    '/v1/order/cancel/multi': {'result': 'Orders cancelled'},
+}
+
+
+class TestLiveStrategyAPI(unittest.TestCase):
+    def reconcile(self, routes, count):
+        with local_bitfinex(routes) as (server, api):
+            strategy_api = LiveStrategyAPI(api, ExchangeAPI.LTCUSD, '15', 1000)
+
+            for id_ in range(count):
+                strategy_api.orders['rung{}'.format(id_)] = {ExchangeAPI.BUY: OrderStatus(
+                    id_, ExchangeAPI.BUY, ExchangeAPI.LIMIT, ExchangeAPI.LTCUSD,
+                    ExchangeAPI.PENDING, Decimal(1), Decimal(0), price=Decimal(50))}
+
+            api.cache.set('balance', ((), ()), {})
+            strategy_api.update()
+
+        return strategy_api, [x[1] for x in server.requests]
+
+    def test_all_open(self):
+        strategy_api, paths = self.reconcile({'/v1/orders': [order(x) for x in range(20)]}, 20)
+
+        self.assertEqual(paths, ['/v1/orders'])
+        self.assertEqual(len(strategy_api._filter_orders(status=ExchangeAPI.PENDING)), 20)
+        self.assertEqual(strategy_api.api.cache.get('balance', ((), ())), (True, {}))
+
+    def test_closed(self):
+        statuses = iter([order(0, is_live=False), order(1, is_live=False, is_cancelled=True)])
+
+        strategy_api, paths = self.reconcile({
+            '/v1/orders': [order(x) for x in range(2, 20)],
+            '/v1/order/status': lambda path: (200, next(statuses)),
+            '/v1/summary': FEES,
+        }, 20)
+
+        self.assertEqual(paths, ['/v1/orders', '/v1/order/status', '/v1/order/status',
+                                 '/v1/summary'])
+        self.assertEqual(strategy_api.order_status('rung0', ExchangeAPI.BUY).status,
+                         ExchangeAPI.CONFIRMED)
+        self.assertEqual(strategy_api.order_status('rung1', ExchangeAPI.BUY).status,
+                         ExchangeAPI.CANCELED)
+        self.assertEqual(strategy_api.balance[1], Decimal('999.95'))
+
+        # The filled order changed the exchange balance
+        self.assertEqual(strategy_api.api.cache.get('balance', ((), ())), (False, None))
+
+    def test_add_orders(self):
+        with local_bitfinex(ROUTES) as (server, api):
+            strategy_api = LiveStrategyAPI(api, ExchangeAPI.LTCUSD, '15', 1000)
+
+            results = strategy_api.add_orders([{
+                'name': 'rung{}'.format(x), 'direction': ExchangeAPI.BUY,
+                'type_': ExchangeAPI.LIMIT, 'volume': Decimal(1), 'price': Decimal(50 - x),
+            } for x in range(3)])
+
+            strategy_api.cancel_all()
+
+        requests = [x for x in server.requests if x[1].startswith('/v1/order/')]
+
+        self.assertEqual([x[1] for x in requests], ['/v1/order/new/multi',
+                                                    '/v1/order/cancel/multi'])
+        self.assertEqual([x['price'] for x in payload(requests[0])['orders']], ['50', '49', '48'])
+        self.assertEqual(payload(requests[1])['order_ids'], [0, 1, 2])
+        self.assertEqual([x.id_ for x in results], [0, 1, 2])
+        self.assertEqual(strategy_api.order_status('rung2', ExchangeAPI.BUY).id_, 2)
+
+    def test_add_orders_volume(self):
+        with local_bitfinex(ROUTES) as (server, api):
+            strategy_api = LiveStrategyAPI(api, ExchangeAPI.LTCUSD, '15', 1000)
+
+            orders = [{'name': 'rung{}'.format(x), 'direction': ExchangeAPI.BUY,
+                       'type_': ExchangeAPI.LIMIT, 'price': Decimal(50)} for x in range(2)]
+
+            with self.assertRaises(StrategyAPIError):
+                strategy_api.add_orders(orders + [dict(orders[1], price=Decimal(49))])
+
+            self.assertFalse([x for x in server.requests if x[1].startswith('/v1/order/')])
+
+            strategy_api.add_orders(orders)
+
+        request = [x for x in server.requests if x[1] == '/v1/order/new/multi'][0]
+
+        # The volume of the first order is held from the balance left for the second one
+        self.assertEqual([Decimal(x['amount']) for x in payload(request)['orders']],
+                         [Decimal('19.98'), Decimal('19.5808')])
+
+    def test_cancel_failure(self):
+        routes = dict(ROUTES, **{'/v1/order/cancel/multi': lambda path: (400, {'message': 'no'})})
+
+        with local_bitfinex(routes) as (server, api):
+            strategy_api = LiveStrategyAPI(api, ExchangeAPI.LTCUSD, '15', 1000)
+
+            strategy_api.add_orders([{
+                'name': 'rung{}'.format(x), 'direction': ExchangeAPI.BUY,
+                'type_': ExchangeAPI.LIMIT, 'volume': Decimal(1), 'price': Decimal(50 - x),
+            } for x in range(3)])
+
+            self.assertRaises(StrategyAPIError, strategy_api.cancel_all)
+            strategy_api.clean_up()
+
+        self.assertEqual(len([x for x in server.requests if x[1] == '/v1/order/cancel/multi']), 2)
+        self.assertEqual(len(strategy_api._filter_orders(status=ExchangeAPI.PENDING)), 3)
+
+    def test_clean_up_failure(self):
+        routes = dict(ROUTES, **{'/v1/order/new/multi': lambda path: (400, {'message': 'no'})})
+
+        with local_bitfinex(routes) as (server, api):
+            strategy_api = LiveStrategyAPI(api, ExchangeAPI.LTCUSD, '15', 1000)
+
+            for id_ in range(2):
+                strategy_api.orders['rung{}'.format(id_)] = {ExchangeAPI.BUY: OrderStatus(
+                    id_, ExchangeAPI.BUY, ExchangeAPI.LIMIT, ExchangeAPI.LTCUSD,
+                    ExchangeAPI.CONFIRMED, Decimal(1), Decimal(1), price=Decimal(50))}
+
+            self.assertRaises(StrategyAPIError, strategy_api.clean_up)
+
+        self.assertEqual(len([x for x in server.requests if x[1] == '/v1/order/new/multi']), 1)
+
+    def test_add_orders_failure(self):
+        routes = dict(ROUTES, **{'/v1/order/new/multi': lambda path: (400, {'message': 'no'})})
+
+        with local_bitfinex(routes) as (server, api):
+            results = api.add_orders([{
+                'pair': ExchangeAPI.LTCUSD, 'direction': ExchangeAPI.BUY,
+                'type_': ExchangeAPI.LIMIT, 'volume': Decimal(1), 'price': Decimal(50),
+            } for _ in range(2)])
+
+        self.assertEqual(len(results), 2)
+        self.assertTrue(all(isinstance(x, Exception) for x in results))
@@ -0,0 +1,114 @@
+import logging
+import logging.config
+import unittest
+
+from decimal import Decimal
+
+from venice.api.candle_series import CandleSeries
+from venice.strategy import SimulatedStrategyAPI, StrategyAPIError, indicator
+
+from .helpers import FakeAPI, flat_candles, prices
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+logging.config.fileConfig('logging_tests.conf')
+
+# Relative tolerance of the float results against the Decimal ones, and absolute tolerance for
+# values that are differences of close prices (MACD, momentum) and for RSI, which is in [0, 100]
+RELATIVE = 1e-9
+ABSOLUTE = 1e-9
+
+
+@unittest.skipIf(numpy is None, 'numpy is not installed')
+class TestNumpyIndicator(unittest.TestCase):
+    def setUp(self):
+        self.close = prices(3000)
+        self.array = numpy.array([float(x) for x in self.close])
+
+    def assertParity(self, array, decimal):
+        self.assertIsInstance(array, numpy.ndarray)
+        self.assertEqual(len(array), len(decimal))
+
+        numpy.testing.assert_allclose(array, [float(x) for x in decimal], rtol=RELATIVE,
+                                      atol=ABSOLUTE)
+
+    def test_sma(self):
+        for length in (1, 5, 20, 5000):
+            self.assertParity(indicator.sma(self.array, length),
+                              indicator.sma(self.close, length))
+
+    def test_ema(self):
+        for length in (1, 2, 5, 20, 200):
+            self.assertParity(indicator.ema(self.array, length),
+                              indicator.ema(self.close, length))
+
+    def test_macd(self):
+        for array, decimal in zip(indicator.macd(12, 26, self.array, 9),
+                                  indicator.macd(12, 26, self.close, 9)):
+            self.assertParity(array, decimal)
+
+    def test_mom(self):
+        for length in (1, 10, 5000):
+            self.assertParity(indicator.mom(self.array, length),
+                              indicator.mom(self.close, length))
+
+    def test_rsi(self):
+        for length in (2, 14):
+            self.assertParity(indicator.rsi(self.array, length),
+                              indicator.rsi(self.close, length))
+
+        self.assertParity(indicator.rsi(self.array[:5], 14), indicator.rsi(self.close[:5], 14))
+
+    def test_many(self):
+        lengths = [1, 2, 5, 12, 26, 200]
+
+        for row, length in zip(indicator.sma_many(self.array, lengths), lengths):
+            self.assertParity(row, indicator.sma(self.close, length))
+
+        for row, length in zip(indicator.ema_many(self.array, lengths), lengths):
+            self.assertTrue(numpy.isnan(row[:length - 1]).all())
+            self.assertParity(row[length - 1:], indicator.ema(self.close, length))
+
+        for row, length in zip(indicator.rsi_many(self.array, lengths[1:]), lengths[1:]):
+            self.assertParity(row, indicator.rsi(self.close, length))
+
+        self.assertEqual(indicator.ema_many(self.close, [5, 20]),
+                         [indicator.ema(self.close, 5), indicator.ema(self.close, 20)])
+
+    def test_cross(self):
+        fast_array, slow_array = indicator.ema(self.array, 5), indicator.ema(self.array, 20)
+        fast, slow = indicator.ema(self.close, 5), indicator.ema(self.close, 20)
+
+        for i in range(2, len(slow)):
+            j = len(fast) - len(slow) + i
+
+            self.assertEqual(indicator.crossover(fast_array[:j], slow_array[:i]),
+                             indicator.crossover(fast[:j], slow[:i]))
+            self.assertEqual(indicator.crossunder(fast_array[:j], slow_array[:i]),
+                             indicator.crossunder(fast[:j], slow[:i]))
+
+        self.assertEqual(indicator.crossover(self.array[:3], float(self.close[1])),
+                         indicator.crossover(self.close[:3], self.close[1]))
+
+    def test_strategy_api(self):
+        api = FakeAPI(flat_candles(self.close))
+        strategy_api = SimulatedStrategyAPI(api, 'ltcusd', '15', 1000, backend='numpy')
+        close = strategy_api.close(100)
+
+        self.assertIsInstance(close, numpy.ndarray)
+        self.assertEqual(list(close), [float(x) for x in self.close[-100:]])
+        self.assertEqual(list(strategy_api.ohl4(100)), list(close))
+        self.assertIsInstance(strategy_api.to_price(Decimal(1)), float)
+        self.assertEqual(list(CandleSeries(flat_candles(self.close)).time().array())[:1],
+                         [1514764800000])
+
+        with self.assertRaises(StrategyAPIError):
+            SimulatedStrategyAPI(FakeAPI(flat_candles(self.close)), 'ltcusd', '15', 1000,
+                                 backend='gpu')
+
+
+if __name__ == '__main__':
+    unittest.main()
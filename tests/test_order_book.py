@@ -0,0 +1,106 @@
+import json
+import logging
+import logging.config
+import unittest
+
+from decimal import Decimal
+
+from venice.api import BitfinexStream
+from venice.api.api import ExchangeAPI
+from venice.api.order_book import OrderBook, OrderBookException
+from venice.strategy import SimulatedStrategyAPI
+
+from .local_server import LocalWebSocketServer, local_bitfinex
+from .test_stream_bitfinex import wait_for
+
+logging.config.fileConfig('logging_tests.conf')
+
+LEVELS = [
+    [Decimal('50.1'), 2, Decimal('1.5')],
+    [Decimal('50.0'), 1, Decimal('2')],
+    [Decimal('49.5'), 3, Decimal('10')],
+    [Decimal('50.2'), 1, Decimal('-1')],
+    [Decimal('50.3'), 4, Decimal('-3')],
+]
+
+
+def book_server(websocket):
+    for message in websocket:
+        request = json.loads(message)
+        websocket.send(json.dumps(dict(request, event='subscribed', chanId=1)))
+        websocket.send(json.dumps([1, [[float(x), y, float(z)] for x, y, z in LEVELS]]))
+        websocket.send(json.dumps([1, 'hb']))
+        websocket.send(json.dumps([1, [50.2, 0, -1]]))
+        websocket.send(json.dumps([1, [50.25, 1, -0.5]]))
+
+
+class TestOrderBook(unittest.TestCase):
+    def test_levels(self):
+        book = OrderBook(LEVELS)
+
+        self.assertEqual(book.best_bid, (Decimal('50.1'), Decimal('1.5')))
+        self.assertEqual(book.best_ask, (Decimal('50.2'), Decimal('1')))
+        self.assertEqual(book.spread, Decimal('0.1'))
+        self.assertEqual([x[0] for x in book.bids.levels()], [Decimal('50.1'), 50, Decimal('49.5')])
+        self.assertEqual(book.asks.levels(1), [(Decimal('50.2'), 1)])
+
+    def test_update(self):
+        book = OrderBook(LEVELS)
+
+        book.update(Decimal('50.1'), 0, 1)
+        book.update(Decimal('50.05'), 1, Decimal('0.5'))
+        book.update(Decimal('50.3'), 5, Decimal('-4'))
+        book.update(Decimal('51'), 0, -1)
+
+        self.assertEqual(book.best_bid, (Decimal('50.05'), Decimal('0.5')))
+        self.assertEqual(len(book.bids), 3)
+        self.assertEqual(book.asks.levels(), [(Decimal('50.2'), 1), (Decimal('50.3'), 4)])
+
+    def test_fill_price(self):
+        book = OrderBook(LEVELS)
+
+        self.assertEqual(book.fill_price(ExchangeAPI.BUY, Decimal('0.5')), Decimal('50.2'))
+        self.assertEqual(book.fill_price(ExchangeAPI.BUY, 2), Decimal('50.25'))
+        self.assertEqual(book.fill_price(ExchangeAPI.SELL, Decimal('3.5')),
+                         (Decimal('1.5') * Decimal('50.1') + 2 * 50) / Decimal('3.5'))
+        self.assertRaises(OrderBookException, book.fill_price, ExchangeAPI.BUY, 5)
+
+        self.assertEqual(book.fill_price(ExchangeAPI.BUY, 0), Decimal('50.2'))
+        self.assertRaises(ValueError, book.fill_price, ExchangeAPI.BUY, -1)
+        self.assertRaises(OrderBookException, OrderBook().fill_price, ExchangeAPI.SELL, 0)
+
+    def test_large_book(self):
+        book = OrderBook([[Decimal(x), 1, Decimal(1)] for x in range(1, 5001)] + [
+            [Decimal(x), 1, Decimal(-1)] for x in range(5001, 10001)])
+
+        for x in range(5000, 1, -1):
+            book.update(Decimal(x), 0, 1)
+
+        self.assertEqual(book.best_bid, (1, 1))
+        self.assertEqual(len(book.asks), 5000)
+
+    def test_snapshot(self):
+        routes = {'/v2/book/tLTCUSD/P0': [[float(x), y, float(z)] for x, y, z in LEVELS]}
+
+        with local_bitfinex(routes) as (server, api):
+            book = api.order_book(ExchangeAPI.LTCUSD, length=25)
+
+        self.assertEqual(server.requests[0][1], '/v2/book/tLTCUSD/P0?len=25')
+        self.assertEqual(book.best_ask, (Decimal('50.2'), 1))
+
+    def test_stream(self):
+        with LocalWebSocketServer(book_server) as ws, BitfinexStream(uri=ws.uri) as stream:
+            stream.subscribe_book(ExchangeAPI.LTCUSD, length=25)
+
+            self.assertTrue(stream.wait(5))
+            book = stream.book(ExchangeAPI.LTCUSD)
+            self.assertTrue(wait_for(lambda: book.best_ask[0] == Decimal('50.25')))
+
+            api = SimulatedStrategyAPI(None, ExchangeAPI.LTCUSD, ExchangeAPI.P15, 100,
+                                       stream=stream)
+            order = api._add_order(ExchangeAPI.LTCUSD, ExchangeAPI.BUY, ExchangeAPI.MARKET,
+                                   volume=Decimal('0.5'))[0]
+            fill_price = api.fill_price(ExchangeAPI.SELL, 1)
+
+        self.assertEqual(order.avg_price, Decimal('50.25'))
+        self.assertEqual(fill_price, Decimal('50.1'))
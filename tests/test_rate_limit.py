@@ -0,0 +1,87 @@
+import logging
+import logging.config
+import time
+import unittest
+
+from venice.connection import DeadlineExceeded, RateLimiter, TokenBucket
+from venice.connection.bitfinex import BitfinexConnection
+
+from .local_server import LocalServer
+
+logging.config.fileConfig('logging_tests.conf')
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_burst(self):
+        bucket = TokenBucket(10, 2)
+
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertAlmostEqual(bucket.reserve(), 0.1, delta=0.01)
+        self.assertAlmostEqual(bucket.reserve(), 0.2, delta=0.01)
+
+    def test_max_wait(self):
+        bucket = TokenBucket(10, 1)
+
+        self.assertEqual(bucket.reserve(max_wait=0), 0)
+        self.assertIsNone(bucket.reserve(max_wait=0.05))
+        self.assertAlmostEqual(bucket.reserve(max_wait=0.2), 0.1, delta=0.01)
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_prefix(self):
+        limiter = RateLimiter({'v1/orders': (1, 60, 1), 'v1/orders/hist': (1, 1, 1)})
+
+        self.assertEqual(limiter._limit('v1/orders/hist')[0], 'v1/orders/hist')
+        self.assertEqual(limiter._limit('v1/orders')[0], 'v1/orders')
+        self.assertEqual(limiter._limit('v1/symbols'), ('v1/symbols', None))
+        self.assertEqual(limiter.acquire('v1/symbols'), 0)
+
+    def test_keys(self):
+        limiter = RateLimiter({'v1/summary': (1, 60, 1)})
+
+        self.assertEqual(limiter.acquire('v1/summary', 'a'), 0)
+        self.assertEqual(limiter.acquire('v1/summary', 'b'), 0)
+
+    def test_wait(self):
+        limiter = RateLimiter(default=(20, 1, 1))
+
+        start_time = time.time()
+
+        for _ in range(3):
+            limiter.acquire('v1/symbols')
+
+        self.assertGreaterEqual(time.time() - start_time, 0.09)
+        self.assertEqual(limiter.waits['v1/symbols'], 2)
+        self.assertAlmostEqual(limiter.wait_time['v1/symbols'], 0.1, delta=0.02)
+
+    def test_connection(self):
+        limiter = RateLimiter({'v1/symbols': (10, 1, 1)})
+
+        with LocalServer({'/v1/symbols': ['ltcusd']}) as server:
+            c = BitfinexConnection(uri=server.uri, rate_limiter=limiter)
+
+            start_time = time.time()
+
+            for _ in range(3):
+                c.query_public('symbols')
+
+            self.assertGreaterEqual(time.time() - start_time, 0.19)
+            self.assertEqual(len(server.requests), 3)
+            self.assertEqual(limiter.waits['v1/symbols'], 2)
+
+    def test_deadline(self):
+        limiter = RateLimiter({'v1/symbols': (1, 10, 1)})
+
+        with LocalServer({'/v1/symbols': ['ltcusd']}) as server:
+            c = BitfinexConnection(uri=server.uri, rate_limiter=limiter,
+                                   deadline=time.monotonic() + 1)
+            c.query_public('symbols')
+
+            start_time = time.time()
+
+            with self.assertRaises(DeadlineExceeded):
+                c.query_public('symbols')
+
+            self.assertLess(time.time() - start_time, 0.1)
+            self.assertEqual(len(server.requests), 1)
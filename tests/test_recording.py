@@ -0,0 +1,140 @@
+import logging
+import logging.config
+import os
+import tempfile
+import time
+import unittest
+
+from decimal import Decimal
+
+from venice.api.api import ExchangeAPI
+from venice.api.bitfinex import BitfinexAPI
+from venice.connection import (
+    ExchangeConnectionTransientException, RequestRecorder, RequestReplayer)
+from venice.connection.bitfinex import BitfinexConnection
+from venice.strategy import SimulatedStrategyAPI
+from venice.strategy.ema import EMAStrategy
+
+from .local_server import FEES, FakeKeyHome, LocalServer
+
+logging.config.fileConfig('logging_tests.conf')
+
+TICKER = {
+    'mid': '150.5', 'bid': '150.0', 'ask': '151.0', 'last_price': '150.2', 'low': '49.0',
+    'high': '152.0', 'volume': '1000.0', 'timestamp': '1514764800.0',
+}
+
+CANDLES = [[1514764800000 - x * 900000, 150 - x, 150 - x, 151 - x, 149 - x, 10]
+           for x in range(100)]
+
+ROUTES = {
+    '/v1/pubticker/ltcusd': TICKER,
+    '/v1/summary': FEES,
+    '/v2/candles/trade:15m:tLTCUSD/hist': CANDLES,
+}
+
+
+class TestRecording(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'requests.gz')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def cycle(self, api):
+        return (api.ticker(ExchangeAPI.LTCUSD).last,
+                [x.close for x in api.ohlc(ExchangeAPI.LTCUSD, ExchangeAPI.P15, limit=100)],
+                api.fees())
+
+    def test_replay(self):
+        with FakeKeyHome(), LocalServer(ROUTES) as server, RequestRecorder(self.path) as recorder:
+            recorded = self.cycle(BitfinexAPI(uri=server.uri, recorder=recorder))
+
+        replayer = RequestReplayer(self.path)
+        replayed = self.cycle(BitfinexAPI(uri='http://127.0.0.1:1/', recorder=replayer))
+
+        self.assertEqual(recorded, replayed)
+        self.assertEqual(replayer.requests, 3)
+        self.assertEqual(replayer.misses, 0)
+
+    def test_order(self):
+        with RequestRecorder(self.path) as recorder:
+            recorder.send('POST', 'v1/order/status', {'order_id': 1, 'nonce': '1'},
+                          lambda: (200, b'{"id": 1, "n": 1}'))
+            recorder.send('POST', 'v1/order/status', {'order_id': 1, 'nonce': '2'},
+                          lambda: (200, b'{"id": 1, "n": 2}'))
+            recorder.send('POST', 'v1/order/status', {'order_id': 2, 'nonce': '3'},
+                          lambda: (200, b'{"id": 2, "n": 1}'))
+
+        c = BitfinexConnection(recorder=RequestReplayer(self.path))
+
+        with c:
+            self.assertEqual(c.query_private('order/status', params={'order_id': 2})['n'], 1)
+            self.assertEqual(c.query_private('order/status', params={'order_id': 1})['n'], 1)
+            self.assertEqual(c.query_private('order/status', params={'order_id': 1})['n'], 2)
+            self.assertEqual(c.query_private('order/status', params={'order_id': 1})['n'], 2)
+
+    def test_timing(self):
+        with LocalServer(ROUTES, delay=0.2) as server, RequestRecorder(self.path) as recorder:
+            BitfinexConnection(uri=server.uri, recorder=recorder).query_public('pubticker/ltcusd')
+
+        for speed, minimum, maximum in [(None, 0, 0.1), (1, 0.2, 1), (4, 0.05, 0.15)]:
+            c = BitfinexConnection(recorder=RequestReplayer(self.path, speed=speed))
+
+            start_time = time.time()
+            c.query_public('pubticker/ltcusd')
+            elapsed = time.time() - start_time
+
+            self.assertGreaterEqual(elapsed, minimum)
+            self.assertLess(elapsed, maximum)
+
+    def test_inter_arrival(self):
+        with LocalServer(ROUTES) as server, RequestRecorder(self.path) as recorder:
+            c = BitfinexConnection(uri=server.uri, recorder=recorder)
+
+            c.query_public('pubticker/ltcusd')
+            time.sleep(0.4)
+            c.query_public('summary')
+
+        for speed, minimum, maximum in [(None, 0, 0.1), (1, 0.4, 0.6), (4, 0.1, 0.2)]:
+            c = BitfinexConnection(recorder=RequestReplayer(self.path, speed=speed))
+
+            c.query_public('pubticker/ltcusd')
+            start_time = time.time()
+            c.query_public('summary')
+            elapsed = time.time() - start_time
+
+            self.assertGreaterEqual(elapsed, minimum)
+            self.assertLess(elapsed, maximum)
+
+    def test_error(self):
+        with LocalServer(ROUTES, delay=0.5) as server, RequestRecorder(self.path) as recorder:
+            c = BitfinexConnection(uri=server.uri, recorder=recorder, timeout=0.1)
+
+            with self.assertRaises(ExchangeConnectionTransientException):
+                c.query_public('pubticker/ltcusd')
+
+        c = BitfinexConnection(recorder=RequestReplayer(self.path))
+
+        with self.assertRaises(ExchangeConnectionTransientException):
+            c.query_public('pubticker/ltcusd')
+
+    def test_pipeline(self):
+        def run(api):
+            strategy_api = SimulatedStrategyAPI(api, ExchangeAPI.LTCUSD, ExchangeAPI.P15, 100)
+            strategy = EMAStrategy(strategy_api, 5, 20, False, None)
+
+            strategy.run()
+            strategy_api.update()
+
+            return strategy_api.orders['EMA']['buy'].volume
+
+        with FakeKeyHome(), LocalServer(ROUTES) as server, RequestRecorder(self.path) as recorder:
+            recorded = run(BitfinexAPI(uri=server.uri, recorder=recorder))
+
+        replayer = RequestReplayer(self.path)
+
+        self.assertEqual(run(BitfinexAPI(recorder=replayer)), recorded)
+        self.assertGreater(recorded, Decimal(0))
+        self.assertEqual(replayer.misses, 0)
@@ -0,0 +1,153 @@
+import itertools
+import logging
+import logging.config
+import time
+import unittest
+
+from venice.api.bitfinex import BitfinexAPI
+from venice.connection import (
+    ExchangeConnectionException, ExchangeConnectionTransientException, RateLimiter,
+    RequestPolicy)
+from venice.connection.bitfinex import BitfinexConnection
+
+from .local_server import LocalServer
+
+logging.config.fileConfig('logging_tests.conf')
+
+
+def failing(failures, status=500):
+    counter = itertools.count()
+
+    def route(path):
+        if next(counter) < failures:
+            return status, {'message': 'error'}
+
+        return 200, ['ltcusd']
+
+    return route
+
+
+def slow_first(delay):
+    counter = itertools.count()
+
+    def route(path):
+        if not next(counter):
+            time.sleep(delay)
+
+        return 200, ['ltcusd']
+
+    return route
+
+
+class TestRequestPolicy(unittest.TestCase):
+    def test_timeout(self):
+        with LocalServer({'/v1/symbols': ['ltcusd']}, delay=0.5) as server:
+            c = BitfinexConnection(uri=server.uri, timeout=0.1)
+
+            start_time = time.time()
+
+            with self.assertRaises(ExchangeConnectionTransientException):
+                c.query_public('symbols')
+
+            self.assertLess(time.time() - start_time, 0.4)
+
+    def test_deadline(self):
+        with LocalServer({'/v1/symbols': ['ltcusd']}, delay=1) as server:
+            c = BitfinexConnection(
+                uri=server.uri, policy=RequestPolicy(), deadline=time.monotonic() + 0.2)
+
+            start_time = time.time()
+
+            with self.assertRaises(ExchangeConnectionTransientException):
+                c.query_public('symbols')
+
+            self.assertLess(time.time() - start_time, 0.5)
+
+    def test_retry(self):
+        with LocalServer({'/v1/symbols': failing(2)}) as server:
+            c = BitfinexConnection(uri=server.uri, policy=RequestPolicy(backoff=0.01))
+
+            self.assertEqual(c.query_public('symbols'), ['ltcusd'])
+            self.assertEqual(len(server.requests), 3)
+
+    def test_retry_limit(self):
+        with LocalServer({'/v1/symbols': failing(5, status=429)}) as server:
+            c = BitfinexConnection(uri=server.uri, policy=RequestPolicy(retries=1, backoff=0.01))
+
+            with self.assertRaises(ExchangeConnectionTransientException):
+                c.query_public('symbols')
+
+            self.assertEqual(len(server.requests), 2)
+
+    def test_retry_rate_limit(self):
+        limiter = RateLimiter({'v1/symbols': (1, 0.2, 1)})
+
+        with LocalServer({'/v1/symbols': failing(2, status=429)}) as server:
+            c = BitfinexConnection(uri=server.uri, policy=RequestPolicy(backoff=0.01),
+                                   rate_limiter=limiter)
+
+            start_time = time.time()
+
+            # Each retry waits for a token of its own
+            self.assertEqual(c.query_public('symbols'), ['ltcusd'])
+            self.assertGreater(time.time() - start_time, 0.35)
+            self.assertEqual(len(server.requests), 3)
+
+    def test_no_retry(self):
+        with LocalServer({'/v1/symbols': failing(1, status=400),
+                          '/v1/balances': failing(1)}) as server:
+            c = BitfinexConnection(
+                uri=server.uri, key='key', secret='secret', policy=RequestPolicy(backoff=0.01))
+
+            with self.assertRaises(ExchangeConnectionException):
+                c.query_public('symbols')
+
+            with self.assertRaises(ExchangeConnectionTransientException):
+                c.query_private('balances')
+
+            self.assertEqual(len(server.requests), 2)
+
+    def test_hedge(self):
+        policy = RequestPolicy(hedge=True)
+
+        for _ in range(10):
+            policy.record('v1/symbols', 0.05)
+
+        with LocalServer({'/v1/symbols': slow_first(1)}) as server:
+            c = BitfinexConnection(uri=server.uri, policy=policy)
+
+            start_time = time.time()
+
+            self.assertEqual(c.query_public('symbols'), ['ltcusd'])
+            self.assertLess(time.time() - start_time, 0.5)
+            self.assertEqual(policy.hedges, 1)
+            self.assertEqual(len(server.requests), 2)
+
+    def test_hedge_rate_limit(self):
+        policy = RequestPolicy(hedge=True)
+        limiter = RateLimiter({'v1/symbols': (1, 10, 1)})
+
+        for _ in range(10):
+            policy.record('v1/symbols', 0.05)
+
+        with LocalServer({'/v1/symbols': slow_first(0.3)}) as server:
+            c = BitfinexConnection(uri=server.uri, policy=policy, rate_limiter=limiter)
+
+            # The only token is taken by the first request, so it is not hedged
+            self.assertEqual(c.query_public('symbols'), ['ltcusd'])
+            self.assertEqual(policy.hedges, 0)
+            self.assertEqual(len(server.requests), 1)
+
+    def test_api_deadline(self):
+        api = BitfinexAPI()
+
+        with api.deadline(10):
+            outer = api._deadline
+
+            with api.deadline(20):
+                self.assertEqual(api._deadline, outer)
+
+            with api.deadline(1):
+                self.assertLess(api._connection().deadline, outer)
+
+        self.assertIsNone(api._deadline)
@@ -0,0 +1,133 @@
+import logging
+import logging.config
+import random
+import unittest
+
+from decimal import Decimal
+
+from venice.strategy import indicator
+
+logging.config.fileConfig('logging_tests.conf')
+
+TOLERANCE = Decimal('1e-20')
+
+
+def bars(count, seed=1):
+    generator = random.Random(seed)
+    price = Decimal(50)
+    result = []
+
+    for _ in range(count):
+        price = max(price + Decimal(generator.randint(-1000, 1000)).scaleb(-3), Decimal(1))
+        spread = Decimal(generator.randint(0, 500)).scaleb(-3)
+        result.append((price + spread, price - spread, price + spread / 2))
+
+    return result
+
+
+def windows(source, length):
+    return [source[max(0, x - length + 1):x + 1] for x in range(0, len(source))]
+
+
+class TestRollingIndicator(unittest.TestCase):
+    def setUp(self):
+        self.high, self.low, self.close = [list(x) for x in zip(*bars(200))]
+
+        # Repeated values, to exercise ties in the monotonic deques
+        generator = random.Random(2)
+        self.steps = [Decimal(generator.randint(0, 5)) for _ in range(200)]
+
+    def assertClose(self, first, second):
+        self.assertEqual(len(first), len(second))
+
+        for x, y in zip(first, second):
+            self.assertLess(abs(x - y), TOLERANCE)
+
+    def test_primitives(self):
+        for source in (self.close, self.steps):
+            for length in (1, 3, 20):
+                self.assertEqual(indicator.rolling_sum(source, length),
+                                 [sum(x) for x in windows(source, length)])
+                self.assertEqual(indicator.rolling_max(source, length),
+                                 [max(x) for x in windows(source, length)])
+                self.assertEqual(indicator.rolling_min(source, length),
+                                 [min(x) for x in windows(source, length)])
+                self.assertClose(indicator.rolling_variance(source, length), [
+                    sum((y - sum(x) / len(x)) ** 2 for y in x) / len(x) for x in windows(
+                        source, length)])
+
+    def test_replace(self):
+        generator = random.Random(3)
+
+        for length in (1, 3, 20):
+            indicators = [indicator.RollingSum(length), indicator.RollingMax(length),
+                          indicator.RollingMin(length), indicator.RollingVariance(length)]
+
+            for value in self.steps:
+                for x in indicators:
+                    x.update(value + generator.randint(-3, 3))
+                    x.update(value + generator.randint(-3, 3), replace=True)
+                    x.update(value, replace=True)
+
+            self.assertEqual(indicators[0].result, indicator.rolling_sum(self.steps, length))
+            self.assertEqual(indicators[1].result, indicator.rolling_max(self.steps, length))
+            self.assertEqual(indicators[2].result, indicator.rolling_min(self.steps, length))
+            self.assertClose(indicators[3].result, indicator.rolling_variance(self.steps, length))
+
+    def test_donchian(self):
+        upper, middle, lower = indicator.donchian(self.high, self.low, 20)
+
+        self.assertEqual(upper, [max(x) for x in windows(self.high, 20)])
+        self.assertEqual(lower, [min(x) for x in windows(self.low, 20)])
+        self.assertEqual(middle, [(x + y) / 2 for x, y in zip(upper, lower)])
+
+    def test_atr(self):
+        high = [Decimal(x) for x in (10, 12, 11, 15)]
+        low = [Decimal(x) for x in (8, 9, 9, 12)]
+        close = [Decimal(x) for x in (9, 11, 10, 14)]
+
+        # True ranges of 2, 3, 2 and 5, averaged over the first two bars and then smoothed
+        self.assertEqual(indicator.atr(high, low, close, 2), [
+            Decimal(2), Decimal('2.5'), Decimal('2.25'), Decimal('3.625')])
+
+    def test_bollinger(self):
+        upper, middle, lower = indicator.bollinger(self.close, 20)
+        variance = indicator.rolling_variance(self.close, 20)
+
+        self.assertClose(middle[19:], indicator.sma(self.close, 20)[19:])
+        self.assertClose(upper, [x + 2 * y.sqrt() for x, y in zip(middle, variance)])
+        self.assertClose(lower, [x - 2 * y.sqrt() for x, y in zip(middle, variance)])
+
+    def test_stochastic(self):
+        k, d = indicator.stochastic(self.high, self.low, self.close, 14)
+
+        self.assertEqual(k, [100 * (z - min(y)) / (max(x) - min(y)) for x, y, z in zip(
+            windows(self.high, 14), windows(self.low, 14), self.close)])
+        self.assertClose(d, indicator.sma(k, 3))
+        self.assertEqual(indicator.stochastic([Decimal(1)], [Decimal(1)], [Decimal(1)], 14),
+                         ([Decimal(50)], [Decimal(50) / 3]))
+
+    def test_composite_replace(self):
+        donchian, atr = indicator.Donchian(10), indicator.ATR(10)
+        bollinger, stochastic = indicator.Bollinger(10), indicator.Stochastic(10)
+
+        for high, low, close in zip(self.high, self.low, self.close):
+            for replace, offset in ((False, 1), (True, -1), (True, 0)):
+                donchian.update(high + offset, low + offset, replace)
+                atr.update(high + offset, low + offset, close + offset, replace)
+                bollinger.update(close + offset, replace)
+                stochastic.update(high + offset, low + offset, close + offset, replace)
+
+        self.assertEqual((donchian.upper, donchian.middle, donchian.lower),
+                         indicator.donchian(self.high, self.low, 10))
+        self.assertEqual(atr.result, indicator.atr(self.high, self.low, self.close, 10))
+
+        # Running sums depend on the order of the updates
+        for x, y in zip((bollinger.upper, bollinger.middle, bollinger.lower, stochastic.k,
+                         stochastic.d), indicator.bollinger(self.close, 10) +
+                        indicator.stochastic(self.high, self.low, self.close, 10)):
+            self.assertClose(x, y)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import logging
+import logging.config
+import threading
+import time
+import unittest
+
+from concurrent.futures import ThreadPoolExecutor
+
+from venice.api.api import ExchangeAPI
+from venice.api.single_flight import SingleFlight
+
+from venice.api.bitfinex import BitfinexAPI
+
+from .local_server import TICKER, FakeKeyHome, LocalServer, local_bitfinex
+
+logging.config.fileConfig('logging_tests.conf')
+
+class TestSingleFlight(unittest.TestCase):
+    def test_shared(self):
+        single_flight = SingleFlight()
+        started = threading.Event()
+
+        def slow():
+            started.set()
+            time.sleep(0.2)
+            return object()
+
+        with ThreadPoolExecutor(4) as executor:
+            first = executor.submit(single_flight.do, 'key', slow)
+            started.wait()
+            others = [executor.submit(single_flight.do, 'key', slow) for _ in range(3)]
+
+            results = [first.result()] + [x.result() for x in others]
+
+        self.assertTrue(all(x is results[0] for x in results))
+        self.assertEqual(single_flight.calls, 1)
+        self.assertEqual(single_flight.shared, 3)
+
+    def test_error(self):
+        single_flight = SingleFlight()
+        started = threading.Event()
+
+        def fail():
+            started.set()
+            time.sleep(0.1)
+            raise ValueError
+
+        with ThreadPoolExecutor(2) as executor:
+            first = executor.submit(single_flight.do, 'key', fail)
+            started.wait()
+            second = executor.submit(single_flight.do, 'key', fail)
+
+            self.assertRaises(ValueError, first.result)
+            self.assertRaises(ValueError, second.result)
+
+        self.assertEqual(single_flight.do('key', lambda: 1), 1)
+
+    def test_ticker(self):
+        routes = {'/v1/pubticker/ltcusd': TICKER, '/v1/pubticker/btcusd': TICKER}
+
+        with local_bitfinex(routes, delay=0.2) as (server, api), ThreadPoolExecutor(6) as executor:
+            futures = [executor.submit(api.ticker, x) for x in 4 * [ExchangeAPI.LTCUSD] + 2 * [
+                ExchangeAPI.BTCUSD]]
+            results = [x.result() for x in futures]
+
+        self.assertEqual(len(server.requests), 2)
+        self.assertIs(results[0], results[3])
+        self.assertIsNot(results[0], results[4])
+
+    def test_uri(self):
+        routes = {'/v1/pubticker/ltcusd': TICKER}
+        single_flight = SingleFlight()
+
+        with FakeKeyHome(), LocalServer(routes, delay=0.2) as first, \
+                LocalServer(routes, delay=0.2) as second, ThreadPoolExecutor(2) as executor:
+            apis = [BitfinexAPI(uri=x.uri, single_flight=single_flight) for x in [first, second]]
+            futures = [executor.submit(x.ticker, ExchangeAPI.LTCUSD) for x in apis]
+            [x.result() for x in futures]
+
+        # Each exchange is queried, even with a shared SingleFlight
+        self.assertEqual([len(x.requests) for x in [first, second]], [1, 1])
@@ -0,0 +1,138 @@
+import json
+import logging
+import logging.config
+import time
+import unittest
+
+from decimal import Decimal
+
+from venice.api import BitfinexStream
+from venice.api.api import ExchangeAPI
+from venice.strategy import StrategyAPI
+
+from .local_server import LocalWebSocketServer
+
+logging.config.fileConfig('logging_tests.conf')
+
+TIME = 1514764800000
+PERIOD = 900000
+
+TICKER = [50.0, 10, 51.0, 12, 1.5, 0.03, 50.2, 1000.0, 52.0, 49.0]
+
+
+class FakeBitfinex:
+    """Minimal Bitfinex v2 WebSocket server, optionally dropping its first connection or sending
+    a malformed message on it."""
+    def __init__(self, drop=False, malformed=False):
+        self.drop = drop
+        self.malformed = malformed
+        self.subscriptions = []
+        self.sessions = 0
+
+    def __call__(self, websocket):
+        self.sessions += 1
+        websocket.send(json.dumps({'event': 'info', 'version': 2}))
+
+        if self.malformed and self.sessions == 1:
+            websocket.send('not json')
+
+        for message in websocket:
+            request = json.loads(message)
+            self.subscriptions.append(request)
+
+            channel_id = len(self.subscriptions)
+            response = dict(request, event='subscribed', chanId=channel_id)
+            websocket.send(json.dumps(response))
+
+            if request['channel'] == 'candles':
+                candles = [[TIME - x * PERIOD, 50, 50 + x, 52, 49, 10] for x in range(3)]
+                websocket.send(json.dumps([channel_id, candles]))
+                websocket.send(json.dumps([channel_id, 'hb']))
+                websocket.send(json.dumps([channel_id, [TIME, 50, 55, 56, 49, 11]]))
+                websocket.send(json.dumps([channel_id, [TIME + PERIOD, 55, 54, 55, 54, 1]]))
+
+            elif request['channel'] == 'ticker':
+                websocket.send(json.dumps([channel_id, TICKER]))
+
+            else:
+                trades = [[2, TIME + 1, 0.5, 50.1], [1, TIME, -0.2, 50.0]]
+                websocket.send(json.dumps([channel_id, trades]))
+                websocket.send(json.dumps([channel_id, 'te', [3, TIME + 2, 0.1, 50.2]]))
+                websocket.send(json.dumps([channel_id, 'tu', [3, TIME + 2, 0.1, 50.2]]))
+
+            if self.drop and len(self.subscriptions) == 2 and self.sessions == 1:
+                return
+
+
+def wait_for(condition, timeout=5):
+    end_time = time.time() + timeout
+
+    while not condition() and time.time() < end_time:
+        time.sleep(0.01)
+
+    return condition()
+
+
+class TestBitfinexStream(unittest.TestCase):
+    def test_channels(self):
+        server = FakeBitfinex()
+
+        with LocalWebSocketServer(server) as ws, BitfinexStream(uri=ws.uri) as stream:
+            stream.subscribe_candles(ExchangeAPI.LTCUSD, ExchangeAPI.P15)
+            stream.subscribe_ticker(ExchangeAPI.LTCUSD)
+            stream.subscribe_trades(ExchangeAPI.LTCUSD)
+
+            self.assertTrue(stream.wait(5))
+            self.assertTrue(wait_for(lambda: len(stream.candles(
+                ExchangeAPI.LTCUSD, ExchangeAPI.P15)) == 4))
+            self.assertTrue(wait_for(lambda: len(stream.trades(ExchangeAPI.LTCUSD)) == 3))
+
+            candles = stream.candles(ExchangeAPI.LTCUSD, ExchangeAPI.P15)
+            ticker = stream.ticker(ExchangeAPI.LTCUSD)
+            trades = stream.trades(ExchangeAPI.LTCUSD)
+
+        self.assertEqual([x.time for x in candles], [TIME - 2 * PERIOD, TIME - PERIOD, TIME,
+                                                     TIME + PERIOD])
+        self.assertEqual(candles[2].close, 55)
+        self.assertEqual(candles[2].volume, 11)
+        self.assertEqual(ticker.bid, Decimal('50.0'))
+        self.assertEqual(ticker.ask, Decimal('51.0'))
+        self.assertEqual(ticker.last, Decimal('50.2'))
+        self.assertEqual([x[0] for x in trades], [1, 2, 3])
+
+    def test_reconnect(self):
+        server = FakeBitfinex(drop=True)
+
+        with LocalWebSocketServer(server) as ws, \
+                BitfinexStream(uri=ws.uri, reconnect_delay=0.05) as stream:
+            stream.subscribe_candles(ExchangeAPI.LTCUSD, ExchangeAPI.P15)
+            stream.subscribe_ticker(ExchangeAPI.LTCUSD)
+
+            self.assertTrue(wait_for(lambda: stream.connections == 2))
+            self.assertTrue(stream.wait(5))
+
+        self.assertEqual(len(server.subscriptions), 4)
+        self.assertEqual(server.subscriptions[2:], server.subscriptions[:2])
+
+    def test_malformed_message(self):
+        server = FakeBitfinex(malformed=True)
+
+        with LocalWebSocketServer(server) as ws, \
+                BitfinexStream(uri=ws.uri, reconnect_delay=0.05) as stream:
+            stream.subscribe_ticker(ExchangeAPI.LTCUSD)
+
+            self.assertTrue(wait_for(lambda: stream.connections == 2))
+            self.assertTrue(wait_for(lambda: stream.ticker(ExchangeAPI.LTCUSD)))
+
+    def test_strategy_api(self):
+        server = FakeBitfinex()
+
+        with LocalWebSocketServer(server) as ws, BitfinexStream(uri=ws.uri) as stream:
+            stream.subscribe_candles(ExchangeAPI.LTCUSD, ExchangeAPI.P15)
+            stream.subscribe_ticker(ExchangeAPI.LTCUSD)
+            stream.wait(5)
+
+            api = StrategyAPI(None, ExchangeAPI.LTCUSD, ExchangeAPI.P15, 100, stream=stream)
+
+            self.assertEqual(api.ticker.last, Decimal('50.2'))
+            self.assertEqual(len(api.close(limit=3)), 3)
@@ -0,0 +1,68 @@
+import itertools
+import logging
+import logging.config
+import unittest
+
+from venice.api.api import ExchangeAPI
+from venice.connection import (
+    ExchangeConnectionException, RateLimiter, RequestPolicy, Telemetry)
+from venice.connection.bitfinex import BitfinexConnection
+
+from .local_server import TICKER, LocalServer, local_bitfinex
+
+logging.config.fileConfig('logging_tests.conf')
+
+def failing_once(path, counter=itertools.count()):
+    return (500, {'message': 'error'}) if not next(counter) else (200, ['ltcusd'])
+
+
+class TestTelemetry(unittest.TestCase):
+    def test_histogram(self):
+        telemetry = Telemetry()
+
+        for latency in [0.005] * 90 + [0.3] * 9 + [20]:
+            telemetry.record('v1/symbols', latency, 10)
+
+        stats = telemetry.stats()['v1/symbols']
+
+        self.assertEqual(stats.requests, 100)
+        self.assertEqual(stats.bytes, 1000)
+        self.assertEqual(stats.quantile(0.5), 0.01)
+        self.assertEqual(stats.quantile(0.95), 0.5)
+        self.assertEqual(stats.quantile(1), 20)
+        self.assertEqual(stats.histogram[-1], 1)
+
+    def test_connection(self):
+        telemetry = Telemetry()
+
+        with LocalServer({'/v1/symbols': failing_once}) as server:
+            c = BitfinexConnection(
+                uri=server.uri, telemetry=telemetry, policy=RequestPolicy(backoff=0.01),
+                rate_limiter=RateLimiter(default=(10, 1, 1)))
+
+            c.query_public('symbols')
+            c.query_public('symbols')
+
+            with self.assertRaises(ExchangeConnectionException):
+                c.query_public('missing')
+
+        stats = telemetry.stats()
+
+        self.assertEqual(stats['v1/symbols'].requests, 3)
+        self.assertEqual(stats['v1/symbols'].errors, 1)
+        self.assertEqual(stats['v1/symbols'].retries, 1)
+        # The retry and the second query wait for a token
+        self.assertEqual(stats['v1/symbols'].waits, 2)
+        self.assertGreater(stats['v1/symbols'].bytes, 0)
+        self.assertEqual(stats['v1/missing'].errors, 1)
+
+    def test_api(self):
+        with local_bitfinex({'/v1/pubticker/ltcusd': TICKER}) as (server, api):
+            api.ticker(ExchangeAPI.LTCUSD)
+            api.ticker(ExchangeAPI.LTCUSD)
+
+            with self.assertLogs('venice.connection.telemetry') as logs:
+                api.telemetry.dump()
+
+        self.assertEqual(api.telemetry.stats()['v1/pubticker/ltcusd'].requests, 2)
+        self.assertIn('v1/pubticker/ltcusd', logs.output[0])
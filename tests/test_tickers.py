@@ -0,0 +1,60 @@
+import logging
+import logging.config
+import unittest
+
+from decimal import Decimal
+
+from venice.api.api import ExchangeAPI
+from venice.strategy import SimulatedStrategyAPI, TickerSnapshot
+
+from .local_server import TICKER, local_bitfinex
+
+logging.config.fileConfig('logging_tests.conf')
+
+
+def ticker(symbol, last):
+    return [symbol, last - 1, 10, last + 1, 10, 0.5, 0.01, last, 1000, last + 5, last - 5]
+
+
+TICKERS = [ticker('tBTCUSD', 10000), ticker('tLTCUSD', 50), ticker('tETHUSD', 700)]
+
+
+class TestTickers(unittest.TestCase):
+    def test_tickers(self):
+        with local_bitfinex({'/v2/tickers': TICKERS}) as (server, api):
+            tickers = api.tickers([ExchangeAPI.BTCUSD, ExchangeAPI.LTCUSD, ExchangeAPI.ETHUSD])
+
+        self.assertEqual(len(server.requests), 1)
+        self.assertEqual(server.requests[0][1], '/v2/tickers?symbols=tBTCUSD,tLTCUSD,tETHUSD')
+        self.assertEqual(tickers[ExchangeAPI.LTCUSD].last, 50)
+        self.assertEqual(tickers[ExchangeAPI.LTCUSD].bid, 49)
+        self.assertEqual(tickers[ExchangeAPI.BTCUSD].ask, 10001)
+        self.assertIsInstance(tickers[ExchangeAPI.ETHUSD].high, Decimal)
+
+    def test_snapshot(self):
+        with local_bitfinex({'/v2/tickers': TICKERS}) as (server, api):
+            snapshot = TickerSnapshot(api, [ExchangeAPI.BTCUSD, ExchangeAPI.LTCUSD])
+            strategy_apis = [SimulatedStrategyAPI(api, x, '15', 1000, tickers=snapshot) for x in [
+                ExchangeAPI.BTCUSD, ExchangeAPI.LTCUSD]]
+
+            self.assertEqual([x.ticker.last for x in strategy_apis], [10000, 50])
+            self.assertEqual(len(server.requests), 1)
+
+            snapshot.clear()
+
+            self.assertEqual([x.ticker.last for x in strategy_apis], [10000, 50])
+            self.assertEqual(len(server.requests), 2)
+
+    def test_snapshot_missing(self):
+        routes = {'/v2/tickers': TICKERS[:1], '/v1/pubticker/ltcusd': TICKER}
+
+        with local_bitfinex(routes) as (server, api):
+            snapshot = TickerSnapshot(api, [ExchangeAPI.BTCUSD, ExchangeAPI.LTCUSD])
+
+            self.assertEqual(snapshot.get(ExchangeAPI.LTCUSD).bid, Decimal(TICKER['bid']))
+            self.assertEqual(snapshot.get(ExchangeAPI.BTCUSD).last, 10000)
+            snapshot.get(ExchangeAPI.LTCUSD)
+
+        # The pair left out of the bulk response is fetched once, on its own
+        self.assertEqual([x[1].split('?')[0] for x in server.requests], [
+            '/v2/tickers', '/v1/pubticker/ltcusd'])
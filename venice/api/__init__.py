@@ -1,8 +1,14 @@
 from .api import ExchangeAPI, ExchangeAPIException
+from .cache import TTLCache
 
 from . import bitfinex
+from .aio import AsyncBitfinexAPI
+from .stream import BitfinexStream
 
 from .ohlc import OHLC
+from .aggregator import CandleAggregator
+from .candle_series import CandleSeries
+from .order_book import OrderBook, OrderBookException
 from .order_status import OrderStatus
 from .position import Position
 from .ticker import Ticker
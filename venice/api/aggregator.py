@@ -0,0 +1,84 @@
+from .candle_buffer import CandleBuffer
+from .ohlc import OHLC
+
+
+class CandleAggregator:
+    """Candles of any period built locally from trades or from candles of a shorter period.
+
+    Candles are aligned to multiples of the period (in milliseconds) since the epoch. Trades and
+    candles can be added again as they arrive: trades already seen are skipped by id, and the
+    candle still being formed is rebuilt from its latest source candles. Closed candles are final,
+    so sources falling in them are ignored.
+    """
+    def __init__(self, period, size=1000):
+        self.period = period
+        self.buffer = CandleBuffer(size)
+
+        self._last_trade = None
+        self._sources = {}
+
+    def __len__(self):
+        return len(self.buffer)
+
+    def add_candles(self, candles):
+        """Add candles of a period dividing this one."""
+        buckets = {}
+
+        for ohlc in candles:
+            buckets.setdefault(ohlc.time - ohlc.time % self.period, []).append(ohlc)
+
+        for bucket in sorted(buckets):
+            sources = sorted(buckets[bucket], key=lambda x: x.time)
+            last_time = self.buffer.last_time
+
+            if last_time is None or bucket > last_time:
+                self._sources = {x.time: x for x in sources}
+
+            elif bucket == last_time:
+                self._sources.update((x.time, x) for x in sources)
+                sources = [self._sources[x] for x in sorted(self._sources)]
+
+            elif bucket >= self.buffer.candles[0].time:
+                # Closed candle
+                continue
+
+            self.buffer.merge([combine(bucket, sources)])
+
+    def add_trades(self, trades):
+        """Add trades given as (id, time, amount, price), with ids increasing over time."""
+        for id_, time, amount, price in sorted(trades, key=lambda x: (x[1], x[0])):
+            if self._last_trade is not None and id_ <= self._last_trade:
+                continue
+
+            self._last_trade = id_
+
+            bucket = time - time % self.period
+            last = self.buffer.candles[-1] if self.buffer.candles else None
+
+            if last and last.time == bucket:
+                self.buffer.merge([OHLC(
+                    bucket, last.open_, max(last.high, price), min(last.low, price), price,
+                    last.volume + abs(amount), count=last.count + 1)])
+
+            elif not last or bucket > last.time:
+                self.buffer.merge([OHLC(bucket, price, price, price, price, abs(amount),
+                                        count=1)])
+
+    def ohlc(self, limit):
+        """Latest candles, from oldest to newest."""
+        return self.buffer.ohlc(limit)
+
+
+def combine(time, candles):
+    """Candle starting at time made of candles sorted from oldest to newest."""
+    return OHLC(time, candles[0].open_, max(x.high for x in candles),
+                min(x.low for x in candles), candles[-1].close, sum(x.volume for x in candles),
+                count=sum(x.count for x in candles))
+
+
+def resample(candles, period):
+    """Candles sorted by time combined into candles of period milliseconds."""
+    aggregator = CandleAggregator(period, size=len(candles))
+    aggregator.add_candles(candles)
+
+    return aggregator.ohlc(len(candles))
@@ -0,0 +1,102 @@
+import asyncio
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from venice.connection.aio import AsyncExchangeConnection
+
+from . import bitfinex
+
+
+class AsyncBitfinexAPI:
+    """Asyncio variant of BitfinexAPI.
+
+    Every method mirrors the BitfinexAPI method with the same name and runs it on a thread
+    executor, so independent calls of a cycle can be awaited together with asyncio.gather and take
+    about as long as the slowest of them. The executor is sized after the connection pool so each
+    concurrent call gets its own keep-alive connection.
+    """
+    def __init__(self, api=None, executor=None, **kwargs):
+        self.api = api if api else bitfinex.BitfinexAPI(**kwargs)
+        self.executor = executor if executor else ThreadPoolExecutor(self.api.pool.pool_size)
+
+        # Only the API and executor created here are closed on exit
+        self._owns_api = not api
+        self._owns_executor = not executor
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, type_, value, traceback):
+        if self._owns_api:
+            self.api.__exit__(type_, value, traceback)
+
+        if self._owns_executor:
+            self.executor.shutdown(wait=False)
+
+    def connection(self, version='v1'):
+        """Return an asynchronous connection for raw queries."""
+        return AsyncExchangeConnection(self.api._connection(version=version), self.executor)
+
+    @staticmethod
+    def currencies(pair):
+        return bitfinex.BitfinexAPI.currencies(pair)
+
+    # Public
+
+    async def ohlc(self, pair, period, limit=100):
+        return await self._run(self.api.ohlc, pair, period, limit=limit)
+
+    async def ohlc_history(self, pair, period, start, end, limit=1000):
+        return await self._run(self.api.ohlc_history, pair, period, start, end, limit=limit)
+
+    async def order_book(self, pair, length=100):
+        return await self._run(self.api.order_book, pair, length=length)
+
+    async def pairs(self):
+        return await self._run(lambda: self.api.pairs)
+
+    async def ticker(self, pair):
+        return await self._run(self.api.ticker, pair)
+
+    async def tickers(self, pairs):
+        return await self._run(self.api.tickers, pairs)
+
+    # Private
+
+    async def active_orders(self, pair=None):
+        return await self._run(self.api.active_orders, pair)
+
+    async def add_order(self, pair, direction, type_, volume=0, price=0, price2=0):
+        return await self._run(
+            self.api.add_order, pair, direction, type_, volume=volume, price=price, price2=price2)
+
+    async def add_orders(self, orders):
+        return await self._run(self.api.add_orders, orders)
+
+    async def balance(self, pair=None):
+        return await self._run(self.api.balance, pair)
+
+    async def cancel_all_orders(self):
+        return await self._run(self.api.cancel_all_orders)
+
+    async def cancel_order(self, id_):
+        return await self._run(self.api.cancel_order, id_)
+
+    async def cancel_orders(self, ids):
+        return await self._run(self.api.cancel_orders, ids)
+
+    async def fees(self):
+        return await self._run(self.api.fees)
+
+    async def order_history(self, pair=None, limit=100):
+        return await self._run(self.api.order_history, pair, limit=limit)
+
+    async def order_status(self, id_):
+        return await self._run(self.api.order_status, id_)
+
+    # Internal methods
+
+    async def _run(self, function, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(function, *args, **kwargs))
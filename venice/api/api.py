@@ -1,3 +1,16 @@
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from venice.connection.policy import RequestPolicy
+from venice.connection.pool import ConnectionPool
+from venice.connection.telemetry import Telemetry
+
+from .cache import TTLCache
+from .single_flight import SingleFlight
+
+
 class ExchangeAPIException(Exception):
     pass
 
@@ -33,15 +46,26 @@ class ExchangeAPI:
 
     PAIRS = [BTCUSD, ETHUSD, LTCUSD, IOTUSD, DSHUSD, BCHUSD]
 
-    # Candle period
+    # Candle period, in minutes or with a unit suffix (m, h, d or w)
+    P1 = '1'
     P5 = '5'
     P15 = '15'
     P30 = '30'
     P1H = '1h'
     P3H = '3h'
     P4H = '4h'
+    P6H = '6h'
+    P12H = '12h'
+    P1D = '1d'
 
-    PERIODS = [P5, P15, P30, P1H, P3H, P4H]
+    PERIODS = [P1, P5, P15, P30, P1H, P3H, P4H, P6H, P12H, P1D]
+
+    PERIOD_UNITS = {
+        'm': 60,
+        'h': 3600,
+        'd': 86400,
+        'w': 604800,
+    }
 
     # Order direction
     BUY = 'buy'
@@ -54,14 +78,58 @@ class ExchangeAPI:
     CONFIRMED = 'confirmed'
     CANCELED = 'canceled'
 
-    def __init__(self):
-        pass
+    # Seconds the results of slow-changing methods are cached
+    CACHE_TTLS = {
+        'balance': 10,
+        'fees': 3600,
+        'pairs': 86400,
+    }
+
+    def __init__(self, pool_size=10, rate_limiter=None, single_flight=None, policy=None,
+                 timeout=10, recorder=None, telemetry=None, cache=None):
+        # Keep-alive sessions shared by every connection created by this object
+        self.pool = ConnectionPool(pool_size)
+
+        # Client-side request limits, can be shared between API objects
+        self.rate_limiter = rate_limiter
+
+        # Identical public queries in flight at the same time share one request
+        self.single_flight = single_flight if single_flight else SingleFlight()
+
+        # Retries and hedging of idempotent requests, and the limits on how long they can take
+        self.policy = policy if policy else RequestPolicy()
+        self.timeout = timeout
+        self._deadline = None
+
+        # Records the requests, or replays them from a recording
+        self.recorder = recorder
+
+        # Request statistics per endpoint
+        self.telemetry = telemetry if telemetry else Telemetry()
+
+        # Results of slow-changing methods
+        self.cache = cache if cache else TTLCache(self.CACHE_TTLS)
 
     def __enter__(self):
         return self
 
     def __exit__(self, type_, value, traceback):
-        pass
+        self.pool.close()
+
+    @contextmanager
+    def deadline(self, seconds):
+        """Prevent the requests made inside the block from taking longer than seconds."""
+        previous = self._deadline
+        self._deadline = time.monotonic() + seconds
+
+        if previous:
+            self._deadline = min(previous, self._deadline)
+
+        try:
+            yield
+
+        finally:
+            self._deadline = previous
 
     def active_orders(self, pair=None):
         raise NotImplementedError
@@ -69,6 +137,14 @@ class ExchangeAPI:
     def add_order(self, pair, direction, type_, volume, price=0, price2=0):
         raise NotImplementedError
 
+    def add_orders(self, orders):
+        """Place several orders, each given as a dict of add_order arguments.
+
+        Returns one result per order, either the order statuses returned by add_order or the
+        exception raised while placing it. Orders are submitted concurrently.
+        """
+        return self._submit_all(lambda x: self.add_order(**x), orders)
+
     def balance(self, pair=None):
         raise NotImplementedError
 
@@ -79,7 +155,12 @@ class ExchangeAPI:
         raise NotImplementedError
 
     def cancel_orders(self, ids):
-        raise NotImplementedError
+        """Cancel several orders.
+
+        Returns one result per order, either None or the exception raised while cancelling it.
+        Orders are cancelled concurrently.
+        """
+        return self._submit_all(self.cancel_order, ids)
 
     @staticmethod
     def currencies(pair):
@@ -91,14 +172,52 @@ class ExchangeAPI:
     def ohlc(self, pair, interval, limit=100):
         raise NotImplementedError
 
+    def ohlc_history(self, pair, period, start, end, limit=1000):
+        raise NotImplementedError
+
+    def order_book(self, pair, length=100):
+        raise NotImplementedError
+
     def order_history(self, pair=None, limit=100):
         raise NotImplementedError
 
     def order_status(self, id_):
         raise NotImplementedError
 
+    @staticmethod
+    def period_seconds(period):
+        """Length of a candle period in seconds, raising ValueError unless it is positive."""
+        unit = ExchangeAPI.PERIOD_UNITS.get(period[-1:].lower())
+        seconds = int(period[:-1]) * unit if unit else int(period) * 60
+
+        if seconds <= 0:
+            raise ValueError('invalid period: {}'.format(period))
+
+        return seconds
+
     def pairs(self):
         raise NotImplementedError
 
     def ticker(self, pair):
         raise NotImplementedError
+
+    def tickers(self, pairs):
+        """Tickers of several pairs, as a dict keyed by pair."""
+        return {x: self.ticker(x) for x in pairs}
+
+    # Internal methods
+
+    def _submit_all(self, fn, items):
+        """Call fn concurrently for every item, returning the results or exceptions in order."""
+        def submit(item):
+            try:
+                return fn(item)
+
+            except Exception as e:
+                return e
+
+        if not items:
+            return []
+
+        with ThreadPoolExecutor(min(len(items), self.pool.pool_size)) as executor:
+            return list(executor.map(submit, items))
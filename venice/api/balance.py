@@ -1,11 +1,11 @@
-from decimal import Decimal
+from venice.util import to_decimal
 
 
 class Balance:
     def __init__(self, currency, amount, available=None, type_='exchange'):
         self.currency = currency
-        self.amount = Decimal(amount)
-        self.available = Decimal(available) if available else None
+        self.amount = to_decimal(amount)
+        self.available = to_decimal(available) if available else None
         self.type_ = type_
 
     def __repr__(self):
@@ -1,14 +1,23 @@
+import threading
+import time
+
 from decimal import Decimal
 
 from venice import util
 from venice.connection.bitfinex import BitfinexConnection
+from venice.connection.rate_limit import RateLimiter
 
-from .api import ExchangeAPI
+from .api import ExchangeAPI, ExchangeAPIException
 from .ohlc import OHLC
 from .order_status import OrderStatus
 from .ticker import Ticker
 from .balance import Balance
+from .aggregator import CandleAggregator, resample
+from .candle_buffer import CandleBuffer
+from .order_book import OrderBook
 from .pair import Pair
+from .cache import cached
+from .single_flight import coalesced
 
 
 class BitfinexAPI(ExchangeAPI):
@@ -65,20 +74,29 @@ class BitfinexAPI(ExchangeAPI):
         'bchusd': ExchangeAPI.BCHUSD,
     }
 
+    # Periods served by the exchange, the others are aggregated from them
     PERIOD_KEYS = {
+        ExchangeAPI.P1: '1m',
         ExchangeAPI.P5: '5m',
         ExchangeAPI.P15: '15m',
         ExchangeAPI.P30: '30m',
         ExchangeAPI.P1H: '1h',
         ExchangeAPI.P3H: '3h',
+        ExchangeAPI.P6H: '6h',
+        ExchangeAPI.P12H: '12h',
+        ExchangeAPI.P1D: '1D',
     }
 
     PERIOD_KEYS_REVERSE = {
+        '1m': ExchangeAPI.P1,
         '5m': ExchangeAPI.P5,
         '15m': ExchangeAPI.P15,
         '30m': ExchangeAPI.P30,
         '1h': ExchangeAPI.P1H,
         '3h': ExchangeAPI.P3H,
+        '6h': ExchangeAPI.P6H,
+        '12h': ExchangeAPI.P12H,
+        '1D': ExchangeAPI.P1D,
     }
 
     DIRECTION_KEYS = {
@@ -101,31 +119,116 @@ class BitfinexAPI(ExchangeAPI):
         ExchangeAPI.BCHUSD: ('bch', 'usd'),
     }
 
-    def __init__(self):
-        super().__init__()
+    # Maximum number of orders sent in one order/new/multi request
+    MULTI_ORDERS = 10
+
+    def __init__(self, uri='https://api.bitfinex.com/', rate_limiter=None, **kwargs):
+        super().__init__(
+            rate_limiter=rate_limiter if rate_limiter else RateLimiter(
+                BitfinexConnection.RATE_LIMITS),
+            **kwargs)
+
+        self.uri = uri
 
-        self._pairs = []
+        self._candle_buffers = {}
+        self._candle_aggregators = {}
+        self._candle_lock = threading.Lock()
 
     # Public
 
+    @coalesced
     def ohlc(self, pair, period, limit=100):
+        """Latest candles, from oldest to newest.
+
+        Candles are kept in a buffer per pair and period, so after the first call only the
+        candles since the last buffered one (which may still have been forming) are requested.
+        Periods the exchange does not serve are aggregated from a shorter one.
+        """
+        if period not in self.PERIOD_KEYS:
+            return self._aggregated_ohlc(pair, period, limit)
+
+        with self._candle_lock:
+            if (pair, period) not in self._candle_buffers:
+                self._candle_buffers[(pair, period)] = CandleBuffer(limit)
+
+            buffer = self._candle_buffers[(pair, period)]
+
+        time_frame = self.PERIOD_KEYS[period]
+        symbol = self._convert_pair(self.PAIR_KEYS[pair])
+
+        with buffer.lock:
+            buffer.size = max(buffer.size, limit)
+
+            if len(buffer) >= limit:
+                result = self._candles(
+                    time_frame, symbol, 'hist', limit=limit, start=buffer.last_time, sort=1)
+
+                # Too many new candles to be sure the latest ones were received
+                if len(result) < limit:
+                    buffer.merge(self._format_ohlc(x) for x in result)
+                    return buffer.ohlc(limit)
+
+            # The whole buffer is reloaded, as the latest limit candles may not reach it
+            result = self._candles(time_frame, symbol, 'hist', limit=buffer.size)
+            buffer.clear()
+            buffer.merge(self._format_ohlc(x) for x in result[::-1])
+
+            return buffer.ohlc(limit)
+
+    def ohlc_history(self, pair, period, start, end, limit=1000):
+        """Candles with start <= time < end (in milliseconds), from oldest to newest.
+
+        At most limit candles are returned, starting from the oldest ones.
+        """
+        if period not in self.PERIOD_KEYS:
+            base, length = self._base_period(period)
+            ratio = length // (self.period_seconds(base) * 1000)
+
+            candles = self.ohlc_history(pair, base, start - start % length, end, limit * ratio)
+            result = [x for x in resample(candles, length) if x.time >= start]
+
+            # The last candle may be missing part of its source candles
+            if len(candles) == limit * ratio:
+                result = result[:-1]
+
+            return result[:limit]
+
         result = self._candles(
             self.PERIOD_KEYS[period], self._convert_pair(self.PAIR_KEYS[pair]), 'hist',
-            limit=limit)
-        ohlc = [self._format_ohlc(x) for x in result]
-        return ohlc[::-1]
+            limit=limit, start=start, end=end - 1, sort=1)
+        return [self._format_ohlc(x) for x in result]
+
+    def order_book(self, pair, length=100):
+        """Snapshot of the book of the pair with up to length levels on each side."""
+        return OrderBook(self._book(self._convert_pair(self.PAIR_KEYS[pair]), length=length))
 
     @property
+    @cached
     def pairs(self):
-        if not self._pairs:
-            self._pairs = {x['pair']: self._format_pair(x) for x in self._symbols()}
-
-        return self._pairs
+        return {x['pair']: self._format_pair(x) for x in self._symbols()}
 
+    @coalesced
     def ticker(self, pair):
         result = self._ticker(pair)
         return self._format_ticker(result)
 
+    def trades(self, pair, start=None, end=None, limit=1000):
+        """Trades as (id, time, amount, price) from oldest to newest, negative amounts being
+        sells.
+
+        At most limit trades are returned, starting from the oldest ones after start or the
+        latest ones otherwise.
+        """
+        result = self._trades(self._convert_pair(self.PAIR_KEYS[pair]), limit=limit,
+                              start=start or '', end=end or '', sort=1 if start else 0)
+        return [tuple(x) for x in (result if start else result[::-1])]
+
+    def tickers(self, pairs):
+        """Tickers of several pairs with a single request."""
+        result = self._tickers([self._convert_pair(self.PAIR_KEYS[x]) for x in pairs])
+        return {self.PAIR_KEYS_REVERSE[x[0][1:].lower()]: self._format_ticker_v2(x) for x in
+                result}
+
     # Private
 
     def active_orders(self, pair=None):
@@ -133,26 +236,41 @@ class BitfinexAPI(ExchangeAPI):
         return [self._format_order(x) for x in result if not pair or x['symbol'] == pair]
 
     def add_order(self, pair, direction, type_, volume=0, price=0, price2=0):
-        oco = type_ == self.STOP_AND_LIMIT
-        post_only = type_ == ExchangeAPI.LIMIT
-
-        if type_ == ExchangeAPI.MARKET:
-            price = 1
-
-        decimal_places = util.decimal_places(self.pairs[pair].precision)
-
-        result = self._order(
-            self.PAIR_KEYS[pair], self.DIRECTION_KEYS[direction], self.TYPE_KEYS[type_],
-            volume=volume.quantize(decimal_places), price=price, post_only=post_only, oco=oco,
-            oco_price=price2)
+        result = self._order(**self._order_args(pair, direction, type_, volume, price, price2))
 
         orders = [self._format_order(result)]
 
-        if oco:
+        if type_ == self.STOP_AND_LIMIT:
             orders += [self._format_oco_order(result)]
 
+        self.cache.invalidate('balance')
+
         return orders
 
+    def add_orders(self, orders):
+        """Place several orders with one order/new/multi request per MULTI_ORDERS orders.
+
+        OCO orders are not supported by order/new/multi, so they are placed with one request each.
+        Every request is submitted concurrently.
+        """
+        indices = [i for i, x in enumerate(orders) if x['type_'] != self.STOP_AND_LIMIT]
+        batches = [indices[i:i + self.MULTI_ORDERS] for i in range(
+            0, len(indices), self.MULTI_ORDERS)]
+        batches += [[i] for i, x in enumerate(orders) if x['type_'] == self.STOP_AND_LIMIT]
+
+        results = len(orders) * [None]
+
+        for batch, result in zip(batches, self._submit_all(
+                lambda x: self._add_order_batch([orders[i] for i in x]), batches)):
+            for i, order_result in zip(batch, result if isinstance(result, list) else
+                                       len(batch) * [result]):
+                results[i] = order_result
+
+        self.cache.invalidate('balance')
+
+        return results
+
+    @cached
     def balance(self, pair=None):
         result = self._wallet_balance()
         balance = {x['currency']: self._format_balance(x) for x in result if x['currency'] in
@@ -172,13 +290,25 @@ class BitfinexAPI(ExchangeAPI):
 
     def cancel_order(self, id_):
         self._cancel_orders([id_])
+        self.cache.invalidate('balance')
 
     def cancel_orders(self, ids):
-        self._cancel_orders(ids)
+        """Cancel several orders with a single order/cancel/multi request."""
+        try:
+            self._cancel_orders(ids)
+            results = len(ids) * [None]
 
+        except Exception as e:
+            results = len(ids) * [e]
+
+        self.cache.invalidate('balance')
+
+        return results
+
+    @cached
     def fees(self):
         fees = self._fees()
-        return Decimal.from_float(fees['maker_fee']), Decimal.from_float(fees['taker_fee'])
+        return util.to_decimal(fees['maker_fee']), util.to_decimal(fees['taker_fee'])
 
     def order_history(self, pair=None, limit=100):
         result = self._order_history(limit)
@@ -205,7 +335,7 @@ class BitfinexAPI(ExchangeAPI):
         expiration  [string]    Expiration date for limited contracts/pairs
         """
 
-        with BitfinexConnection() as c:
+        with self._connection() as c:
             return c.query_public('symbols_details')
 
     def _ticker(self, pair):
@@ -224,14 +354,14 @@ class BitfinexAPI(ExchangeAPI):
         timestamp  [time]  The timestamp at which this information was valid
         """
 
-        with BitfinexConnection() as c:
+        with self._connection() as c:
             return c.query_public('pubticker/' + pair)
 
     # v1 endpoints - private
 
     def _active_orders(self):
         """View active orders."""
-        with BitfinexConnection() as c:
+        with self._connection() as c:
             return c.query_private('orders')
 
     def _cancel_orders(self, order_ids):
@@ -243,13 +373,13 @@ class BitfinexAPI(ExchangeAPI):
         order_ids : int[]
         """
 
-        with BitfinexConnection() as c:
+        with self._connection() as c:
             return c.query_private('order/cancel/multi', params={
                 'order_ids': order_ids,
             })
 
     def _fees(self):
-        with BitfinexConnection() as c:
+        with self._connection() as c:
             return c.query_private('summary')
 
     def _order(self, pair, side, type_, volume=0, price=0, post_only=True, oco=False,
@@ -300,21 +430,30 @@ class BitfinexAPI(ExchangeAPI):
             /order/status.
         """
 
-        params = {
-            'symbol': pair,
-            'amount': str(volume),
-            'side': side,
-            'type': type_,
-            'price': str(price),
-            'use_all_available': 0 if volume else 1,
-            'is_postonly': post_only,
-            'ocoorder': oco,
-            'buy_price_oco': str(oco_price) if oco and side == 'buy' else '0',
-            'sell_price_oco': str(oco_price) if oco and side == 'sell' else '0',
-        }
+        with self._connection() as c:
+            return c.query_private('order/new', params=self._order_params(
+                pair, side, type_, volume, price, post_only, oco, oco_price))
+
+    def _orders(self, orders):
+        """Submit several orders at once.
+
+        Params
+        ======
+
+        orders : array
+            Orders with the same params as order/new, plus exchange.
 
-        with BitfinexConnection() as c:
-            return c.query_private('order/new', params=params)
+        Fields
+        ======
+
+        order_ids : array
+            The order objects, in the same order as the submitted ones.
+        """
+
+        orders = [dict(self._order_params(**x), exchange='bitfinex') for x in orders]
+
+        with self._connection() as c:
+            return c.query_private('order/new/multi', params={'orders': orders})
 
     def _order_history(self, limit=100):
         """View latest inactive orders.
@@ -328,7 +467,7 @@ class BitfinexAPI(ExchangeAPI):
             Limit number of results
         """
 
-        with BitfinexConnection() as c:
+        with self._connection() as c:
             return c.query_private('orders/hist', params={'limit_orders': limit})
 
     def _order_status(self, id_):
@@ -362,7 +501,7 @@ class BitfinexAPI(ExchangeAPI):
         original_amount     [decimal]   What was the order originally submitted for?
         """
 
-        with BitfinexConnection() as c:
+        with self._connection() as c:
             return c.query_private('order/status', params={
                 'order_id': id_,
             })
@@ -370,7 +509,7 @@ class BitfinexAPI(ExchangeAPI):
     def _wallet_balance(self):
         """Return wallet balances."""
 
-        with BitfinexConnection() as c:
+        with self._connection() as c:
             return c.query_private('balances')
 
     # v2 endpoints - public
@@ -421,17 +560,201 @@ class BitfinexAPI(ExchangeAPI):
             'limit': limit,
         }
 
-        with BitfinexConnection(version='v2') as c:
+        if start:
+            params['start'] = start
+
+        if end:
+            params['end'] = end
+
+        if sort:
+            params['sort'] = sort
+
+        with self._connection(version='v2') as c:
             return c.query_public(
                 'candles/trade:' + ':'.join([time_frame, pair]) + '/' + section, get_params=params)
-        return 't' + pair.upper()
+
+    def _book(self, symbol, precision='P0', length=100):
+        """Return the state of the book.
+
+        Path params
+        ===========
+
+        symbol: string
+            The symbol you want information about.
+
+        precision: string
+            Level of price aggregation (P0, P1, P2, P3, R0).
+
+        Query params
+        ============
+
+        len: int
+            Number of price points (1, 25, 100).
+
+        Fields
+        =====
+
+        PRICE   [float] Price level
+        COUNT   [int]   Number of orders at that price level
+        AMOUNT  [float] Total amount available at that price level, negative for asks
+        """
+
+        with self._connection(version='v2') as c:
+            return c.query_public('book/{}/{}'.format(symbol, precision),
+                                  get_params={'len': length})
+
+    def _trades(self, symbol, limit=1000, start='', end='', sort=0):
+        """Return past trades.
+
+        Query params
+        ============
+
+        limit: int
+            Number of trades requested (max 10000).
+
+        start: string
+            Filter start (ms).
+
+        end: string
+            Filter end (ms).
+
+        sort: int
+            Sorts results returned with old > new if 1
+
+        Fields
+        =====
+
+        ID      [int]   Trade ID
+        MTS     [int]   Millisecond time stamp
+        AMOUNT  [float] How much was bought (positive) or sold (negative)
+        PRICE   [float] Price at which the trade was executed
+        """
+
+        params = {
+            'limit': limit,
+            'sort': sort,
+        }
+
+        if start:
+            params['start'] = start
+
+        if end:
+            params['end'] = end
+
+        with self._connection(version='v2') as c:
+            return c.query_public('trades/{}/hist'.format(symbol), get_params=params)
+
+    def _tickers(self, symbols):
+        """Return the tickers of several symbols.
+
+        Query params
+        ============
+
+        symbols: string
+            Comma separated symbols.
+
+        Fields
+        =====
+
+        SYMBOL              [string]    The symbol
+        BID                 [float]     Price of last highest bid
+        BID_SIZE            [float]     Size of the last highest bid
+        ASK                 [float]     Price of last lowest ask
+        ASK_SIZE            [float]     Size of the last lowest ask
+        DAILY_CHANGE        [float]     Amount that the last price has changed since yesterday
+        DAILY_CHANGE_PERC   [float]     Amount that the price has changed expressed in percentage
+        LAST_PRICE          [float]     Price of the last trade
+        VOLUME              [float]     Daily volume
+        HIGH                [float]     Daily high
+        LOW                 [float]     Daily low
+        """
+
+        with self._connection(version='v2') as c:
+            return c.query_public('tickers', get_params={'symbols': ','.join(symbols)})
 
     # Internal methods
 
+    def _aggregated_ohlc(self, pair, period, limit):
+        """Latest candles of a period aggregated from the candles of a shorter one."""
+        base, length = self._base_period(period)
+        ratio = length // (self.period_seconds(base) * 1000)
+
+        # One more candle so that the first one, likely incomplete, can be left out
+        candles = self.ohlc(pair, base, limit=(limit + 1) * ratio)
+
+        with self._candle_lock:
+            aggregator = self._candle_aggregators.get((pair, period))
+
+            if not aggregator or aggregator.buffer.size < limit + 1:
+                aggregator = CandleAggregator(length, size=limit + 1)
+                self._candle_aggregators[(pair, period)] = aggregator
+
+            aggregator.add_candles(candles)
+
+            return aggregator.ohlc(limit)
+
+    def _base_period(self, period):
+        """Longest period served by the exchange dividing period, and the length of period in
+        milliseconds."""
+        seconds = self.period_seconds(period)
+        periods = [x for x in self.PERIOD_KEYS if not seconds % self.period_seconds(x)]
+
+        if not periods:
+            raise ExchangeAPIException('period {} not supported'.format(period))
+
+        return max(periods, key=self.period_seconds), seconds * 1000
+
+    def _add_order_batch(self, orders):
+        if len(orders) == 1:
+            return [self.add_order(**orders[0])]
+
+        result = self._orders([self._order_args(**x) for x in orders])
+        return [[self._format_order(x)] for x in result['order_ids']]
+
+    def _order_args(self, pair, direction, type_, volume=0, price=0, price2=0):
+        """Arguments of _order for an order given as add_order arguments."""
+        if type_ == ExchangeAPI.MARKET:
+            price = 1
+
+        decimal_places = util.decimal_places(self.pairs[pair].precision)
+
+        return {
+            'pair': self.PAIR_KEYS[pair],
+            'side': self.DIRECTION_KEYS[direction],
+            'type_': self.TYPE_KEYS[type_],
+            'volume': volume.quantize(decimal_places),
+            'price': price,
+            'post_only': type_ == ExchangeAPI.LIMIT,
+            'oco': type_ == self.STOP_AND_LIMIT,
+            'oco_price': price2,
+        }
+
+    def _connection(self, version='v1'):
+        return BitfinexConnection(
+            uri=self.uri, version=version, pool=self.pool, rate_limiter=self.rate_limiter,
+            policy=self.policy, deadline=self._deadline, timeout=self.timeout,
+            recorder=self.recorder, telemetry=self.telemetry)
+
     @staticmethod
     def _convert_pair(pair):
         return 't' + pair.upper()
 
+    @staticmethod
+    def _order_params(pair, side, type_, volume=0, price=0, post_only=True, oco=False,
+                      oco_price=0):
+        return {
+            'symbol': pair,
+            'amount': str(volume),
+            'side': side,
+            'type': type_,
+            'price': str(price),
+            'use_all_available': 0 if volume else 1,
+            'is_postonly': post_only,
+            'ocoorder': oco,
+            'buy_price_oco': str(oco_price) if oco and side == 'buy' else '0',
+            'sell_price_oco': str(oco_price) if oco and side == 'sell' else '0',
+        }
+
     @staticmethod
     def _format_order(result):
         status = (
@@ -464,30 +787,35 @@ class BitfinexAPI(ExchangeAPI):
     def _format_balance(result):
         return Balance(
             BitfinexAPI.CURRENCY_KEYS_REVERSE[result['currency']],
-            Decimal(result['amount']),
-            Decimal(result['available']),
+            result['amount'],
+            result['available'],
             result['type'])
 
     @staticmethod
     def _format_ticker(result):
         return Ticker(
             result['timestamp'],
-            Decimal(result['ask']),
-            Decimal(result['bid']),
-            Decimal(result['last_price']),
-            low=Decimal(result['low']),
-            high=Decimal(result['high']),
-            volume=Decimal(result['volume']))
+            result['ask'],
+            result['bid'],
+            result['last_price'],
+            low=result['low'],
+            high=result['high'],
+            volume=result['volume'])
+
+    @staticmethod
+    def _format_ticker_v2(result):
+        return Ticker(time.time(), result[3], result[1], result[7], low=result[10],
+                      high=result[9], volume=result[8])
 
     @staticmethod
     def _format_ohlc(result):
         return OHLC(
             result[0],
-            Decimal.from_float(result[1]),
-            Decimal.from_float(result[3]),
-            Decimal.from_float(result[4]),
-            Decimal.from_float(result[2]),
-            Decimal.from_float(result[5]),
+            result[1],
+            result[3],
+            result[4],
+            result[2],
+            result[5],
         )
 
     @staticmethod
@@ -495,6 +823,6 @@ class BitfinexAPI(ExchangeAPI):
         return Pair(
             result['pair'],
             result['price_precision'],
-            Decimal(result['minimum_order_size']),
-            Decimal(result['maximum_order_size']),
+            result['minimum_order_size'],
+            result['maximum_order_size'],
         )
@@ -0,0 +1,167 @@
+import json
+import os
+import threading
+import time
+
+from decimal import Decimal
+from functools import wraps
+
+from .balance import Balance
+from .pair import Pair
+
+
+class TTLCache:
+    """Cache of ExchangeAPI method results, each method with its own time to live.
+
+    Entries are keyed by method name and arguments. Methods without a TTL are not cached. When a
+    path is given, entries are loaded from it on creation and saved to it as JSON on close, and at
+    most every interval seconds while they change, so they survive restarts.
+    """
+    # Classes of the cached values saved with their attributes
+    OBJECTS = {x.__name__: x for x in [Balance, Pair]}
+
+    def __init__(self, ttls=None, path=None, interval=60):
+        self.ttls = dict(ttls) if ttls else {}
+        self.path = path
+        self.interval = interval
+
+        self.hits = {}
+        self.misses = {}
+
+        self._entries = {}
+        self._changed = False
+        self._save_time = time.monotonic()
+        self._lock = threading.Lock()
+
+        if path and os.path.exists(path):
+            self._load()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type_, value, traceback):
+        self.close()
+
+    def close(self):
+        """Save the entries if they changed since they were last saved."""
+        with self._lock:
+            if self._changed:
+                self._save()
+
+    def get(self, name, key):
+        """Return (True, value) for a live entry, (False, None) otherwise."""
+        with self._lock:
+            entry = self._entries.get((name, key))
+
+            if entry and entry[0] > time.time():
+                self.hits[name] = self.hits.get(name, 0) + 1
+                return True, entry[1]
+
+            self.misses[name] = self.misses.get(name, 0) + 1
+            return False, None
+
+    def set(self, name, key, value):
+        with self._lock:
+            self._entries[(name, key)] = (time.time() + self.ttls[name], value)
+            self._change()
+
+    def invalidate(self, name=None):
+        """Remove the entries of a method, or every entry."""
+        with self._lock:
+            self._entries = {x: y for x, y in self._entries.items() if name and x[0] != name}
+            self._change()
+
+    def stats(self):
+        """Hits and misses per method."""
+        with self._lock:
+            return {x: (self.hits.get(x, 0), self.misses.get(x, 0)) for x in set(
+                self.hits) | set(self.misses)}
+
+    def _change(self):
+        self._changed = True
+
+        if time.monotonic() - self._save_time >= self.interval:
+            self._save()
+
+    def _load(self):
+        with open(self.path) as f:
+            entries = json.load(f)
+
+        self._entries = {
+            (x[0], _decode(x[1])): (x[2], _decode(x[3])) for x in entries}
+
+    def _save(self):
+        self._changed = False
+        self._save_time = time.monotonic()
+
+        if not self.path:
+            return
+
+        with open(self.path + '.tmp', 'w') as f:
+            json.dump([[x[0], _encode(x[1]), y[0], _encode(y[1])] for x, y in
+                       self._entries.items()], f)
+
+        os.replace(self.path + '.tmp', self.path)
+
+
+def cached(method):
+    """Decorator caching the results of an ExchangeAPI method for the TTL of its name."""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        name = method.__name__
+
+        if name not in self.cache.ttls:
+            return method(self, *args, **kwargs)
+
+        key = (args, tuple(sorted(kwargs.items())))
+        found, value = self.cache.get(name, key)
+
+        if not found:
+            value = method(self, *args, **kwargs)
+            self.cache.set(name, key, value)
+
+        return value
+
+    return wrapper
+
+
+def _encode(value):
+    """JSON value for a cached value, keeping Decimals, tuples, dict keys and objects."""
+    if isinstance(value, Decimal):
+        return {'type': 'decimal', 'value': str(value)}
+
+    if isinstance(value, tuple):
+        return {'type': 'tuple', 'value': [_encode(x) for x in value]}
+
+    if isinstance(value, list):
+        return [_encode(x) for x in value]
+
+    if isinstance(value, dict):
+        return {'type': 'dict', 'value': [[_encode(x), _encode(y)] for x, y in value.items()]}
+
+    if type(value).__name__ in TTLCache.OBJECTS:
+        return {'type': type(value).__name__, 'value': _encode(vars(value))}
+
+    return value
+
+
+def _decode(value):
+    if isinstance(value, list):
+        return [_decode(x) for x in value]
+
+    if not isinstance(value, dict):
+        return value
+
+    if value['type'] == 'decimal':
+        return Decimal(value['value'])
+
+    if value['type'] == 'tuple':
+        return tuple(_decode(x) for x in value['value'])
+
+    if value['type'] == 'dict':
+        return {_decode(x): _decode(y) for x, y in value['value']}
+
+    result = object.__new__(TTLCache.OBJECTS[value['type']])
+    vars(result).update(_decode(value['value']))
+
+    return result
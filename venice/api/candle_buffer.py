@@ -0,0 +1,49 @@
+import bisect
+import threading
+
+
+class CandleBuffer:
+    """Candles of a pair and period sorted by time, keeping at most ``size`` of them.
+
+    Candles merged with the same time as a buffered one replace it, which is how the candle
+    still being formed gets updated.
+    """
+    def __init__(self, size=100):
+        self.size = size
+        self.candles = []
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.candles)
+
+    @property
+    def last_time(self):
+        return self.candles[-1].time if self.candles else None
+
+    def clear(self):
+        self.candles = []
+
+    def merge(self, candles):
+        for ohlc in candles:
+            merge_candle(self.candles, ohlc)
+
+        del self.candles[:-self.size]
+
+    def ohlc(self, limit):
+        """Latest candles, from oldest to newest."""
+        return self.candles[-limit:]
+
+
+def merge_candle(candles, ohlc):
+    """Insert a candle in a list sorted by time, replacing the one with the same time."""
+    if not candles or candles[-1].time < ohlc.time:
+        candles.append(ohlc)
+        return
+
+    index = bisect.bisect_left([x.time for x in candles], ohlc.time)
+
+    if candles[index].time == ohlc.time:
+        candles[index] = ohlc
+
+    else:
+        candles.insert(index, ohlc)
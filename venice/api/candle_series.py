@@ -0,0 +1,229 @@
+from array import array
+from collections.abc import Sequence
+from decimal import Decimal
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from venice.fixed import FixedSeries, div_round
+
+from .ohlc import OHLC
+
+
+class Column(Sequence):
+    """Read-only view of a CandleSeries column.
+
+    Values are kept as integers scaled by ``10 ** scale`` and read as Decimal, which is exact
+    for values with at most scale places. Slicing returns another view of the same array, so
+    neither indexing nor slicing copies, and ``list()`` decodes the values in one pass.
+    """
+    def __init__(self, values, start, stop, scale):
+        self._values = values
+        self._start = start
+        self._stop = stop
+        self._scale = scale
+
+    def __len__(self):
+        return self._stop - self._start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+
+            if step != 1:
+                return [self[x] for x in range(start, stop, step)]
+
+            column = Column.__new__(Column)
+            column.__dict__.update(self.__dict__)
+            column._start = self._start + start
+            column._stop = self._start + max(start, stop)
+
+            return column
+
+        if index < 0:
+            index += len(self)
+
+        if not 0 <= index < len(self):
+            raise IndexError('column index out of range')
+
+        value = self._values[self._start + index]
+        return Decimal(value).scaleb(-self._scale) if self._scale else value
+
+    def __iter__(self):
+        return iter(self.list())
+
+    def __eq__(self, other):
+        return isinstance(other, Sequence) and list(self) == list(other)
+
+    def __repr__(self):
+        return 'Column({})'.format(list(self))
+
+    def array(self):
+        """Copy of the column as a float64 NumPy array."""
+        if numpy is None:
+            raise ImportError('numpy is required for float arrays')
+
+        values = numpy.array(self._values[self._start:self._stop], dtype=numpy.float64)
+        return values / 10 ** self._scale if self._scale else values
+
+    def list(self):
+        """Copy of the column as a list of Decimal values, or of integers for times."""
+        values = self._values[self._start:self._stop]
+
+        if not self._scale:
+            return values.tolist()
+
+        scale = -self._scale
+        return [Decimal(x).scaleb(scale) for x in values]
+
+    def fixed(self, places):
+        """Copy of the column as a FixedSeries with at most as many places as the column."""
+        values = self._values[self._start:self._stop]
+
+        if places == self._scale:
+            return FixedSeries(values, places)
+
+        factor = 10 ** (self._scale - places)
+        return FixedSeries([div_round(x, factor) for x in values], places)
+
+
+class CandleSeries(Sequence):
+    """Candles sorted by time stored column by column in arrays of scaled integers.
+
+    New candles are appended or replace the last one when they share its time. Slicing returns a
+    view sharing the columns, and the column accessors (``close()``, ``high()``...) return Column
+    views, so reading a series never copies it. Views see the last candle being replaced but not
+    the candles appended after they were taken.
+
+    When ``size`` is given, the oldest candles are dropped once the series grows to twice that
+    size, by copying the latest ``size`` candles to new arrays. Existing views keep the old ones.
+    The version counter increases on every change. Replacing the last candle with an identical one
+    is not a change.
+    """
+    FIELDS = ('time', 'open_', 'high', 'low', 'close', 'volume')
+
+    def __init__(self, candles=(), scale=8, size=None):
+        self.scale = scale
+        self.size = size
+        self.version = 0
+
+        self._factor = Decimal(10) ** scale
+        self._columns = {x: array('q') for x in self.FIELDS}
+        self._start = 0
+        self._stop = None
+
+        self.extend(candles)
+
+    @classmethod
+    def from_columns(cls, columns, scale=8, size=None):
+        """Series over arrays of integers scaled by ``10 ** scale``, keyed by the fields and
+        sorted by time, which are used without being copied."""
+        series = cls(scale=scale, size=size)
+        series._columns = {x: columns[x] for x in cls.FIELDS}
+
+        return series
+
+    def __len__(self):
+        return (self._stop if self._stop is not None else len(self._columns['time'])) - \
+            self._start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+
+            if step != 1:
+                return [self[x] for x in range(start, stop, step)]
+
+            view = CandleSeries.__new__(CandleSeries)
+            view.__dict__.update(self.__dict__)
+            view._start = self._start + start
+            view._stop = self._start + max(start, stop)
+
+            return view
+
+        if index < 0:
+            index += len(self)
+
+        if not 0 <= index < len(self):
+            raise IndexError('series index out of range')
+
+        i = self._start + index
+
+        return OHLC(self._columns['time'][i], *[
+            Decimal(self._columns[x][i]).scaleb(-self.scale) for x in self.FIELDS[1:]])
+
+    @property
+    def first_time(self):
+        return self._columns['time'][self._start] if len(self) else None
+
+    @property
+    def key(self):
+        """Identity of the candles of a series from a given source: its first time, length, last
+        time and the values of its last candle, the only one that can still change."""
+        if not len(self):
+            return None, 0, None, ()
+
+        i = self._start + len(self) - 1
+
+        return (self.first_time, len(self), self.last_time,
+                tuple(self._columns[x][i] for x in self.FIELDS[1:]))
+
+    @property
+    def last_time(self):
+        return self._columns['time'][self._start + len(self) - 1] if len(self) else None
+
+    def append(self, ohlc):
+        """Append a candle, or replace the last one if it has the same time."""
+        if self._stop is not None:
+            raise ValueError('series views are read-only')
+
+        values = [ohlc.time] + [int((getattr(ohlc, x) * self._factor).to_integral_value()) for x
+                                in self.FIELDS[1:]]
+
+        if len(self) and ohlc.time == self.last_time:
+            if all(self._columns[x][-1] == y for x, y in zip(self.FIELDS, values)):
+                return
+
+            for field, value in zip(self.FIELDS, values):
+                self._columns[field][-1] = value
+
+        elif len(self) and ohlc.time < self.last_time:
+            raise ValueError('candle at {} is older than the last one'.format(ohlc.time))
+
+        else:
+            for field, value in zip(self.FIELDS, values):
+                self._columns[field].append(value)
+
+            if self.size and len(self) >= 2 * self.size:
+                self._columns = {x: self._columns[x][-self.size:] for x in self.FIELDS}
+                self._start = 0
+
+        self.version += 1
+
+    def extend(self, candles):
+        for ohlc in candles:
+            self.append(ohlc)
+
+    def time(self):
+        return self._column('time', 0)
+
+    def open(self):
+        return self._column('open_')
+
+    def high(self):
+        return self._column('high')
+
+    def low(self):
+        return self._column('low')
+
+    def close(self):
+        return self._column('close')
+
+    def volume(self):
+        return self._column('volume')
+
+    def _column(self, field, scale=None):
+        return Column(self._columns[field], self._start, self._start + len(self),
+                      self.scale if scale is None else scale)
@@ -1,15 +1,15 @@
-from decimal import Decimal
+from venice.util import to_decimal
 
 
 class OHLC:
     def __init__(self, time, open_, high, low, close, volume, vwap=0, count=0):
         self.time = int(time)
-        self.open_ = Decimal(open_)
-        self.high = Decimal(high)
-        self.low = Decimal(low)
-        self.close = Decimal(close)
-        self.vwap = Decimal(vwap)
-        self.volume = Decimal(volume)
+        self.open_ = to_decimal(open_)
+        self.high = to_decimal(high)
+        self.low = to_decimal(low)
+        self.close = to_decimal(close)
+        self.vwap = to_decimal(vwap)
+        self.volume = to_decimal(volume)
         self.count = int(count)
 
     def __str__(self):
@@ -0,0 +1,142 @@
+import bisect
+import threading
+
+from .api import ExchangeAPI
+
+
+class OrderBookException(Exception):
+    pass
+
+
+class OrderBookSide:
+    """Price levels of one side of a book, kept sorted so the best price is the last one.
+
+    Prices are stored negated for bids, which keeps both sides ascending with the best level at
+    the end: the best price is read in O(1), a level is found in O(log n) and the best level, the
+    one most often changed, is removed without moving the others. Adding or removing any other
+    level shifts the keys after it, which is O(n); books from the exchange are at most a few
+    hundred levels deep, where moving a list is cheaper than a tree.
+    """
+    def __init__(self, sign):
+        self.sign = sign
+        self.keys = []
+        self.amounts = {}
+
+    def __len__(self):
+        return len(self.keys)
+
+    def set(self, price, amount):
+        key = -self.sign * price
+
+        if key not in self.amounts:
+            bisect.insort(self.keys, key)
+
+        self.amounts[key] = amount
+
+    def remove(self, price):
+        key = -self.sign * price
+
+        if self.amounts.pop(key, None) is None:
+            return
+
+        if self.keys[-1] == key:
+            self.keys.pop()
+
+        else:
+            del self.keys[bisect.bisect_left(self.keys, key)]
+
+    def best(self):
+        if not self.keys:
+            return None
+
+        key = self.keys[-1]
+        return -self.sign * key, self.amounts[key]
+
+    def levels(self, limit=None):
+        """(price, amount) of the levels, from the best to the worst."""
+        keys = self.keys[:-limit - 1:-1] if limit else self.keys[::-1]
+        return [(-self.sign * x, self.amounts[x]) for x in keys]
+
+    def fill(self, volume):
+        """Average price paid to take volume from this side, walking the levels from the best.
+
+        A volume of zero is filled at the best price.
+        """
+        if volume < 0:
+            raise ValueError('invalid volume: {}'.format(volume))
+
+        if not volume:
+            if not self.keys:
+                raise OrderBookException('book is empty')
+
+            return self.best()[0]
+
+        remaining = volume
+        cost = 0
+
+        for key in reversed(self.keys):
+            amount = min(remaining, self.amounts[key])
+            cost += amount * -self.sign * key
+            remaining -= amount
+
+            if not remaining:
+                return cost / volume
+
+        raise OrderBookException('book has not enough depth to fill {}'.format(volume))
+
+
+class OrderBook:
+    """Bids and asks of a pair with the amounts available at each price.
+
+    Built from a v2 book snapshot of (price, count, amount) levels, positive amounts being bids
+    and negative ones asks, and kept current by applying the updates in the same format. A level
+    with a count of zero is removed.
+    """
+    def __init__(self, levels=()):
+        self.bids = OrderBookSide(-1)
+        self.asks = OrderBookSide(1)
+        self.lock = threading.Lock()
+
+        self.snapshot(levels)
+
+    def snapshot(self, levels):
+        """Replace every level."""
+        with self.lock:
+            self.bids = OrderBookSide(-1)
+            self.asks = OrderBookSide(1)
+
+            for price, count, amount in levels:
+                self._update(price, count, amount)
+
+    def update(self, price, count, amount):
+        with self.lock:
+            self._update(price, count, amount)
+
+    @property
+    def best_bid(self):
+        """(price, amount) of the best bid, or None if there are no bids."""
+        return self.bids.best()
+
+    @property
+    def best_ask(self):
+        """(price, amount) of the best ask, or None if there are no asks."""
+        return self.asks.best()
+
+    @property
+    def spread(self):
+        bid, ask = self.best_bid, self.best_ask
+        return ask[0] - bid[0] if bid and ask else None
+
+    def fill_price(self, direction, volume):
+        """Depth-weighted average price of a market order of volume in the direction."""
+        with self.lock:
+            return (self.asks if direction == ExchangeAPI.BUY else self.bids).fill(volume)
+
+    def _update(self, price, count, amount):
+        side = self.bids if amount > 0 else self.asks
+
+        if count:
+            side.set(price, abs(amount))
+
+        else:
+            side.remove(price)
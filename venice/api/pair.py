@@ -1,12 +1,12 @@
-from decimal import Decimal
+from venice.util import to_decimal
 
 
 class Pair:
     def __init__(self, name, precision, order_min=0, order_max=None):
         self.name = name
         self.precision = precision
-        self.order_min = Decimal(order_min)
-        self.order_max = Decimal(order_max)
+        self.order_min = to_decimal(order_min)
+        self.order_max = to_decimal(order_max)
 
     def __repr__(self):
         return 'Pair(name={}, precision={}, order_min={}, order_max={}'.format(
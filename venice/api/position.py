@@ -1,4 +1,4 @@
-from decimal import Decimal
+from venice.util import to_decimal
 
 
 class Position:
@@ -7,11 +7,11 @@ class Position:
         self.position_id = position_id
         self.direction = direction
         self.pair = pair
-        self.volume = Decimal(volume)
-        self.volume_closed = Decimal(volume_closed)
-        self.fee = Decimal(fee)
-        self.margin = Decimal(margin)
-        self.net_profit = Decimal(net_profit)
+        self.volume = to_decimal(volume)
+        self.volume_closed = to_decimal(volume_closed)
+        self.fee = to_decimal(fee)
+        self.margin = to_decimal(margin)
+        self.net_profit = to_decimal(net_profit)
 
     def __str__(self):
         return self.position_id
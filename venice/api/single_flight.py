@@ -0,0 +1,76 @@
+import threading
+
+from functools import wraps
+
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesce concurrent identical calls.
+
+    While a call for a key is in flight, other callers asking for the same key wait for it and
+    share its result (or its exception) instead of running the call again. Shared results must
+    not be modified by the callers.
+    """
+    def __init__(self):
+        self.calls = 0
+        self.shared = 0
+
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, function, *args, **kwargs):
+        """Run function unless a call for key is already in flight, and return its result."""
+        with self._lock:
+            call = self._calls.get(key)
+
+            if call:
+                self.shared += 1
+
+            else:
+                self.calls += 1
+                self._calls[key] = _Call()
+
+        if call:
+            call.event.wait()
+
+            if call.error:
+                raise call.error
+
+            return call.result
+
+        call = self._calls[key]
+
+        try:
+            call.result = function(*args, **kwargs)
+            return call.result
+
+        except Exception as error:
+            call.error = error
+            raise
+
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+            call.event.set()
+
+
+def coalesced(method):
+    """Decorator sharing concurrent identical calls of an ExchangeAPI method.
+
+    Calls are only shared by API objects of the same class and exchange URI, as a SingleFlight can
+    be shared by several of them.
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (type(self), getattr(self, 'uri', None), method.__name__, args,
+               tuple(sorted(kwargs.items())))
+        return self.single_flight.do(key, method, self, *args, **kwargs)
+
+    return wrapper
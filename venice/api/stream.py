@@ -0,0 +1,280 @@
+import json
+import threading
+import time
+
+from logging import getLogger
+
+import websockets
+
+from websockets.sync.client import connect
+
+from venice.connection.connection import ExchangeConnection
+
+from . import bitfinex
+from .candle_buffer import CandleBuffer
+from .order_book import OrderBook
+from .ticker import Ticker
+
+
+class BitfinexStream:
+    """Client for the Bitfinex v2 public WebSocket channels.
+
+    Keeps an always-current candle series, ticker, recent trades and book for every subscription,
+    updated from a background thread. The connection is reopened and every channel subscribed
+    again when it drops; while a channel has no fresh snapshot its data is reported as missing so
+    callers can fall back to polling.
+    """
+    def __init__(self, uri='wss://api-pub.bitfinex.com/ws/2', limit=240, reconnect_delay=1):
+        self.uri = uri
+        self.limit = limit
+        self.reconnect_delay = reconnect_delay
+
+        self.connections = 0
+
+        self._subscriptions = []
+        self._channels = {}
+        self._candles = {}
+        self._tickers = {}
+        self._trades = {}
+        self._books = {}
+
+        self._lock = threading.Lock()
+        self._updated = threading.Condition(self._lock)
+        self._running = False
+        self._websocket = None
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, type_, value, traceback):
+        self.stop()
+
+    # Subscriptions
+
+    def subscribe_candles(self, pair, period):
+        key = 'trade:{}:{}'.format(bitfinex.BitfinexAPI.PERIOD_KEYS[period], self._symbol(pair))
+        self._subscribe({'channel': 'candles', 'key': key}, ('candles', pair, period))
+
+    def subscribe_ticker(self, pair):
+        self._subscribe({'channel': 'ticker', 'symbol': self._symbol(pair)}, ('ticker', pair))
+
+    def subscribe_trades(self, pair):
+        self._subscribe({'channel': 'trades', 'symbol': self._symbol(pair)}, ('trades', pair))
+
+    def subscribe_book(self, pair, length=100):
+        self._subscribe({'channel': 'book', 'symbol': self._symbol(pair), 'prec': 'P0',
+                         'len': str(length)}, ('book', pair))
+
+    # Data
+
+    def candles(self, pair, period):
+        """Candles of the pair from oldest to newest, or None if the channel is not live."""
+        with self._lock:
+            candles = self._candles.get((pair, period))
+            return list(candles.candles) if candles is not None else None
+
+    def ticker(self, pair):
+        """Current ticker of the pair, or None if the channel is not live."""
+        with self._lock:
+            return self._tickers.get(pair)
+
+    def trades(self, pair):
+        """Recent trades of the pair as (id, time, amount, price), or None if not live."""
+        with self._lock:
+            trades = self._trades.get(pair)
+            return list(trades) if trades is not None else None
+
+    def book(self, pair):
+        """Order book of the pair, updated in place, or None if the channel is not live."""
+        with self._lock:
+            return self._books.get(pair)
+
+    def wait(self, timeout=None):
+        """Wait until every subscribed channel has received its snapshot."""
+        end_time = time.monotonic() + timeout if timeout else None
+
+        with self._updated:
+            while not self._live():
+                remaining = end_time - time.monotonic() if end_time else None
+
+                if remaining is not None and remaining <= 0:
+                    return False
+
+                self._updated.wait(remaining)
+
+        return True
+
+    # Thread control
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+
+        if self._websocket:
+            self._websocket.close()
+
+        if self._thread:
+            self._thread.join()
+
+    # Internal methods
+
+    def _subscribe(self, message, subscription):
+        message = dict(message, event='subscribe')
+
+        with self._lock:
+            self._subscriptions.append((message, subscription))
+
+        if self._websocket:
+            self._send(message)
+
+    def _live(self):
+        for _, subscription in self._subscriptions:
+            if self._data(subscription) is None:
+                return False
+
+        return True
+
+    def _data(self, subscription):
+        if subscription[0] == 'candles':
+            return self._candles.get(subscription[1:])
+
+        elif subscription[0] == 'ticker':
+            return self._tickers.get(subscription[1])
+
+        elif subscription[0] == 'book':
+            return self._books.get(subscription[1])
+
+        return self._trades.get(subscription[1])
+
+    def _run(self):
+        logger = getLogger(__name__)
+
+        while self._running:
+            try:
+                with connect(self.uri, open_timeout=10) as websocket:
+                    self._websocket = websocket
+                    self.connections += 1
+
+                    with self._lock:
+                        messages = [x for x, _ in self._subscriptions]
+
+                    for message in messages:
+                        self._send(message)
+
+                    for message in websocket:
+                        self._handle(ExchangeConnection.decode(message))
+
+            except (OSError, websockets.exceptions.WebSocketException) as error:
+                logger.warning('stream connection error: {}'.format(error))
+
+            except Exception:
+                # A message that cannot be handled would leave the data stale, start over instead
+                logger.exception('stream message error, reconnecting')
+
+            finally:
+                self._websocket = None
+                self._reset()
+
+            if self._running:
+                time.sleep(self.reconnect_delay)
+
+    def _send(self, message):
+        try:
+            self._websocket.send(json.dumps(message))
+
+        except (AttributeError, websockets.exceptions.WebSocketException):
+            # Sent again with all subscriptions when the connection is reopened
+            pass
+
+    def _reset(self):
+        with self._lock:
+            self._channels = {}
+            self._candles = {}
+            self._tickers = {}
+            self._trades = {}
+            self._books = {}
+
+    def _handle(self, message):
+        logger = getLogger(__name__)
+
+        if isinstance(message, dict):
+            if message.get('event') == 'subscribed':
+                self._subscribed(message)
+
+            elif message.get('event') == 'error':
+                logger.error('stream error: {}'.format(message))
+
+            elif message.get('event') == 'info' and message.get('code') == 20051:
+                # Server restart requested, reconnect
+                self._websocket.close()
+
+            return
+
+        channel_id, data = message[0], message[1:]
+
+        with self._updated:
+            subscription = self._channels.get(channel_id)
+
+            if not subscription or data[0] == 'hb':
+                return
+
+            if subscription[0] == 'candles':
+                self._handle_candles(subscription[1:], data[-1])
+
+            elif subscription[0] == 'ticker':
+                self._tickers[subscription[1]] = self._format_ticker(data[-1])
+
+            elif subscription[0] == 'book':
+                self._handle_book(subscription[1], data[0])
+
+            else:
+                self._handle_trades(subscription[1], data)
+
+            self._updated.notify_all()
+
+    def _subscribed(self, message):
+        with self._lock:
+            for request, subscription in self._subscriptions:
+                if all(message.get(x) == request[x] for x in request if x != 'event'):
+                    self._channels[message['chanId']] = subscription
+
+    def _handle_candles(self, key, data):
+        if not data or isinstance(data[0], list):
+            self._candles[key] = CandleBuffer(self.limit)
+            self._candles[key].merge(bitfinex.BitfinexAPI._format_ohlc(x) for x in data[::-1])
+
+        elif key in self._candles:
+            self._candles[key].merge([bitfinex.BitfinexAPI._format_ohlc(data)])
+
+    def _handle_trades(self, pair, data):
+        if isinstance(data[0], list):
+            self._trades[pair] = [tuple(x) for x in data[0][::-1]]
+
+        elif data[0] == 'te' and pair in self._trades:
+            self._trades[pair].append(tuple(data[1]))
+
+        if pair in self._trades:
+            del self._trades[pair][:-self.limit]
+
+    def _handle_book(self, pair, data):
+        if not data or isinstance(data[0], list):
+            self._books[pair] = OrderBook(data)
+
+        elif pair in self._books:
+            self._books[pair].update(*data)
+
+    @staticmethod
+    def _format_ticker(data):
+        return Ticker(time.time(), data[2], data[0], data[6], low=data[9], high=data[8],
+                      volume=data[7])
+
+    @staticmethod
+    def _symbol(pair):
+        return bitfinex.BitfinexAPI._convert_pair(bitfinex.BitfinexAPI.PAIR_KEYS[pair])
+
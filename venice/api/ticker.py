@@ -1,15 +1,15 @@
-from decimal import Decimal
+from venice.util import to_decimal
 
 
 class Ticker:
     def __init__(self, time, ask, bid, last, low=0, high=0, volume=0):
         self.time = time
-        self.ask = Decimal(ask)
-        self.bid = Decimal(bid)
-        self.last = Decimal(last)
-        self.low = Decimal(low)
-        self.high = Decimal(high)
-        self.volume = Decimal(volume)
+        self.ask = to_decimal(ask)
+        self.bid = to_decimal(bid)
+        self.last = to_decimal(last)
+        self.low = to_decimal(low)
+        self.high = to_decimal(high)
+        self.volume = to_decimal(volume)
 
     def __str__(self):
         return '{} ask:{}, bid:{}, last:{}, low:{}, high:{}, vol:{}'.format(
@@ -1,4 +1,12 @@
-from .connection import ExchangeConnection, ExchangeConnectionException
+from .connection import (
+    DeadlineExceeded, ExchangeConnection, ExchangeConnectionException,
+    ExchangeConnectionTransientException)
+from .policy import RequestPolicy
+from .pool import ConnectionPool
+from .rate_limit import RateLimiter, TokenBucket
+from .recording import RequestRecorder, RequestReplayer
+from .telemetry import EndpointStats, Telemetry
+from .aio import AsyncExchangeConnection
 
 from . import bitfinex
 from . import kraken
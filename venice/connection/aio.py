@@ -0,0 +1,37 @@
+import asyncio
+
+from functools import partial
+
+
+class AsyncExchangeConnection:
+    """Asyncio front end for an ExchangeConnection.
+
+    The blocking requests of the wrapped connection run on an executor, so several queries can
+    be awaited concurrently while sharing the connection pool of the wrapped connection.
+    """
+    def __init__(self, connection, executor=None):
+        self.connection = connection
+        self.executor = executor
+
+    async def __aenter__(self):
+        await self._run(self.connection.__enter__)
+        return self
+
+    async def __aexit__(self, type_, value, traceback):
+        await self._run(self.connection.__exit__, type_, value, traceback)
+
+    async def query(self, method, endpoint, sign=False, **kwargs):
+        """Send a request to the exchange."""
+        return await self._run(self.connection.query, method, endpoint, sign=sign, **kwargs)
+
+    async def query_public(self, endpoint, **kwargs):
+        """Make a public request to the exchange."""
+        return await self._run(self.connection.query_public, endpoint, **kwargs)
+
+    async def query_private(self, endpoint, **kwargs):
+        """Make a private request to the exchange."""
+        return await self._run(self.connection.query_private, endpoint, **kwargs)
+
+    async def _run(self, function, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(function, *args, **kwargs))
@@ -11,15 +11,38 @@ from .connection import ExchangeConnection
 
 class BitfinexConnection(ExchangeConnection):
     """Bitfinex connection class."""
-    def __init__(self, uri='https://api.bitfinex.com/', version='v1', key=None, secret=None):
-        super().__init__(uri, version, key, secret)
+
+    # Request limits per endpoint as (requests, seconds, burst)
+    RATE_LIMITS = {
+        'v1/pubticker/': (30, 60, 5),
+        'v1/symbols_details': (5, 60, 1),
+        'v1/orders/hist': (1, 60, 1),
+        'v1/orders': (60, 60, 5),
+        'v1/order/status': (60, 60, 10),
+        'v1/order/new': (90, 60, 10),
+        'v1/order/cancel': (90, 60, 10),
+        'v1/balances': (20, 60, 2),
+        'v1/summary': (10, 60, 1),
+        'v2/book/': (90, 60, 10),
+        'v2/candles/': (30, 60, 5),
+        'v2/tickers': (90, 60, 10),
+        'v2/trades/': (30, 60, 5),
+    }
+
+    def __init__(self, uri='https://api.bitfinex.com/', version='v1', key=None, secret=None,
+                 pool=None, rate_limiter=None, policy=None, deadline=None, timeout=10,
+                 recorder=None, telemetry=None):
+        super().__init__(
+            uri, version, key, secret, pool, rate_limiter, policy, deadline, timeout, recorder,
+            telemetry)
 
         self.headers = {
             'User-Agent': 'venice/1.0'
         }
 
     def __enter__(self):
-        self.load_key(expanduser('~') + '/.bitfinex.key')
+        if not self.offline:
+            self.load_key(expanduser('~') + '/.bitfinex.key')
 
         return self
 
@@ -32,10 +55,16 @@ class BitfinexConnection(ExchangeConnection):
         if 'get_params' in kwargs:
             path += self._format_get_params(kwargs['get_params'])
 
-        if sign:
-            headers.update(self._sign(path, kwargs['params'] if 'params' in kwargs else None))
+        params = dict(kwargs['params']) if 'params' in kwargs else None
+
+        # Wait before signing so nonces keep the order in which requests are sent
+        self._throttle(endpoint, sign)
+
+        if sign and not self.offline:
+            headers.update(self._sign(path, dict(params) if params else None))
 
-        return self._request(method, path, headers=headers)
+        return self._request(method, path, request_params=params, endpoint=endpoint, sign=sign,
+                             headers=headers)
 
     def query_public(self, endpoint, **kwargs):
         return self.query('GET', endpoint, **kwargs)
@@ -3,23 +3,62 @@ import json
 import requests
 import time
 
-from logging import getLogger
-from requests.exceptions import ReadTimeout
+from decimal import Decimal
+from logging import getLogger, DEBUG
+from requests.exceptions import RequestException
+
+try:
+    import simplejson
+except ImportError:
+    simplejson = None
 
 
 class ExchangeConnectionException(Exception):
     pass
 
 
+class ExchangeConnectionTransientException(ExchangeConnectionException):
+    """Error that may go away when the request is retried (timeouts, throttling, 5xx)."""
+    pass
+
+
+class DeadlineExceeded(ExchangeConnectionTransientException):
+    """The request could not be completed before the deadline of the connection."""
+    pass
+
+
 class ExchangeConnection(metaclass=abc.ABCMeta):
     """
     Base class for Exchange connection."""
-    def __init__(self, uri, version=None, key=None, secret=None):
-        """Create ExchangeConnection object."""
+    def __init__(self, uri, version=None, key=None, secret=None, pool=None, rate_limiter=None,
+                 policy=None, deadline=None, timeout=10, recorder=None, telemetry=None):
+        """Create ExchangeConnection object.
+
+        If a ConnectionPool is given, requests are sent through its keep-alive session for this
+        URI, otherwise each request opens a new connection. If a RateLimiter is given, requests
+        are delayed to stay within its limits.
+
+        Each request waits at most ``timeout`` seconds, and never past ``deadline`` (a
+        time.monotonic() value) if one is given. Idempotent requests are retried and hedged
+        according to the RequestPolicy, if any.
+
+        A RequestRecorder saves every request and response, while a RequestReplayer answers
+        requests from a recording without using the network.
+
+        Latencies, sizes, errors, retries and rate limiter waits are added to the Telemetry
+        object, if any.
+        """
         self.uri = uri
         self.version = version
         self.key = key
         self.secret = secret
+        self.pool = pool
+        self.rate_limiter = rate_limiter
+        self.policy = policy
+        self.deadline = deadline
+        self.timeout = timeout
+        self.recorder = recorder
+        self.telemetry = telemetry
 
     def __enter__(self):
         return self
@@ -27,6 +66,11 @@ class ExchangeConnection(metaclass=abc.ABCMeta):
     def __exit__(self, type_, value, traceback):
         pass
 
+    @property
+    def offline(self):
+        """Whether requests are answered from a recording instead of the exchange."""
+        return bool(self.recorder and self.recorder.offline)
+
     def load_key(self, path):
         """Load key and secret from file."""
         with open(path, 'r') as f:
@@ -51,28 +95,157 @@ class ExchangeConnection(metaclass=abc.ABCMeta):
         """Create a nonce based on the current time."""
         return str(int(1000 * time.time()))
 
-    def _request(self, method, path, **kwargs):
-        """Send the resquest to the exchange."""
+    def _throttle(self, endpoint, sign=False):
+        """Wait until the rate limiter allows a request to the endpoint, if it does before the
+        deadline."""
+        if self.rate_limiter and not self.offline:
+            path = self._path(endpoint)
+            wait_time = self.rate_limiter.acquire(path, self.key if sign else None,
+                                                  self._remaining())
+
+            if wait_time is None:
+                raise DeadlineExceeded('rate limit of {} exceeds the deadline'.format(path))
+
+            if wait_time and self.telemetry:
+                self.telemetry.wait(path, wait_time)
+
+    def _request(self, method, path, request_params=None, endpoint=None, sign=False, **kwargs):
+        """Send the resquest to the exchange, retrying idempotent (GET) requests on failure.
+
+        The request_params identify the request in recordings, in addition to its path. The caller
+        throttles the first attempt to the endpoint, each retry takes its own rate limiter token.
+        """
+        logger = getLogger(__name__)
+
+        idempotent = method == 'GET'
+        attempts = self.policy.retries + 1 if self.policy and idempotent else 1
+
+        for attempt in range(attempts):
+            if attempt and endpoint is not None:
+                self._throttle(endpoint, sign)
+
+            try:
+                return self._attempt(method, path, idempotent, request_params, **kwargs)
+
+            except ExchangeConnectionTransientException as error:
+                if attempt + 1 == attempts:
+                    raise
+
+                backoff_time = self.policy.backoff_time(attempt)
+
+                if self.deadline and time.monotonic() + backoff_time >= self.deadline:
+                    raise
+
+                logger.debug('retrying request: path={}, attempt={}, error={}'.format(
+                    path, attempt + 1, error))
+
+                if self.telemetry:
+                    self.telemetry.retry(path.split('?')[0])
+
+                time.sleep(backoff_time)
+
+    def _attempt(self, method, path, idempotent, request_params=None, **kwargs):
         logger = getLogger(__name__)
 
+        def send():
+            return self._send(method, path, idempotent, **kwargs)
+
+        start_time = time.monotonic()
+
         try:
-            response = requests.request(method, self.uri + path, **kwargs)
+            if self.recorder:
+                status_code, content = self.recorder.send(method, path, request_params, send)
 
-        except Exception:
-            raise ExchangeConnectionException(response.text)
+            else:
+                status_code, content = send()
+
+        except ExchangeConnectionException:
+            self._record(path, start_time, error=True)
+            raise
 
-        logger.debug(
-            'new request: method={}, path={}, kwargs={}, ok={}, status_code={}, text={}'.format(
-                method, path, kwargs, response.ok, response.status_code, response.text))
+        self._record(path, start_time, content, error=status_code >= 400)
 
-        if not response.ok:
-            raise ExchangeConnectionException(response.text)
+        if logger.isEnabledFor(DEBUG):
+            logger.debug(
+                'new request: method={}, path={}, kwargs={}, status_code={}, text={}'.format(
+                    method, path, kwargs, status_code, content.decode('utf-8', 'replace')))
+
+        if status_code == 429 or status_code >= 500:
+            raise ExchangeConnectionTransientException(content.decode('utf-8', 'replace'))
+
+        if status_code >= 400:
+            raise ExchangeConnectionException(content.decode('utf-8', 'replace'))
 
         try:
-            return json.loads(response.text)
+            return self.decode(content)
 
         except Exception:
-            raise ExchangeConnectionException(response.text)
+            raise ExchangeConnectionException(content.decode('utf-8', 'replace'))
+
+    def _record(self, path, start_time, content=b'', error=False):
+        if self.telemetry:
+            self.telemetry.record(
+                path.split('?')[0], time.monotonic() - start_time, len(content), error)
+
+    def _send(self, method, path, idempotent, **kwargs):
+        """Send the request over HTTP, returning the status code and the body."""
+        session = self.pool.session(self.uri) if self.pool else requests
+        timeout = self._timeout()
+
+        def send():
+            return session.request(method, self.uri + path, timeout=timeout, **kwargs)
+
+        endpoint = path.split('?')[0]
+        start_time = time.monotonic()
+
+        try:
+            if self.policy and idempotent:
+                response = self.policy.send(endpoint, send, timeout, self._hedge_token)
+
+            else:
+                response = send()
+
+        except RequestException as error:
+            raise ExchangeConnectionTransientException(str(error))
+
+        if self.policy and response.ok:
+            self.policy.record(endpoint, time.monotonic() - start_time)
+
+        return response.status_code, response.content
+
+    def _hedge_token(self, endpoint):
+        """Take a rate limiter token for a hedged request, if one is available right away."""
+        if not self.rate_limiter or self.offline:
+            return True
+
+        return self.rate_limiter.acquire(endpoint, max_wait=0) is not None
+
+    def _remaining(self):
+        """Time left until the deadline, or None without a deadline."""
+        return self.deadline - time.monotonic() if self.deadline else None
+
+    def _timeout(self):
+        """Time a request can take, limited by the deadline."""
+        if not self.deadline:
+            return self.timeout
+
+        remaining = self._remaining()
+
+        if remaining <= 0:
+            raise DeadlineExceeded('deadline exceeded')
+
+        return min(self.timeout, remaining)
+
+    @staticmethod
+    def decode(content):
+        """Decode a response body, parsing non-integer numbers as Decimal.
+
+        Uses simplejson when it is installed, which is faster than the standard library parser.
+        """
+        if simplejson:
+            return simplejson.loads(content, use_decimal=True)
+
+        return json.loads(content, parse_float=Decimal)
 
     @staticmethod
     def _format_get_params(params):
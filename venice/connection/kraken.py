@@ -13,8 +13,11 @@ class KrakenConnectionError(Exception):
 
 class KrakenConnection(ExchangeConnection):
     def __init__(self, uri='https://api.kraken.com', version='0', key=None, secret=None,
-                 timeout=10):
-        super().__init__(uri, version, key, secret)
+                 timeout=10, pool=None, rate_limiter=None, policy=None, deadline=None,
+                 recorder=None, telemetry=None):
+        super().__init__(
+            uri, version, key, secret, pool, rate_limiter, policy, deadline, timeout, recorder,
+            telemetry)
 
     def __enter__(self):
         pass
@@ -28,13 +31,18 @@ class KrakenConnection(ExchangeConnection):
         path = '/' + '/'.join([self.version, request_type, endpoint])
 
         params = kwargs['params'] if 'params' in kwargs else {}
+        request_params = dict(params)
+
+        self._throttle(endpoint, sign)
 
         if sign:
             headers, params = self._sign(path, params)
 
         encoded_data = urllib.parse.urlencode(params)
 
-        return self._request('POST', path, headers=headers, data=encoded_data)
+        return self._request(
+            'POST', path, request_params=request_params, endpoint=endpoint, sign=sign,
+            headers=headers, data=encoded_data)
 
     def _sign(self, path, params=None):
         if not params:
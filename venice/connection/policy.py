@@ -0,0 +1,81 @@
+import collections
+import random
+import threading
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+class RequestPolicy:
+    """Retry and hedging policy for idempotent requests.
+
+    Failed idempotent requests are retried up to ``retries`` times, waiting a random time of up to
+    ``backoff * 2 ** attempt`` seconds (capped at ``max_backoff``) between attempts. With
+    ``hedge`` enabled, an idempotent request still running after the ``hedge_quantile`` latency
+    of its endpoint is duplicated and the first response is used.
+    """
+    def __init__(self, retries=2, backoff=0.2, max_backoff=2, hedge=False, hedge_quantile=0.95,
+                 hedge_workers=4, samples=100):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+
+        self.hedges = 0
+
+        self._samples = samples
+        self._latencies = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(hedge_workers) if hedge else None
+
+    def backoff_time(self, attempt):
+        """Jittered time to wait before retrying after the given attempt."""
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def record(self, endpoint, latency):
+        """Record the latency of a successful request."""
+        with self._lock:
+            if endpoint not in self._latencies:
+                self._latencies[endpoint] = collections.deque(maxlen=self._samples)
+
+            self._latencies[endpoint].append(latency)
+
+    def quantile(self, endpoint, quantile):
+        """Latency quantile of the endpoint, or None without enough samples."""
+        with self._lock:
+            latencies = sorted(self._latencies.get(endpoint, []))
+
+        if len(latencies) < 10:
+            return None
+
+        return latencies[min(len(latencies) - 1, int(quantile * len(latencies)))]
+
+    def send(self, endpoint, function, timeout, acquire=None):
+        """Call function, hedging it if enabled and the endpoint has enough latency samples.
+
+        The duplicate request is only sent if acquire(endpoint), when given, returns True, which
+        lets it take a rate limiter token.
+        """
+        delay = self.quantile(endpoint, self.hedge_quantile) if self.hedge else None
+
+        if delay is None or delay >= timeout:
+            return function()
+
+        futures = [self._executor.submit(function)]
+        done, _ = wait(futures, timeout=delay)
+
+        if not done and (not acquire or acquire(endpoint)):
+            with self._lock:
+                self.hedges += 1
+
+            futures.append(self._executor.submit(function))
+
+        # Use the first successful response, or the error of the last one to complete
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                futures.remove(future)
+
+                if not future.exception() or not futures:
+                    return future.result()
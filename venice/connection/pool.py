@@ -0,0 +1,49 @@
+import threading
+
+import requests
+
+from requests.adapters import HTTPAdapter
+
+
+class ConnectionPool:
+    """Keep-alive HTTP sessions shared by the connections of an API object.
+
+    One session is kept per base URI, each one holding up to ``pool_size`` persistent connections,
+    so consecutive requests reuse warm TCP/TLS connections instead of opening new ones.
+    """
+    def __init__(self, pool_size=10):
+        self.pool_size = pool_size
+
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type_, value, traceback):
+        self.close()
+
+    def session(self, uri):
+        """Return the session used for the given base URI, creating it if necessary."""
+        with self._lock:
+            if uri not in self._sessions:
+                self._sessions[uri] = self._create_session()
+
+            return self._sessions[uri]
+
+    def close(self):
+        """Close all sessions and their connections."""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+
+            self._sessions = {}
+
+    def _create_session(self):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+
+        return session
@@ -0,0 +1,92 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """Token bucket allowing ``rate`` requests per second with bursts of up to ``capacity``."""
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+        self._lock = threading.Lock()
+
+    def reserve(self, max_wait=None):
+        """Take a token and return how long the caller has to wait before using it.
+
+        Tokens can go negative, which queues callers in the order they reserved. If the wait would
+        be longer than max_wait, no token is taken and None is returned.
+        """
+        with self._lock:
+            now = time.monotonic()
+
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+            wait = (1 - self.tokens) / self.rate if self.tokens < 1 else 0
+
+            if max_wait is not None and wait > max_wait:
+                return None
+
+            self.tokens -= 1
+
+            return wait
+
+
+class RateLimiter:
+    """Client-side rate limiting of exchange requests.
+
+    Limits are given per endpoint prefix as ``(requests, seconds, burst)``. Private requests are
+    limited per API key. Requests exceeding the limit are delayed instead of sent, and the time
+    spent waiting is counted per endpoint.
+    """
+    def __init__(self, limits=None, default=None):
+        self.limits = limits if limits else {}
+        self.default = default
+
+        self.waits = {}
+        self.wait_time = {}
+
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, endpoint, key=None, max_wait=None):
+        """Block until a request to the endpoint can be sent, returning the time waited.
+
+        Returns None right away if the request could not be sent within max_wait seconds.
+        """
+        prefix, limit = self._limit(endpoint)
+
+        if not limit:
+            return 0
+
+        requests, seconds, burst = limit
+        bucket_key = (prefix, key)
+
+        with self._lock:
+            if bucket_key not in self._buckets:
+                self._buckets[bucket_key] = TokenBucket(requests / seconds, burst)
+
+            bucket = self._buckets[bucket_key]
+
+        wait = bucket.reserve(max_wait)
+
+        if wait:
+            with self._lock:
+                self.waits[prefix] = self.waits.get(prefix, 0) + 1
+                self.wait_time[prefix] = self.wait_time.get(prefix, 0) + wait
+
+            time.sleep(wait)
+
+        return wait
+
+    def _limit(self, endpoint):
+        matches = [x for x in self.limits if endpoint.startswith(x)]
+
+        if matches:
+            prefix = max(matches, key=len)
+            return prefix, self.limits[prefix]
+
+        return endpoint, self.default
@@ -0,0 +1,124 @@
+import gzip
+import json
+import threading
+import time
+
+from .connection import ExchangeConnectionTransientException
+
+
+class RequestRecorder:
+    """Save every request sent by the connections using it, with its response and timing.
+
+    The recording is a gzip compressed file with one JSON object per line holding the method,
+    path, parameters, start time (relative to the first request), duration, status code and body
+    of each request, or the error it raised.
+    """
+    offline = False
+
+    def __init__(self, path):
+        self.path = path
+
+        self._file = gzip.open(path, 'wt', encoding='utf-8')
+        self._start_time = None
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type_, value, traceback):
+        self.close()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+    def send(self, method, path, params, send):
+        """Call send and save its result."""
+        start_time = time.time()
+        entry = {'method': method, 'path': path, 'params': _strip(params)}
+
+        try:
+            status_code, content = send()
+            entry.update(status=status_code, body=content.decode('utf-8'))
+
+            return status_code, content
+
+        except ExchangeConnectionTransientException as error:
+            entry['error'] = str(error)
+            raise
+
+        finally:
+            entry['duration'] = time.time() - start_time
+
+            with self._lock:
+                if self._start_time is None:
+                    self._start_time = start_time
+
+                entry['time'] = start_time - self._start_time
+                self._file.write(json.dumps(entry, separators=(',', ':')) + '\n')
+
+
+class RequestReplayer:
+    """Answer requests from a recording made by RequestRecorder, without using the network.
+
+    Identical requests get their recorded responses in order, the last one being repeated once
+    they run out. With a ``speed`` the original timing is reproduced, divided by the speed: a
+    response is not given before its recorded start time (relative to the first replayed request)
+    and then takes its recorded duration. Otherwise responses are immediate.
+    """
+    offline = True
+
+    def __init__(self, path, speed=None):
+        self.path = path
+        self.speed = speed
+
+        self.requests = 0
+        self.misses = 0
+
+        self._responses = {}
+        self._start_time = None
+        self._lock = threading.Lock()
+
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                entry = json.loads(line)
+                key = self._key(entry['method'], entry['path'], entry['params'])
+                self._responses.setdefault(key, []).append(entry)
+
+    def send(self, method, path, params, send):
+        """Return the recorded response for the request, never calling send."""
+        key = self._key(method, path, _strip(params))
+
+        with self._lock:
+            if self._start_time is None:
+                self._start_time = time.time()
+
+            self.requests += 1
+            entries = self._responses.get(key)
+
+            if not entries:
+                self.misses += 1
+                return 404, json.dumps({'message': 'request not recorded'}).encode('utf-8')
+
+            entry = entries.pop(0) if len(entries) > 1 else entries[0]
+
+        if self.speed:
+            start_time = self._start_time + entry['time'] / self.speed
+            time.sleep(max(0, start_time - time.time()) + entry['duration'] / self.speed)
+
+        if 'error' in entry:
+            raise ExchangeConnectionTransientException(entry['error'])
+
+        return entry['status'], entry['body'].encode('utf-8')
+
+    @staticmethod
+    def _key(method, path, params):
+        return method, path, json.dumps(params, sort_keys=True)
+
+
+def _strip(params):
+    """Remove the parameters changing on every request."""
+    if not params:
+        return None
+
+    return {x: str(params[x]) for x in params if x not in ('nonce', 'request')}
@@ -0,0 +1,104 @@
+import bisect
+import copy
+import threading
+
+from logging import getLogger
+
+
+class EndpointStats:
+    """Aggregated request statistics of one endpoint."""
+
+    # Upper bounds of the latency histogram buckets, in seconds
+    BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.bytes = 0
+        self.latency = 0
+        self.latency_max = 0
+        self.histogram = [0] * (len(self.BUCKETS) + 1)
+        self.waits = 0
+        self.wait_time = 0
+
+    def __repr__(self):
+        return ('EndpointStats(requests={}, errors={}, retries={}, bytes={}, latency_avg={:.3f}, '
+                'latency_p95={}, waits={}, wait_time={:.3f})'.format(
+                    self.requests, self.errors, self.retries, self.bytes, self.latency_avg,
+                    self.quantile(0.95), self.waits, self.wait_time))
+
+    @property
+    def latency_avg(self):
+        return self.latency / self.requests if self.requests else 0
+
+    def quantile(self, quantile):
+        """Upper bound of the histogram bucket holding the latency quantile."""
+        if not self.requests:
+            return None
+
+        count = 0
+
+        for i, value in enumerate(self.histogram):
+            count += value
+
+            if count >= quantile * self.requests:
+                return self.BUCKETS[i] if i < len(self.BUCKETS) else self.latency_max
+
+
+class Telemetry:
+    """In-memory request telemetry per endpoint.
+
+    Keeps request and error counts, latency histograms, response sizes, retries and rate limiter
+    waits. Only counters are updated per request, so it is cheap enough to be always enabled.
+    """
+    def __init__(self):
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, latency, size=0, error=False):
+        """Record a request."""
+        with self._lock:
+            stats = self._stats(endpoint)
+            stats.requests += 1
+            stats.errors += 1 if error else 0
+            stats.bytes += size
+            stats.latency += latency
+            stats.latency_max = max(stats.latency_max, latency)
+            stats.histogram[bisect.bisect_left(EndpointStats.BUCKETS, latency)] += 1
+
+    def retry(self, endpoint):
+        """Record a retried request."""
+        with self._lock:
+            self._stats(endpoint).retries += 1
+
+    def wait(self, endpoint, wait_time):
+        """Record time spent waiting for the rate limiter."""
+        with self._lock:
+            stats = self._stats(endpoint)
+            stats.waits += 1
+            stats.wait_time += wait_time
+
+    def stats(self):
+        """Statistics per endpoint, sorted by total latency."""
+        with self._lock:
+            endpoints = copy.deepcopy(self._endpoints)
+
+        return dict(sorted(endpoints.items(), key=lambda x: -x[1].latency))
+
+    def reset(self):
+        with self._lock:
+            self._endpoints = {}
+
+    def dump(self, logger=None):
+        """Log the statistics of every endpoint."""
+        logger = logger if logger else getLogger(__name__)
+
+        for endpoint, stats in self.stats().items():
+            logger.info('{}: {}'.format(endpoint, stats))
+
+    def _stats(self, endpoint):
+        if endpoint not in self._endpoints:
+            self._endpoints[endpoint] = EndpointStats()
+
+        return self._endpoints[endpoint]
@@ -0,0 +1,45 @@
+from collections.abc import Sequence
+from decimal import Decimal
+
+
+def to_fixed(value, places):
+    """Integer holding a Decimal scaled by 10 ** places, rounding half to even."""
+    return int(Decimal(value).scaleb(places).to_integral_value())
+
+
+def from_fixed(value, places):
+    """Decimal value of an integer scaled by 10 ** places."""
+    return Decimal(value).scaleb(-places)
+
+
+def div_round(a, b):
+    """Integer division of a by a positive b, rounding half to even like Decimal does."""
+    quotient, remainder = divmod(a, b)
+
+    if 2 * remainder > b or (2 * remainder == b and quotient % 2):
+        quotient += 1
+
+    return quotient
+
+
+class FixedSeries(Sequence):
+    """Fixed-point numbers stored as integers scaled by 10 ** places.
+
+    Items are read as Decimal, converted exactly, while the fixed-point indicators work on the
+    integers in ``values`` directly.
+    """
+    def __init__(self, values, places):
+        self.values = values
+        self.places = places
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return FixedSeries(self.values[index], self.places)
+
+        return from_fixed(self.values[index], self.places)
+
+    def __repr__(self):
+        return 'FixedSeries({}, places={})'.format(list(self), self.places)
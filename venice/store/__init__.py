@@ -0,0 +1,2 @@
+from .candle_store import CandleFile, CandleStore, CandleStoreException
+from .backfill import Backfill
@@ -0,0 +1,189 @@
+import argparse
+import json
+import os
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from logging import getLogger
+from logging.config import fileConfig
+
+from venice.api.api import ExchangeAPI
+from venice.api.bitfinex import BitfinexAPI
+
+from .candle_store import CandleStore
+
+
+class Backfill:
+    """Fetch the candle history of a pair and period into a CandleStore.
+
+    The time range is split in chunks of ``chunk`` candles fetched concurrently, within the rate
+    limits of the API. Chunks are written in order as soon as possible and recorded in a progress
+    file, so an interrupted backfill resumes where it stopped. Gaps left in the stored series are
+    detected and requested again once.
+    """
+    def __init__(self, api, store, exchange, chunk=1000, workers=4):
+        self.api = api
+        self.store = store
+        self.exchange = exchange
+        self.chunk = chunk
+        self.workers = workers
+
+        self.progress_path = os.path.join(store.root, 'backfill.json')
+
+        self._lock = threading.Lock()
+        self._progress = self._load_progress()
+
+    def run(self, pair, period, start, end):
+        """Backfill candles with start <= time < end, in milliseconds."""
+        logger = getLogger(__name__)
+
+        candle_file = self.store.file(self.exchange, pair, period)
+        progress = self._key_progress(pair, period)
+        length = self.api.period_seconds(period) * 1000
+
+        start -= start % length
+        chunks = [(x, min(x + self.chunk * length, end)) for x in range(
+            start, end, self.chunk * length)]
+        chunks = [x for x in chunks if list(x) not in progress['done']]
+
+        logger.info('backfilling {} {}: {} chunks'.format(pair, period, len(chunks)))
+
+        with ThreadPoolExecutor(self.workers) as executor:
+            futures = {executor.submit(self._fetch, pair, period, *x): x for x in chunks}
+            results = {}
+
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+
+                # Write the completed chunks that follow each other
+                while chunks and chunks[0] in results:
+                    chunk = chunks.pop(0)
+                    self._write(candle_file, results.pop(chunk))
+                    progress['done'].append(list(chunk))
+                    self._save_progress()
+
+            return self._refill(executor, pair, period, start, end)
+
+    def gaps(self, pair, period, start, end):
+        """Time ranges with missing candles in the stored series."""
+        length = self.api.period_seconds(period) * 1000
+        times = [start - length] + [x for x in self.store.file(
+            self.exchange, pair, period).times() if start <= x < end] + [end]
+
+        return [(times[i] + length, times[i + 1]) for i in range(len(times) - 1)
+                if times[i + 1] - times[i] > length]
+
+    def refill(self, pair, period, start, end):
+        """Request the gaps of the stored series again, returning the ones still missing.
+
+        Gaps are only requested once, as periods without trades have no candles.
+        """
+        with ThreadPoolExecutor(self.workers) as executor:
+            return self._refill(executor, pair, period, start, end)
+
+    # Internal methods
+
+    def _refill(self, executor, pair, period, start, end):
+        candle_file = self.store.file(self.exchange, pair, period)
+        progress = self._key_progress(pair, period)
+        gaps = [x for x in self.gaps(pair, period, start, end) if list(x) not in
+                progress['gaps']]
+
+        # Gaps are fetched concurrently and merged into the file at once
+        candles = []
+
+        for result in executor.map(lambda x: self._fetch(pair, period, *x), gaps):
+            candles += result
+
+        if candles:
+            candle_file.merge(candles)
+
+        progress['gaps'] += [list(x) for x in gaps]
+        self._save_progress()
+
+        return self.gaps(pair, period, start, end)
+
+    def _fetch(self, pair, period, start, end):
+        length = self.api.period_seconds(period) * 1000
+        candles = []
+
+        while start < end:
+            result = self.api.ohlc_history(pair, period, start, end, limit=self.chunk)
+            candles += result
+
+            if len(result) < self.chunk or result[-1].time + length >= end:
+                break
+
+            start = result[-1].time + 1
+
+        return candles
+
+    @staticmethod
+    def _write(candle_file, candles):
+        if not candles:
+            return
+
+        if candle_file.last_time is None or candles[0].time >= candle_file.last_time:
+            candle_file.append(candles)
+
+        else:
+            candle_file.merge(candles)
+
+    def _key_progress(self, pair, period):
+        key = '{}-{}-{}'.format(self.exchange, pair, period)
+
+        with self._lock:
+            return self._progress.setdefault(key, {'done': [], 'gaps': []})
+
+    def _load_progress(self):
+        if not os.path.exists(self.progress_path):
+            return {}
+
+        with open(self.progress_path) as f:
+            return json.load(f)
+
+    def _save_progress(self):
+        with self._lock:
+            with open(self.progress_path + '.tmp', 'w') as f:
+                json.dump(self._progress, f)
+
+            os.replace(self.progress_path + '.tmp', self.progress_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='backfill the candle history of pairs')
+    parser.add_argument('-w', '--workers', type=int, default=4, help='concurrent requests')
+    parser.add_argument('-c', '--chunk', type=int, default=1000, help='candles per request')
+    parser.add_argument('-e', '--end', help='end date (YYYY-MM-DD), now if not given')
+    parser.add_argument('-p', '--period', action='append', choices=ExchangeAPI.PERIODS,
+                        help='candle period, all if not given')
+    parser.add_argument('root', help='candle store directory')
+    parser.add_argument('start', help='start date (YYYY-MM-DD)')
+    parser.add_argument('pair', nargs='*', choices=ExchangeAPI.PAIRS, help='asset pairs')
+
+    args = parser.parse_args()
+
+    fileConfig('logging.conf')
+    logger = getLogger(__name__)
+
+    start = _timestamp(args.start)
+    end = _timestamp(args.end) if args.end else int(1000 * time.time())
+
+    with BitfinexAPI() as api, CandleStore(args.root) as store:
+        backfill = Backfill(api, store, 'bitfinex', chunk=args.chunk, workers=args.workers)
+
+        for pair in args.pair if args.pair else ExchangeAPI.PAIRS:
+            for period in args.period if args.period else ExchangeAPI.PERIODS:
+                if period not in BitfinexAPI.PERIOD_KEYS:
+                    logger.warning('period {} not available, skipping'.format(period))
+                    continue
+
+                gaps = backfill.run(pair, period, start, end)
+                logger.info('{} {} done, {} gaps left'.format(pair, period, len(gaps)))
+
+
+def _timestamp(date):
+    return int(1000 * datetime.strptime(date, '%Y-%m-%d').replace(
+        tzinfo=timezone.utc).timestamp())
@@ -0,0 +1,268 @@
+import mmap
+import os
+import struct
+import sys
+import threading
+
+from array import array
+from decimal import Decimal
+
+from venice.api.candle_series import CandleSeries
+from venice.api.ohlc import OHLC
+
+
+class CandleStoreException(Exception):
+    pass
+
+
+class CandleFile:
+    """Append-only file of candles of one exchange, pair and period.
+
+    After a header, candles are stored as fixed-width records of little-endian 64 bit integers:
+    the time in milliseconds followed by open, high, low, close and volume scaled by
+    ``10 ** scale``. Records are kept sorted by time, so the time column is an index searched in
+    O(log n). Reads go through a memory map of the file, which is checked once per call, and
+    decode the records they return in bulk.
+    """
+    MAGIC = b'VNCANDLE'
+    VERSION = 1
+
+    HEADER = struct.Struct('<8sII')
+    RECORD = struct.Struct('<qqqqqq')
+    TIME = struct.Struct('<q')
+
+    def __init__(self, path, scale=8):
+        self.path = path
+
+        if not os.path.exists(path):
+            with open(path, 'wb') as f:
+                f.write(self.HEADER.pack(self.MAGIC, self.VERSION, scale))
+
+        self._file = open(path, 'r+b')
+        self._map = None
+        self._lock = threading.RLock()
+
+        magic, version, self.scale = self.HEADER.unpack(self._file.read(self.HEADER.size))
+
+        if magic != self.MAGIC or version != self.VERSION:
+            self._file.close()
+            raise CandleStoreException('{} is not a candle file'.format(path))
+
+        self._factor = Decimal(10) ** self.scale
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type_, value, traceback):
+        self.close()
+
+    def __len__(self):
+        return (self._size() - self.HEADER.size) // self.RECORD.size
+
+    def close(self):
+        with self._lock:
+            if self._map:
+                self._map.close()
+                self._map = None
+
+            self._file.close()
+
+    @property
+    def first_time(self):
+        with self._lock:
+            data = self._memory_map()
+            return self._time(data, 0) if self._count(data) else None
+
+    @property
+    def last_time(self):
+        with self._lock:
+            data = self._memory_map()
+            count = self._count(data)
+
+            return self._time(data, count - 1) if count else None
+
+    def append(self, candles):
+        """Append candles newer than the stored ones.
+
+        A candle with the same time as the last stored one replaces it, so the forming candle can
+        be updated. Older candles raise CandleStoreException, they need merge().
+        """
+        with self._lock:
+            last_time = self.last_time
+            count = len(self)
+
+            for ohlc in candles:
+                if last_time is not None and ohlc.time < last_time:
+                    raise CandleStoreException('candle {} older than last stored {}'.format(
+                        ohlc.time, last_time))
+
+                if ohlc.time == last_time:
+                    count -= 1
+
+                self._file.seek(self.HEADER.size + count * self.RECORD.size)
+                self._file.write(self._pack(ohlc))
+
+                last_time = ohlc.time
+                count += 1
+
+            self._file.flush()
+
+    def merge(self, candles):
+        """Insert candles anywhere in the file, replacing stored ones with the same time.
+
+        The file is rewritten, so appending is preferred whenever possible.
+        """
+        with self._lock:
+            merged = {x.time: x for x in self.range()}
+            merged.update((x.time, x) for x in candles)
+
+            temporary_path = self.path + '.tmp'
+
+            with open(temporary_path, 'wb') as f:
+                f.write(self.HEADER.pack(self.MAGIC, self.VERSION, self.scale))
+
+                for time in sorted(merged):
+                    f.write(self._pack(merged[time]))
+
+            if self._map:
+                self._map.close()
+                self._map = None
+
+            self._file.close()
+            os.replace(temporary_path, self.path)
+            self._file = open(self.path, 'r+b')
+
+    def index(self, time):
+        """Position of the first candle at or after time."""
+        with self._lock:
+            return self._index(self._memory_map(), time)
+
+    def range(self, start=None, end=None):
+        """Candles with start <= time < end, from oldest to newest."""
+        with self._lock:
+            return self._candles(*self._bounds(start, end))
+
+    def series(self, start=None, end=None, size=None):
+        """Candles with start <= time < end as a CandleSeries.
+
+        The records are read column by column and the prices are only decoded to Decimal when
+        they are read, so float and fixed-point copies of the columns skip that step.
+        """
+        with self._lock:
+            return CandleSeries.from_columns(
+                self._columns(*self._bounds(start, end)), self.scale, size)
+
+    def last(self, limit):
+        """Latest candles, from oldest to newest."""
+        with self._lock:
+            count = len(self)
+            return self._candles(max(0, count - limit), count)
+
+    def times(self):
+        """Times of every stored candle."""
+        with self._lock:
+            return self._columns(0, len(self))['time'].tolist()
+
+    # Internal methods
+
+    def _size(self):
+        return os.fstat(self._file.fileno()).st_size
+
+    def _memory_map(self):
+        size = self._size()
+
+        if not self._map or len(self._map) != size:
+            if self._map:
+                self._map.close()
+
+            self._map = mmap.mmap(self._file.fileno(), size, access=mmap.ACCESS_READ)
+
+        return self._map
+
+    def _count(self, data):
+        return (len(data) - self.HEADER.size) // self.RECORD.size
+
+    def _offset(self, i):
+        return self.HEADER.size + i * self.RECORD.size
+
+    def _time(self, data, i):
+        return self.TIME.unpack_from(data, self._offset(i))[0]
+
+    def _index(self, data, time):
+        low, high = 0, self._count(data)
+
+        while low < high:
+            middle = (low + high) // 2
+
+            if self._time(data, middle) < time:
+                low = middle + 1
+
+            else:
+                high = middle
+
+        return low
+
+    def _bounds(self, start, end):
+        """Positions of the first candle at or after start and of the first one at or after end."""
+        data = self._memory_map()
+
+        return (self._index(data, start) if start is not None else 0,
+                self._index(data, end) if end is not None else self._count(data))
+
+    def _candles(self, first, last):
+        records = self.RECORD.iter_unpack(self._memory_map()[self._offset(first):self._offset(
+            last)])
+
+        return [OHLC(time, *[Decimal(x).scaleb(-self.scale) for x in values]) for time, *values in
+                records]
+
+    def _columns(self, first, last):
+        """Arrays of the fields of the records from first to last, keyed as CandleSeries.FIELDS."""
+        values = array('q', self._memory_map()[self._offset(first):self._offset(last)])
+
+        if sys.byteorder != 'little':
+            values.byteswap()
+
+        return {x: values[i::len(CandleSeries.FIELDS)] for i, x in enumerate(
+            CandleSeries.FIELDS)}
+
+    def _pack(self, ohlc):
+        return self.RECORD.pack(
+            ohlc.time, *[int((x * self._factor).to_integral_value()) for x in (
+                ohlc.open_, ohlc.high, ohlc.low, ohlc.close, ohlc.volume)])
+
+
+class CandleStore:
+    """Directory of candle files, one per exchange, pair and period."""
+    def __init__(self, root, scale=8):
+        self.root = root
+        self.scale = scale
+
+        self._files = {}
+        self._lock = threading.Lock()
+
+        os.makedirs(root, exist_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type_, value, traceback):
+        self.close()
+
+    def file(self, exchange, pair, period):
+        """Return the candle file, creating it if necessary."""
+        with self._lock:
+            key = (exchange, pair, period)
+
+            if key not in self._files:
+                path = os.path.join(self.root, '{}-{}-{}.candles'.format(*key))
+                self._files[key] = CandleFile(path, self.scale)
+
+            return self._files[key]
+
+    def close(self):
+        with self._lock:
+            for candle_file in self._files.values():
+                candle_file.close()
+
+            self._files = {}
@@ -1,5 +1,8 @@
 from .api import StrategyAPI, StrategyAPIError
+from .live_api import LiveStrategyAPI
+from .memo import IndicatorCache
 from .simulated_api import SimulatedStrategyAPI
+from .snapshot import TickerSnapshot
 from .strategy import Strategy
 
 from . import sma, ema, momentum, trailing, ladder, test, macd
@@ -1,8 +1,11 @@
 from decimal import Decimal
 from logging import getLogger
 
+from ..fixed import FixedSeries, div_round
 from ..util import decimal_places
 from ..api.api import ExchangeAPI
+from ..api.candle_series import CandleSeries
+from .memo import IndicatorCache
 
 
 class StrategyAPIError(Exception):
@@ -24,8 +27,29 @@ class StrategyAPI:
     CONFIRMED = ExchangeAPI.CONFIRMED
     CANCELED = ExchangeAPI.CANCELED
 
-    def __init__(self, api, pair, period, capital):
+    # Minimum number of candles kept in the candle series
+    SERIES_SIZE = 500
+
+    # Types of the prices given to the indicators
+    DECIMAL = 'decimal'
+    FIXED = 'fixed'
+    NUMPY = 'numpy'
+
+    BACKENDS = (DECIMAL, FIXED, NUMPY)
+
+    def __init__(self, api, pair, period, capital, stream=None, tickers=None, backend=DECIMAL,
+                 indicators=None):
         self.api = api
+        self.stream = stream
+        self.tickers = tickers
+        self.indicators = indicators if indicators is not None else IndicatorCache()
+
+        if backend not in self.BACKENDS:
+            raise StrategyAPIError('unknown indicator backend {}'.format(backend))
+
+        # Return prices as Decimal columns, fixed-point series scaled by the pair precision or
+        # float arrays
+        self.backend = backend
 
         self.pair = pair
         self.period = period
@@ -39,13 +63,35 @@ class StrategyAPI:
         self._balance = Decimal.from_float(capital)
 
         # Caching
+        self._book = None
         self._ohlc = None
+        self._series = None
         self._ticker = None
 
     # Basic info
 
+    def candles(self, limit=10):
+        """Latest candles as a CandleSeries view."""
+        ohlc = self.ohlc(limit=limit)
+        series = self._series
+
+        # Rebuilt unless the candles fetched start within the series and reach its last one
+        if (not series or limit > series.size or ohlc[0].time < series.first_time or
+                ohlc[0].time > series.last_time or ohlc[-1].time < series.last_time):
+            series = self._series = CandleSeries(ohlc, size=max(self.SERIES_SIZE, limit))
+
+        else:
+            i = len(ohlc)
+
+            while i and ohlc[i - 1].time >= series.last_time:
+                i -= 1
+
+            series.extend(ohlc[i:])
+
+        return series[-len(ohlc):]
+
     def close(self, limit=10):
-        return [x.close for x in self.ohlc(limit=limit)]
+        return self._prices(self.candles(limit).close())
 
     def currencies(self):
         return self.api.currencies(self.pair)
@@ -58,31 +104,62 @@ class StrategyAPI:
         return self._decimal_places
 
     def high(self, limit=10):
-        return [x.high for x in self.ohlc(limit=limit)]
+        return self._prices(self.candles(limit).high())
 
     def hl2(self, limit=10):
-        ohlc = self.api.ohlc(self.pair, self.period, limit=limit)
-        return [(x.high + x.low)/2 for x in ohlc]
+        series = self.candles(limit)
+        return self._average(series.high(), series.low())
 
     def hlc3(self, limit=10):
-        ohlc = self.api.ohlc(self.pair, self.period, limit=limit)
-        return [(x.high + x.low + x.close)/3 for x in ohlc]
+        series = self.candles(limit)
+        return self._average(series.high(), series.low(), series.close())
+
+    def indicator(self, function, *args, field='close', limit=10):
+        """function(prices, *args) on a price column of the latest candles.
+
+        Results are memoized until the candles change and shared with the strategy APIs given the
+        same indicators cache for the exchange, pair and period, so they must not be modified.
+        """
+        series = self.candles(limit)
+
+        return self.indicators.get(
+            (self.api, self.pair, self.period), series, (field, self.backend, function, args),
+            lambda: function(self._prices(getattr(series, field)()), *args))
 
     def low(self, limit=10):
-        return [x.low for x in self.ohlc(limit=limit)]
+        return self._prices(self.candles(limit).low())
 
     def ohl4(self, limit=10):
-        ohlc = self.api.ohlc(self.pair, self.period, limit=limit)
-        return [(x.high + x.low + x.open_ + x.close)/4 for x in ohlc]
+        series = self.candles(limit)
+        return self._average(series.high(), series.low(), series.open(), series.close())
 
     def ohlc(self, limit=10):
+        if self.stream:
+            candles = self.stream.candles(self.pair, self.period)
+
+            if candles and len(candles) >= limit:
+                return candles[-limit:]
+
         if not self._ohlc or len(self._ohlc) < limit:
             self._ohlc = self.api.ohlc(self.pair, self.period, limit=limit)
 
         return self._ohlc[-limit:]
 
+    def order_book(self):
+        """Order book of the pair."""
+        if self.stream:
+            book = self.stream.book(self.pair)
+
+            if book:
+                return book
+
+        if not self._book:
+            self._book = self.api.order_book(self.pair)
+
+        return self._book
+
     def open(self, limit=10):
-        return [x.open_ for x in self.ohlc(limit=limit)]
+        return self._prices(self.candles(limit).open())
 
     @property
     def precision(self):
@@ -95,11 +172,24 @@ class StrategyAPI:
     @property
     def ticker(self):
         """Current ticker."""
+        if self.stream:
+            ticker = self.stream.ticker(self.pair)
+
+            if ticker:
+                return ticker
+
+        if self.tickers:
+            return self.tickers.get(self.pair)
+
         if not self._ticker:
             self._ticker = self.api.ticker(self.pair)
 
         return self._ticker
 
+    def to_price(self, value):
+        """A Decimal value, such as a threshold, in the type of the prices of the backend."""
+        return float(value) if self.backend == self.NUMPY else value
+
     # Comission and balance
 
     @property
@@ -117,10 +207,15 @@ class StrategyAPI:
 
         return self._balance - used_balance, self._balance
 
-    def volume_max(self, type_):
+    def fill_price(self, direction, volume):
+        """Depth-weighted average price of a market order of volume in the direction."""
+        return self.order_book().fill_price(direction, volume)
+
+    def volume_max(self, type_, reserved=0):
+        """Largest volume of a new order, reserved being held for orders not placed yet."""
         maker_fee, taker_fee = self.api.fees()
-        return (self.balance[0] * (1 - (maker_fee if type_ == self.LIMIT else taker_fee)) /
-                self.ticker.last)
+        return ((self.balance[0] - reserved) * (1 - (maker_fee if type_ == self.LIMIT else
+                                                     taker_fee)) / self.ticker.last)
 
     # Trading statistics
 
@@ -164,36 +259,176 @@ class StrategyAPI:
 
     def cancel(self, name):
         """Command to cancel/deactivate pending orders by referencing their names."""
+        self.cancel_orders([name])
+
+    def cancel_all(self):
+        """Command to cancel all pending orders."""
+        self.cancel_orders([x for x in self.orders if self._pending_order(x)])
+
+    def cancel_orders(self, names):
+        """Cancel the pending orders of several names with a single exchange request.
+
+        Orders that could not be cancelled are left pending, and StrategyAPIError is raised once
+        the others are done.
+        """
         logger = getLogger(__name__)
 
-        if name in self.orders:
-            if (self.BUY in self.orders[name] and
-                    self.orders[name][self.BUY].status == self.PENDING):
-                self._cancel_order(self.orders[name][self.BUY])
-                logger.debug('cancel order {}: {}'.format(name, self.orders[name][self.BUY]))
+        order_statuses = []
 
-            elif (self.SELL in self.orders[name] and
-                    self.orders[name][self.SELL].status == self.PENDING):
-                self._cancel_order(self.orders[name][self.SELL])
-                logger.debug('cancel order {}: {}'.format(name, self.orders[name][self.SELL]))
+        for name in names:
+            if name not in self.orders:
+                raise StrategyAPIError('order {} not found'.format(name))
 
-            else:
+            order_status = self._pending_order(name)
+
+            if not order_status:
                 raise StrategyAPIError('pending order {} not found'.format(name))
 
-        else:
-            StrategyAPIError('order {} not found'.format(name))
+            order_statuses.append(order_status)
 
-    def cancel_all(self):
-        """Command to cancel all pending orders."""
-        for name in self.orders:
-            try:
-                self.cancel(name)
+        failed = self._cancel_checked(order_statuses)
 
-            except StrategyAPIError:
-                pass
+        for name, order_status in zip(names, order_statuses):
+            logger.debug('cancel order {}: {}'.format(name, order_status))
+
+        if failed:
+            raise StrategyAPIError('orders {} not cancelled'.format(', '.join(
+                str(x.id_) for x in failed)))
 
     def order_buy(self, name, type_, volume=0, price=0, price2=0):
         """Place a buy order."""
+        volume = self._check_buy(name, type_, volume)
+        return self._order(name, 'buy', type_, volume, price=price, price2=price2)
+
+    def order_sell(self, name, type_, price=0, price2=0):
+        """Command to place a sell order."""
+        volume = self._check_sell(name)
+        return self._order(name, 'sell', type_, volume, price=price, price2=price2)
+
+    def add_orders(self, orders):
+        """Place several buy and sell orders with a single exchange round-trip.
+
+        Each order is a dict with name, direction and type_, plus optional volume (buy orders
+        only), price and price2. Every order is checked before any of them is placed, the volume
+        of each one being held from the balance available to the next ones, and names must not
+        repeat. Returns one result per order, either its order status or the exception raised
+        while placing it.
+        """
+        logger = getLogger(__name__)
+
+        names = [x['name'] for x in orders]
+        duplicates = sorted({x for x in names if names.count(x) > 1})
+
+        if duplicates:
+            raise StrategyAPIError('orders {} given more than once'.format(', '.join(duplicates)))
+
+        volumes = []
+
+        for order in orders:
+            if order['direction'] == self.BUY:
+                volumes.append(self._check_buy(
+                    order['name'], order['type_'], order.get('volume', 0), sum(volumes)))
+
+            else:
+                volumes.append(self._check_sell(order['name']))
+
+        results = self._add_orders([{
+            'pair': self.pair,
+            'direction': x['direction'],
+            'type_': x['type_'],
+            'volume': volume,
+            'price': x.get('price', 0),
+            'price2': x.get('price2', 0),
+        } for x, volume in zip(orders, volumes)])
+
+        for order, result in zip(orders, results):
+            if isinstance(result, Exception):
+                logger.warning('{} order {} failed: {}'.format(
+                    order['direction'], order['name'], result))
+
+            else:
+                self._record_order(order['name'], order['direction'], result)
+
+        return [x if isinstance(x, Exception) else x[0] for x in results]
+
+    def order_status(self, name, direction):
+        if name in self.orders and direction in self.orders[name]:
+            return self.orders[name][direction]
+
+    def update(self):
+        logger = getLogger(__name__)
+
+        pending = [(x, y) for x in self.orders for y in self.orders[x] if
+                   self.orders[x][y].status == self.PENDING]
+        order_statuses = self._update_orders([self.orders[x][y] for x, y in pending])
+
+        for (order_name, order_direction), order_status in zip(pending, order_statuses):
+            self.orders[order_name][order_direction] = order_status
+
+            if order_status.status == self.CONFIRMED:
+                maker_fee, taker_fee = self.api.fees()
+                order_fee = (order_status.cost * (maker_fee if order_status.type_ ==
+                                                  self.LIMIT else taker_fee))
+                self._balance -= order_fee
+
+                logger.debug('order fee={:.5f}, balance={:.5f}'.format(
+                    order_fee, self._balance))
+
+                if order_status.direction == self.BUY:
+                    logger.info('buy order confirmed, name={}, buy={:.5f}'.format(
+                        order_name, order_status.avg_price))
+
+                else:  # Sell order
+                    buy_order = self.orders[order_name][self.BUY]
+
+                    self._balance += order_status.cost - buy_order.cost
+
+                    logger.info(
+                        'trade confirmed, name={}, buy={:.5f}, sell={:.5f}, profit={:.5f},'
+                        ' balance={:.5f}'.format(
+                            order_name, buy_order.avg_price, order_status.avg_price,
+                            order_status.cost - buy_order.cost, self._balance))
+
+        for order_name in self.orders:
+            for order_direction in self.orders[order_name]:
+                logger.debug('order {}: {}'.format(
+                    order_name, self.orders[order_name][order_direction]))
+
+        self._book = None
+        self._ohlc = None
+        self._ticker = None
+
+    def clean_up(self):
+        """Cancel the pending orders and sell the confirmed buys at market.
+
+        Cancel failures are logged, failed sells raise StrategyAPIError.
+        """
+        logger = getLogger(__name__)
+
+        self._cancel_checked(self._filter_orders(status=self.PENDING))
+        failed = []
+
+        buys = self._filter_orders(direction=self.BUY, status=self.CONFIRMED)
+        results = self._add_orders([{
+            'pair': self.pair,
+            'direction': self.SELL,
+            'type_': self.MARKET,
+            'volume': x.volume,
+        } for x in buys]) if buys else []
+
+        for order_status, result in zip(buys, results):
+            if isinstance(result, Exception):
+                logger.warning('order {} not sold: {}'.format(order_status, result))
+                failed.append(order_status)
+
+        if failed:
+            raise StrategyAPIError('orders {} not sold'.format(', '.join(
+                str(x.id_) for x in failed)))
+
+    # Internal methods
+
+    def _check_buy(self, name, type_, volume, reserved=0):
+        """Check that a buy order can be placed, returning its volume."""
         if name in self.orders:
             if (self.BUY in self.orders[name] and
                     self.orders[name][self.BUY].status == self.CONFIRMED and
@@ -206,7 +441,7 @@ class StrategyAPI:
                 raise StrategyAPIError('buy order {} already exists: {}'.format(
                     name, self.orders[name][self.BUY]))
 
-        volume_max = self.volume_max(type_)
+        volume_max = self.volume_max(type_, reserved)
 
         if volume and volume > volume_max:
             raise StrategyAPIError('volume {:.5f} is higher than maximum {:.5f} '.format(
@@ -215,10 +450,10 @@ class StrategyAPI:
         elif not volume:
             volume = volume_max
 
-        return self._order(name, 'buy', type_, volume, price=price, price2=price2)
+        return volume
 
-    def order_sell(self, name, type_, price=0, price2=0):
-        """Command to place a sell order."""
+    def _check_sell(self, name):
+        """Check that a sell order can be placed, returning its volume."""
         if (name not in self.orders or self.BUY not in self.orders[name] or
                 self.orders[name][self.BUY].status != self.CONFIRMED):
             raise StrategyAPIError('buy order {} not found'.format(name))
@@ -228,81 +463,73 @@ class StrategyAPI:
             raise StrategyAPIError('sell order {} already exists: {}'.format(
                 name, self.orders[name][self.SELL]))
 
-        volume = self.orders[name][self.BUY].volume
+        return self.orders[name][self.BUY].volume
 
-        return self._order(name, 'sell', type_, volume, price=price, price2=price2)
+    def _order(self, name, direction, type_, volume, price=0, price2=0):
+        order_statuses = self._add_order(
+            self.pair, direction, type_, volume=volume, price=price, price2=price2)
 
-    def order_status(self, name, direction):
-        if name in self.orders and direction in self.orders[name]:
-            return self.orders[name][direction]
+        return self._record_order(name, direction, order_statuses)
 
-    def update(self):
+    def _record_order(self, name, direction, order_statuses):
         logger = getLogger(__name__)
 
-        for order_name in self.orders:
-            for order_direction in self.orders[order_name]:
-                order_status = self.orders[order_name][order_direction]
-                if order_status.status == self.PENDING:
-                    self._update_order(order_status)
-
-                    if order_status.status == self.CONFIRMED:
-                        maker_fee, taker_fee = self.api.fees()
-                        order_fee = (order_status.cost * (maker_fee if order_status.type_ ==
-                                                          self.LIMIT else taker_fee))
-                        self._balance -= order_fee
-
-                        logger.debug('order fee={:.5f}, balance={:.5f}'.format(
-                            order_fee, self._balance))
+        if len(order_statuses) > 1:
+            raise StrategyAPIError('orders with multiple order statuses not supported')
 
-                        if order_status.direction == self.BUY:
-                            logger.info('buy order confirmed, name={}, buy={:.5f}'.format(
-                                order_name, order_status.avg_price))
+        if name not in self.orders:
+            self.orders[name] = {}
 
-                        else:  # Sell order
-                            buy_order = self.orders[order_name][self.BUY]
+        self.orders[name][direction] = order_statuses[0]
 
-                            self._balance += order_status.cost - buy_order.cost
+        logger.debug('new {} order {}: {}'.format(direction, name, order_statuses[0]))
 
-                            logger.info(
-                                'trade confirmed, name={}, buy={:.5f}, sell={:.5f}, profit={:.5f},'
-                                ' balance={:.5f}'.format(
-                                    order_name, buy_order.avg_price, order_status.avg_price,
-                                    order_status.cost - buy_order.cost, self._balance))
+        return order_statuses[0]
 
-                    self.orders[order_name][order_direction] = order_status
+    def _cancel_checked(self, order_statuses):
+        """Cancel orders, logging and returning the ones that could not be cancelled."""
+        logger = getLogger(__name__)
 
-                logger.debug('order {}: {}'.format(
-                    order_name, order_status))
+        if not order_statuses:
+            return []
 
-        self._ohlc = None
-        self._ticker = None
+        failed = []
 
-    def clean_up(self):
-        for order in self._filter_orders(status=self.PENDING):
-            self._cancel_order(order)
+        for order_status, result in zip(order_statuses, self._cancel_orders(order_statuses)):
+            if isinstance(result, Exception):
+                logger.warning('order {} not cancelled: {}'.format(order_status, result))
+                failed.append(order_status)
 
-        for order in self._filter_orders(direction=self.BUY, status=self.CONFIRMED):
-            self._add_order(self.pair, self.SELL, self.MARKET, volume=order.volume)
+        return failed
 
-    # Internal methods
+    def _pending_order(self, name):
+        """Pending buy order of a name, or its pending sell order."""
+        for direction in [self.BUY, self.SELL]:
+            if (direction in self.orders[name] and
+                    self.orders[name][direction].status == self.PENDING):
+                return self.orders[name][direction]
 
-    def _order(self, name, direction, type_, volume, price=0, price2=0):
-        logger = getLogger(__name__)
+    def _average(self, *columns):
+        """Average of price columns, bar by bar, in the type of the backend."""
+        prices = [self._prices(x) for x in columns]
 
-        order_statuses = self._add_order(
-            self.pair, direction, type_, volume=volume, price=price, price2=price2)
+        if self.backend == self.FIXED:
+            return FixedSeries([div_round(sum(x), len(prices)) for x in zip(
+                *[y.values for y in prices])], self.precision)
 
-        if len(order_statuses) > 1:
-            raise StrategyAPIError('orders with multiple order statuses not supported')
+        if self.backend == self.NUMPY:
+            return sum(prices) / len(prices)
 
-        if name not in self.orders:
-            self.orders[name] = {}
+        return [sum(x) / len(prices) for x in zip(*prices)]
 
-        self.orders[name][direction] = order_statuses[0]
+    def _prices(self, column):
+        if self.backend == self.FIXED:
+            return column.fixed(self.precision)
 
-        logger.debug('new {} order {}: {}'.format(direction, name, order_statuses[0]))
+        if self.backend == self.NUMPY:
+            return column.array()
 
-        return order_statuses[0]
+        return column.list()
 
     def _filter_orders(self, name=None, direction=None, status=None):
         filtered_orders = []
@@ -320,11 +547,33 @@ class StrategyAPI:
 
     # Parent internal methods
 
+    def _update_orders(self, order_statuses):
+        """Current statuses of the given orders, in the same order."""
+        return [self._update_order(x) for x in order_statuses]
+
     def _update_order(self, order_status):
         raise NotImplementedError
 
+    def _cancel_orders(self, order_statuses):
+        """Cancel orders, one result per order: None or the exception raised while cancelling."""
+        results = []
+
+        for order_status in order_statuses:
+            try:
+                self._cancel_order(order_status)
+                results.append(None)
+
+            except Exception as e:
+                results.append(e)
+
+        return results
+
     def _cancel_order(self, order_status):
         raise NotImplementedError
 
+    def _add_orders(self, orders):
+        """Place several orders given as dicts of _add_order arguments, one result per order."""
+        return [self._add_order(**x) for x in orders]
+
     def _add_order(self, pair, direction, type_, volume=0, price=0, price2=0):
         raise NotImplementedError
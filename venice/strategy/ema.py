@@ -50,12 +50,14 @@ class EMAStrategy(Strategy):
     def run(self):
         logger = getLogger(__name__)
 
-        close = self.api.close(limit=100)
-        high = self.api.high(limit=100)
-        low = self.api.low(limit=100)
+        candles = self.api.candles(limit=100)
+        close = candles.close()
+        high = candles.high()
+        low = candles.low()
+        epsilon = self.api.to_price(self.epsilon)
 
-        ema_fast = ema(close, self.fast_ema)
-        ema_slow = ema(close, self.slow_ema)
+        ema_fast = self.api.indicator(ema, self.fast_ema, limit=100)
+        ema_slow = self.api.indicator(ema, self.slow_ema, limit=100)
 
         if self.cross and not self.first_cross and ema_fast[-1] < ema_slow[-1]:
             self.first_cross = True
@@ -78,14 +80,14 @@ class EMAStrategy(Strategy):
             elif self.pending.status == self.api.CANCELED:
                 self.pending = None
 
-        if ema_fast[-1] - ema_slow[-1] > self.epsilon and not self.current and not self.pending:
+        if ema_fast[-1] - ema_slow[-1] > epsilon and not self.current and not self.pending:
             if self.cross and not self.first_cross:
                 logger.debug('EMA is higher but first cross has not been achieved')
 
             else:
                 self.pending = self.api.order_buy('EMA', self.api.STOP, price=high[-1])
 
-        elif ema_fast[-1] - ema_slow[-1] < -self.epsilon:
+        elif ema_fast[-1] - ema_slow[-1] < -epsilon:
                 # Buy order pending
                 if self.pending and not self.current:
                     self.api.cancel()
@@ -0,0 +1,88 @@
+"""Fixed-point versions of the indicators, working on the integers of a FixedSeries.
+
+Results match the Decimal indicators rounded to the places of the series. Recursive averages
+are kept with GUARD extra digits between steps so that rounding errors do not accumulate, and
+with more for rsi, whose result is a ratio of two averages.
+"""
+from ..fixed import FixedSeries, div_round
+
+GUARD = 10 ** 4
+
+
+def sma(source, length):
+    values = source.values
+    result = []
+    total = 0
+
+    for x in range(0, len(values)):
+        total += values[x]
+
+        if x >= length:
+            total -= values[x - length]
+
+        result.append(div_round(total, length))
+
+    return FixedSeries(result, source.places)
+
+
+def ema(source, length):
+    values = source.values
+
+    # m * x + (1 - m) * previous, with m = 2 / (length + 1)
+    average = div_round(sum(values[0:length]) * GUARD, length)
+    result = [div_round(average, GUARD)]
+
+    for i in range(length, len(values)):
+        average = div_round(2 * values[i] * GUARD + (length - 1) * average, length + 1)
+        result.append(div_round(average, GUARD))
+
+    return FixedSeries(result, source.places)
+
+
+def macd(fast_length, slow_length, source, signal_length):
+    return macd_ema(ema(source, fast_length), ema(source, slow_length), signal_length)
+
+
+def macd_ema(fast_ema, slow_ema, signal_length):
+    places = slow_ema.places
+    fast_ema = fast_ema.values[len(fast_ema.values) - len(slow_ema.values):]
+    slow_ema = slow_ema.values
+
+    macd_ = [fast_ema[i] - slow_ema[i] for i in range(0, len(slow_ema))]
+    signal = ema(FixedSeries(macd_, places), signal_length).values
+
+    macd_ = macd_[len(macd_) - len(signal):]
+
+    histogram = [macd_[i] - signal[i] for i in range(0, len(signal))]
+
+    return (FixedSeries(macd_, places), FixedSeries(signal, places),
+            FixedSeries(histogram, places))
+
+
+def mom(source, length):
+    values = source.values
+    return FixedSeries([values[x] - values[x - length] if x >= length else values[x] - values[0]
+                        for x in range(0, len(values))], source.places)
+
+
+def rsi(source, length):
+    values = source.values
+
+    # The rsi, 100 * avg_gain / (avg_gain + avg_loss), has places digits up to 100, so the
+    # averages need that many more guard digits whatever the size of the changes
+    guard = GUARD * 100 * 10 ** source.places * length
+
+    change = [0] + [values[x] - values[x - 1] for x in range(1, len(values))]
+
+    gain = [x if x > 0 else 0 for x in change]
+    loss = [-x if x < 0 else 0 for x in change]
+
+    avg_gain = [0] * length + [div_round(sum(gain[1:length + 1]) * guard, length)]
+    avg_loss = [0] * length + [div_round(sum(loss[1:length + 1]) * guard, length)]
+
+    for i in range(length + 1, len(values)):
+        avg_gain.append(div_round(avg_gain[i - 1] * (length - 1) + gain[i] * guard, length))
+        avg_loss.append(div_round(avg_loss[i - 1] * (length - 1) + loss[i] * guard, length))
+
+    return FixedSeries([div_round(100 * 10 ** source.places * x, x + y) if y > 0 else 0 for x, y in
+                        zip(avg_gain, avg_loss)], source.places)
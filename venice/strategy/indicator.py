@@ -1,15 +1,38 @@
 import sys
 
+from collections import deque
+from collections.abc import Sequence
 from decimal import Decimal
+
+from ..fixed import FixedSeries
+from ..util import EPSILON
+from . import fixed_indicator
+
+try:
+    import numpy
+    from . import numpy_indicator
+except ImportError:
+    numpy = None
+
 # from logging import getLogger
 
 
 def sma(source, length):
+    backend = _backend(source)
+
+    if backend:
+        return backend.sma(source, length)
+
     return [sum(source[x - length + 1:x + 1]) / length if x >= length else
             sum(source[0:x + 1]) / length for x in range(0, len(source))]
 
 
 def ema(source, length):
+    backend = _backend(source)
+
+    if backend:
+        return backend.ema(source, length)
+
     result = [sum(source[0:length]) / length]
     multiplier = Decimal(2) / Decimal(length + 1)
 
@@ -20,10 +43,22 @@ def ema(source, length):
 
 
 def macd(fast_length, slow_length, source, signal_length):
-    # logger = getLogger(__name__)
+    backend = _backend(source)
+
+    if backend:
+        return backend.macd(fast_length, slow_length, source, signal_length)
+
+    return macd_ema(ema(source, fast_length), ema(source, slow_length), signal_length)
+
+
+def macd_ema(fast_ema, slow_ema, signal_length):
+    """macd from the fast and slow averages of a source, as given by ema."""
+    backend = _backend(fast_ema)
+
+    if backend:
+        return backend.macd_ema(fast_ema, slow_ema, signal_length)
 
-    fast_ema = ema(source, fast_length)
-    slow_ema = ema(source, slow_length)
+    # logger = getLogger(__name__)
 
     fast_ema = fast_ema[len(fast_ema) - len(slow_ema):]
 
@@ -42,11 +77,21 @@ def macd(fast_length, slow_length, source, signal_length):
 
 
 def mom(source, length):
+    backend = _backend(source)
+
+    if backend:
+        return backend.mom(source, length)
+
     return [source[x] - source[x - length] if x >= length else source[x] - source[0] for x in
             range(0, len(source))]
 
 
 def rsi(source, length):
+    backend = _backend(source)
+
+    if backend:
+        return backend.rsi(source, length)
+
     change = [Decimal(0)] + [source[x] - source[x - 1] for x in range(1, len(source))]
 
     gain = [abs(x) if x > sys.float_info.epsilon else Decimal(0) for x in change]
@@ -66,15 +111,582 @@ def rsi(source, length):
     return [100 - (100/(1 + rel_strength[x])) for x in range(0, len(rel_strength))]
 
 
+def sma_many(source, lengths):
+    """sma of source for each length.
+
+    NumPy arrays are computed in a single pass for every length and give a 2-D array, one row per
+    length. Other sources give the list of the sma results.
+    """
+    if numpy and isinstance(source, numpy.ndarray):
+        return numpy_indicator.sma_many(source, lengths)
+
+    return [sma(source, x) for x in lengths]
+
+
+def ema_many(source, lengths):
+    """ema of source for each length.
+
+    NumPy arrays are computed in a single pass for every length and give a 2-D array, one row per
+    length, aligned to the bars of source with NaN before the first value of each length. Other
+    sources give the list of the ema results.
+    """
+    if numpy and isinstance(source, numpy.ndarray):
+        return numpy_indicator.ema_many(source, lengths)
+
+    return [ema(source, x) for x in lengths]
+
+
+def rsi_many(source, lengths):
+    """rsi of source for each length, as sma_many."""
+    if numpy and isinstance(source, numpy.ndarray):
+        return numpy_indicator.rsi_many(source, lengths)
+
+    return [rsi(source, x) for x in lengths]
+
+
+def rolling_sum(source, length):
+    return RollingSum(length).extend(source)
+
+
+def rolling_max(source, length):
+    return RollingMax(length).extend(source)
+
+
+def rolling_min(source, length):
+    return RollingMin(length).extend(source)
+
+
+def rolling_variance(source, length):
+    return RollingVariance(length).extend(source)
+
+
+def donchian(high, low, length):
+    """Upper, middle and lower Donchian channel."""
+    return Donchian(length).extend(high, low)
+
+
+def atr(high, low, close, length):
+    return ATR(length).extend(high, low, close)
+
+
+def bollinger(source, length, multiplier=2):
+    """Upper, middle and lower Bollinger bands."""
+    return Bollinger(length, multiplier).extend(source)
+
+
+def stochastic(high, low, close, length, signal_length=3):
+    """%K and %D of the stochastic oscillator."""
+    return Stochastic(length, signal_length).extend(high, low, close)
+
+
 def crossover(source, source2):
-    if isinstance(source2, list):
+    if numpy and isinstance(source, numpy.ndarray):
+        return numpy_indicator.crossover(source, source2)
+
+    if isinstance(source2, Sequence):
         return source[-2] <= source2[-2] and source[-1] > source2[-1]
 
     return source[-2] <= source2 and source[-1] > source2
 
 
 def crossunder(source, source2):
-    if isinstance(source2, list):
+    if numpy and isinstance(source, numpy.ndarray):
+        return numpy_indicator.crossunder(source, source2)
+
+    if isinstance(source2, Sequence):
         return source[-2] >= source2[-2] and source[-1] < source2[-1]
 
     return source[-2] >= source2 and source[-1] < source2
+
+
+def _backend(source):
+    """Module computing the indicators for the type of source, None for Decimal sequences."""
+    if isinstance(source, FixedSeries):
+        return fixed_indicator
+
+    if numpy and isinstance(source, numpy.ndarray):
+        return numpy_indicator
+
+    return None
+
+
+# Incremental indicators
+
+
+class Indicator:
+    """Indicator updated one bar at a time, with its values kept in ``result``.
+
+    After the same bars, ``result`` is identical to the one of the batch function. The last bar
+    can be replaced while it is still forming.
+    """
+    def __init__(self):
+        self.result = []
+
+    def update(self, value, replace=False):
+        """Add a bar, or replace the last one, returning the latest value."""
+        if replace and self.result:
+            self._replace(value)
+
+        else:
+            self._add(value)
+
+        return self.result[-1]
+
+    def extend(self, values):
+        for value in values:
+            self.update(value)
+
+        return self.result
+
+    def _add(self, value):
+        raise NotImplementedError
+
+    def _replace(self, value):
+        raise NotImplementedError
+
+
+class RollingSum(Indicator):
+    """Sum of the last length values, or of all of them for the first bars."""
+    def __init__(self, length):
+        super().__init__()
+
+        self.length = length
+
+        self._window = deque()
+        self._total = 0
+
+    def _add(self, value):
+        self._window.append(value)
+        self._total += value
+
+        if len(self._window) > self.length:
+            self._total -= self._window.popleft()
+
+        self.result.append(self._value())
+
+    def _replace(self, value):
+        self._total += value - self._window[-1]
+        self._window[-1] = value
+
+        self.result[-1] = self._value()
+
+    def _value(self):
+        return self._total
+
+
+class SMA(RollingSum):
+    def _value(self):
+        return self._total / self.length
+
+
+class RollingMax(Indicator):
+    """Highest of the last length values.
+
+    Candidates for the highest value are kept in a deque, decreasing from the oldest to the
+    newest: a new value removes the candidates it is higher than or equal to, and the oldest one
+    leaves when it falls out of the window, so each value enters and leaves the deque once.
+    Replacing the last value with a lower one rebuilds the deque from the window.
+    """
+    def __init__(self, length):
+        super().__init__()
+
+        self.length = length
+
+        self._window = deque()
+        self._candidates = deque()
+        self._count = 0
+
+    def _add(self, value):
+        self._window.append(value)
+
+        if len(self._window) > self.length:
+            self._window.popleft()
+
+        self._push(self._count, value)
+        self._count += 1
+
+        self.result.append(self._candidates[0][1])
+
+    def _replace(self, value):
+        previous = self._window[-1]
+        self._window[-1] = value
+
+        if self._better(previous, value):
+            self._candidates.clear()
+
+            for i, x in enumerate(self._window, self._count - len(self._window)):
+                self._push(i, x)
+
+        else:
+            self._push(self._count - 1, value)
+
+        self.result[-1] = self._candidates[0][1]
+
+    def _push(self, index, value):
+        while self._candidates and not self._better(self._candidates[-1][1], value):
+            self._candidates.pop()
+
+        self._candidates.append((index, value))
+
+        if self._candidates[0][0] <= index - self.length:
+            self._candidates.popleft()
+
+    @staticmethod
+    def _better(value, value2):
+        return value > value2
+
+
+class RollingMin(RollingMax):
+    """Lowest of the last length values."""
+    @staticmethod
+    def _better(value, value2):
+        return value < value2
+
+
+class RollingVariance(Indicator):
+    """Population variance of the last length values, with their mean in ``mean``.
+
+    Uses Welford's updates, extended to windows: a value leaving the window is removed by the
+    same update that adds the new one.
+    """
+    def __init__(self, length):
+        super().__init__()
+
+        self.length = length
+        self.mean = Decimal(0)
+
+        self._window = deque()
+        self._m2 = Decimal(0)
+
+    def _add(self, value):
+        self._window.append(value)
+
+        if len(self._window) > self.length:
+            self._slide(self._window.popleft(), value)
+
+        else:
+            delta = value - self.mean
+            self.mean += delta / len(self._window)
+            self._m2 += delta * (value - self.mean)
+
+        self.result.append(self._variance())
+
+    def _replace(self, value):
+        previous = self._window[-1]
+        self._window[-1] = value
+
+        self._slide(previous, value)
+        self.result[-1] = self._variance()
+
+    def _slide(self, old, new):
+        mean = self.mean
+
+        self.mean += (new - old) / len(self._window)
+        self._m2 += (new - old) * (new - self.mean + old - mean)
+
+    def _variance(self):
+        return max(self._m2, Decimal(0)) / len(self._window)
+
+
+class EMA(Indicator):
+    def __init__(self, length):
+        super().__init__()
+
+        self.length = length
+        self.multiplier = Decimal(2) / Decimal(length + 1)
+
+        self._count = 0
+        self._total = 0
+        self._last = None
+        self._previous = None
+
+    def _add(self, value):
+        self._count += 1
+
+        # The first value is the average of the first length values
+        if self._count <= self.length:
+            self._total += value
+            self._last = value
+
+            if self.result:
+                self.result[0] = self._total / self.length
+
+            else:
+                self.result.append(self._total / self.length)
+
+        else:
+            self._previous = self.result[-1]
+            self.result.append(self._average(value))
+
+    def _replace(self, value):
+        if self._count <= self.length:
+            self._total += value - self._last
+            self._last = value
+
+            self.result[0] = self._total / self.length
+
+        else:
+            self.result[-1] = self._average(value)
+
+    def _average(self, value):
+        return value * self.multiplier + self._previous * (1 - self.multiplier)
+
+
+class MACD(Indicator):
+    """MACD line, signal and histogram, kept in ``macd``, ``signal`` and ``histogram``."""
+    def __init__(self, fast_length, slow_length, signal_length):
+        super().__init__()
+
+        self.fast = EMA(fast_length)
+        self.slow = EMA(slow_length)
+        self.signal_ema = EMA(signal_length)
+
+        self.macd = self.result
+        self.signal = self.signal_ema.result
+        self.histogram = []
+
+    def update(self, value, replace=False):
+        """Add a bar, or replace the last one, returning the latest (macd, signal, histogram)."""
+        replace = replace and bool(self.result)
+        length, signal_length = len(self.slow.result), len(self.signal)
+
+        self.fast.update(value, replace)
+        self.slow.update(value, replace)
+
+        # The MACD line only grows once the slow EMA has its first value
+        line = self.fast.result[-1] - self.slow.result[-1]
+        self.signal_ema.update(line, replace or len(self.slow.result) == length)
+
+        if replace or len(self.signal) == signal_length:
+            self.macd[-1] = line
+            self.histogram[-1] = line - self.signal[-1]
+
+        else:
+            self.macd.append(line)
+            self.histogram.append(line - self.signal[-1])
+
+        return self.macd[-1], self.signal[-1], self.histogram[-1]
+
+
+class RSI(Indicator):
+    def __init__(self, length):
+        super().__init__()
+
+        self.length = length
+
+        # Last source value, number of bars and average (or total, for the first bars) gain and
+        # loss, before and after the last bar
+        self._state = (None, 0, Decimal(0), Decimal(0))
+        self._previous = None
+
+    def _add(self, value):
+        self._previous = self._state
+        self._state, rsi_ = self._step(value)
+
+        if not self.result:
+            self.result.extend([self._rsi(Decimal(0), Decimal(0))] * self.length + [rsi_])
+
+        elif self._state[1] <= self.length + 1:
+            self.result[-1] = rsi_
+
+        else:
+            self.result.append(rsi_)
+
+    def _replace(self, value):
+        self._state, self.result[-1] = self._step(value, self._previous)
+
+    def _step(self, value, state=None):
+        source, count, avg_gain, avg_loss = state if state else self._state
+
+        change = value - source if count else Decimal(0)
+
+        gain = abs(change) if change > EPSILON else Decimal(0)
+        loss = abs(change) if change < -EPSILON else Decimal(0)
+
+        if count < self.length:
+            avg_gain, avg_loss = avg_gain + gain, avg_loss + loss
+            rsi_ = self._rsi(avg_gain / self.length, avg_loss / self.length)
+
+        elif count == self.length:
+            avg_gain, avg_loss = (avg_gain + gain) / self.length, (avg_loss + loss) / self.length
+            rsi_ = self._rsi(avg_gain, avg_loss)
+
+        else:
+            avg_gain = (avg_gain * (self.length - 1) + gain) / self.length
+            avg_loss = (avg_loss * (self.length - 1) + loss) / self.length
+            rsi_ = self._rsi(avg_gain, avg_loss)
+
+        return (value, count + 1, avg_gain, avg_loss), rsi_
+
+    @staticmethod
+    def _rsi(avg_gain, avg_loss):
+        rel_strength = avg_gain / avg_loss if avg_loss > EPSILON else Decimal(0)
+        return 100 - (100 / (1 + rel_strength))
+
+
+class Donchian(Indicator):
+    """Highest high and lowest low of the last length bars, in ``upper`` and ``lower``, with
+    their middle in ``middle``."""
+    def __init__(self, length):
+        super().__init__()
+
+        self.highest = RollingMax(length)
+        self.lowest = RollingMin(length)
+
+        self.upper = self.highest.result
+        self.middle = self.result
+        self.lower = self.lowest.result
+
+    def update(self, high, low, replace=False):
+        """Add a bar, or replace the last one, returning the latest (upper, middle, lower)."""
+        replace = replace and bool(self.result)
+
+        upper = self.highest.update(high, replace)
+        lower = self.lowest.update(low, replace)
+
+        _set(self.middle, (upper + lower) / 2, replace)
+
+        return upper, self.middle[-1], lower
+
+    def extend(self, high, low):
+        for values in zip(high, low):
+            self.update(*values)
+
+        return self.upper, self.middle, self.lower
+
+
+class ATR(Indicator):
+    """Average true range, the average of the first length true ranges smoothed like RSI."""
+    def __init__(self, length):
+        super().__init__()
+
+        self.length = length
+
+        # Last close, number of bars and average, before and after the last bar
+        self._state = (None, 0, Decimal(0))
+        self._previous = None
+
+        self.atr = self.result
+
+    def update(self, high, low, close, replace=False):
+        """Add a bar, or replace the last one, returning the latest average."""
+        replace = replace and bool(self.result)
+
+        if not replace:
+            self._previous = self._state
+
+        previous_close, count, average = self._previous
+
+        true_range = high - low
+
+        if previous_close is not None:
+            true_range = max(true_range, abs(high - previous_close), abs(low - previous_close))
+
+        if count < self.length:
+            average = (average * count + true_range) / (count + 1)
+
+        else:
+            average = (average * (self.length - 1) + true_range) / self.length
+
+        self._state = (close, count + 1, average)
+        _set(self.result, average, replace)
+
+        return average
+
+    def extend(self, high, low, close):
+        for values in zip(high, low, close):
+            self.update(*values)
+
+        return self.result
+
+
+class Bollinger(Indicator):
+    """Mean of the last length values in ``middle``, and ``upper`` and ``lower`` bands multiplier
+    standard deviations away from it."""
+    def __init__(self, length, multiplier=2):
+        super().__init__()
+
+        self.multiplier = multiplier
+        self.variance = RollingVariance(length)
+
+        self.upper = []
+        self.middle = self.result
+        self.lower = []
+
+    def update(self, value, replace=False):
+        """Add a bar, or replace the last one, returning the latest (upper, middle, lower)."""
+        replace = replace and bool(self.result)
+
+        width = self.multiplier * self.variance.update(value, replace).sqrt()
+        mean = self.variance.mean
+
+        _set(self.upper, mean + width, replace)
+        _set(self.middle, mean, replace)
+        _set(self.lower, mean - width, replace)
+
+        return self.upper[-1], mean, self.lower[-1]
+
+    def extend(self, values):
+        super().extend(values)
+        return self.upper, self.middle, self.lower
+
+
+class Stochastic(Indicator):
+    """%K, the position of the close in the range of the last length bars, in ``k``, and %D, its
+    simple average over signal_length bars, in ``d``. %K is 50 when the range is empty."""
+    def __init__(self, length, signal_length=3):
+        super().__init__()
+
+        self.highest = RollingMax(length)
+        self.lowest = RollingMin(length)
+        self.signal = SMA(signal_length)
+
+        self.k = self.result
+        self.d = self.signal.result
+
+    def update(self, high, low, close, replace=False):
+        """Add a bar, or replace the last one, returning the latest (%K, %D)."""
+        replace = replace and bool(self.result)
+
+        highest = self.highest.update(high, replace)
+        lowest = self.lowest.update(low, replace)
+
+        k = 100 * (close - lowest) / (highest - lowest) if highest - lowest > EPSILON else \
+            Decimal(50)
+
+        _set(self.k, k, replace)
+
+        return k, self.signal.update(k, replace)
+
+    def extend(self, high, low, close):
+        for values in zip(high, low, close):
+            self.update(*values)
+
+        return self.k, self.d
+
+
+def _set(result, value, replace):
+    if replace:
+        result[-1] = value
+
+    else:
+        result.append(value)
+
+
+def feed(indicators, times, values, last_time=None):
+    """Update indicators with the bars newer than last_time, replacing the one at last_time.
+
+    Returns the time of the latest bar, to be given as last_time on the next call.
+    """
+    start = len(times)
+
+    while start and (last_time is None or times[start - 1] >= last_time):
+        start -= 1
+
+    for time, value in zip(times[start:], values[start:]):
+        for indicator in indicators:
+            indicator.update(value, replace=time == last_time)
+
+        last_time = time
+
+    return last_time
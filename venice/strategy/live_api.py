@@ -2,11 +2,35 @@ from .api import StrategyAPI
 
 
 class LiveStrategyAPI(StrategyAPI):
+    def _update_orders(self, order_statuses):
+        """Reconcile the orders with the exchange.
+
+        Open orders are fetched in one request, and only the few orders no longer open get a
+        status request each. The order history is not used: it allows one request a minute. The
+        cached balance is dropped when an order got filled.
+        """
+        if not order_statuses:
+            return []
+
+        active = {x.id_: x for x in self.api.active_orders()}
+        results = [active.get(x.id_) or self._update_order(x) for x in order_statuses]
+
+        if any(x.executed_volume > y.executed_volume for x, y in zip(results, order_statuses)):
+            self.api.cache.invalidate('balance')
+
+        return results
+
     def _update_order(self, order_status):
         return self.api.order_status(order_status.id_)
 
+    def _cancel_orders(self, order_statuses):
+        return self.api.cancel_orders([x.id_ for x in order_statuses])
+
     def _cancel_order(self, order_status):
         self.api.cancel_order(order_status.id_)
 
+    def _add_orders(self, orders):
+        return self.api.add_orders(orders)
+
     def _add_order(self, *args, **nargs):
         return self.api.add_order(*args, **nargs)
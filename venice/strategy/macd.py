@@ -3,7 +3,7 @@ from logging import getLogger
 from time import time
 
 from .strategy import Strategy
-from .indicator import ema, macd
+from .indicator import ema, macd_ema
 from ..util import EPSILON
 
 
@@ -56,12 +56,17 @@ class MACDStrategy(Strategy):
     def run(self):
         logger = getLogger(__name__)
 
-        close = self.api.close(limit=100)
-        high = self.api.high(limit=100)
-        low = self.api.low(limit=100)
+        candles = self.api.candles(limit=100)
+        close = candles.close()
+        high = candles.high()
+        low = candles.low()
 
-        macd_, signal, histogram = macd(
-            self.fast_length, self.slow_length, close, self.signal_length)
+        epsilon = self.api.to_price(self.epsilon)
+
+        # The averages are the same indicator entries as those of the EMA strategy
+        macd_, signal, histogram = macd_ema(
+            self.api.indicator(ema, self.fast_length, limit=100),
+            self.api.indicator(ema, self.slow_length, limit=100), self.signal_length)
 
         if self.cross and not self.first_cross and macd_[-1] < signal[-1]:
             self.first_cross = True
@@ -85,14 +90,14 @@ class MACDStrategy(Strategy):
             elif self.pending.status == self.api.CANCELED:
                 self.pending = None
 
-        if macd_[-1] - signal[-1] > self.epsilon and not self.current and not self.pending:
+        if macd_[-1] - signal[-1] > epsilon and not self.current and not self.pending:
             if self.cross and not self.first_cross:
                 logger.debug('MACD is higher but first cross has not been achieved')
 
             else:
                 self.pending = self.api.order_buy('MACD', self.api.STOP, price=high[-1])
 
-        elif macd_[-1] - signal[-1] < -self.epsilon:
+        elif macd_[-1] - signal[-1] < -epsilon:
                 # Buy order pending
                 if self.pending and not self.current:
                     self.api.cancel()
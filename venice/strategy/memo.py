@@ -0,0 +1,71 @@
+import threading
+
+from collections import OrderedDict
+
+
+class IndicatorCache:
+    """Indicator results computed on candle series, keeping the size most recently used.
+
+    Entries are keyed by the source of the candles, such as (exchange, pair, period), the window
+    and last candle of the series, and a key naming the indicator and its parameters. Series of
+    the same source holding the same candles share their entries, even when they belong to
+    different strategies. When a newer candle is seen, or the last one is replaced, the entries
+    computed before on that source are dropped.
+    """
+    def __init__(self, size=128):
+        self.size = size
+
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = OrderedDict()
+        self._latest = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, source, series, key, compute):
+        """Result for key on the candles of series from source, calling compute() to get it when
+        it is not cached."""
+        window = series.key
+        last = window[2:]
+
+        with self._lock:
+            latest = self._latest.get(source)
+
+            # Views taken before the latest candle keep their entries
+            if not latest or last[0] >= latest[0]:
+                if latest and last != latest:
+                    self._drop(source)
+
+                self._latest[source] = last
+
+            entry_key = (source, window, key)
+
+            if entry_key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(entry_key)
+
+                return self._entries[entry_key]
+
+            self.misses += 1
+
+        value = compute()
+
+        with self._lock:
+            self._entries[entry_key] = value
+
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._latest.clear()
+
+    def _drop(self, source):
+        for entry_key in [x for x in self._entries if x[0] == source]:
+            del self._entries[entry_key]
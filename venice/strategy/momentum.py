@@ -38,10 +38,11 @@ class MomentumStrategy(Strategy):
     def run(self):
         logger = getLogger(__name__)
 
-        ohlc = self.api.ohlc(limit=self.length + 1)
-        close = [x.close for x in ohlc]
-        high = [x.high for x in ohlc]
-        low = [x.low for x in ohlc]
+        candles = self.api.candles(limit=self.length + 1)
+        close = self.api.close(limit=self.length + 1)
+        high = candles.high()
+        low = candles.low()
+        epsilon = self.api.to_price(EPSILON)
 
         mom0 = mom(close, self.length)
         mom1 = mom(mom0, 1)
@@ -64,14 +65,14 @@ class MomentumStrategy(Strategy):
             elif self.pending.status == self.api.CANCELED:
                 self.pending = None
 
-        if mom0[-1] > EPSILON and mom1[-1] > EPSILON:
+        if mom0[-1] > epsilon and mom1[-1] > epsilon:
             if self.pending and self.pending.direction == self.api.SELL:
                     self.api.cancel('Momentum')
 
             elif not self.current and not self.pending:
                 self.pending = self.api.order_buy('Momentum', self.api.STOP, price=high[-1])
 
-        elif mom0[-1] < -EPSILON and mom1[-1] < -EPSILON:
+        elif mom0[-1] < -epsilon and mom1[-1] < -epsilon:
             if self.pending and self.pending.direction == self.api.BUY:
                     self.api.cancel('Momentum')
 
@@ -0,0 +1,182 @@
+"""NumPy versions of the indicators, working on float64 arrays.
+
+Results match the Decimal indicators within the precision of float64, which makes them suited to
+long series and parameter sweeps. Recursive averages are computed in blocks from the closed form
+of the recurrence, so that no Python loop runs per bar.
+"""
+import math
+import sys
+
+import numpy
+
+# Largest power of ten reached by the inverse decay factors inside a block
+BLOCK_EXPONENT = 100
+
+
+def sma(source, length):
+    total = numpy.cumsum(source)
+    total[length:] -= total[:-length].copy()
+
+    return total / length
+
+
+def ema(source, length):
+    multiplier = 2 / (length + 1)
+    first = source[0:length].sum() / length
+
+    return numpy.concatenate((
+        [first], _recurrence(first, source[length:], 1 - multiplier, multiplier)))
+
+
+def macd(fast_length, slow_length, source, signal_length):
+    return macd_ema(ema(source, fast_length), ema(source, slow_length), signal_length)
+
+
+def macd_ema(fast_ema, slow_ema, signal_length):
+    macd_ = fast_ema[len(fast_ema) - len(slow_ema):] - slow_ema
+    signal = ema(macd_, signal_length)
+
+    macd_ = macd_[len(macd_) - len(signal):]
+
+    return macd_, signal, macd_ - signal
+
+
+def mom(source, length):
+    previous = numpy.empty_like(source)
+    previous[0:length] = source[0]
+    previous[length:] = source[:max(len(source) - length, 0)]
+
+    return source - previous
+
+
+def rsi(source, length):
+    change = numpy.concatenate(([0.], numpy.diff(source)))
+
+    gain = numpy.where(change > sys.float_info.epsilon, numpy.abs(change), 0.)
+    loss = numpy.where(change < -sys.float_info.epsilon, numpy.abs(change), 0.)
+
+    avg_gain = _wilder(gain, length)
+    avg_loss = _wilder(loss, length)
+
+    rel_strength = numpy.zeros_like(avg_gain)
+    numpy.divide(avg_gain, avg_loss, out=rel_strength, where=avg_loss > sys.float_info.epsilon)
+
+    return 100 - 100 / (1 + rel_strength)
+
+
+def sma_many(source, lengths):
+    """sma of source for each length, one per row."""
+    lengths = numpy.asarray(lengths)
+    total = numpy.cumsum(source)
+
+    previous = numpy.zeros((len(lengths), len(source)))
+    index = numpy.arange(len(source))[None, :] - lengths[:, None]
+
+    previous[index >= 0] = total[index[index >= 0]]
+
+    return (total - previous) / lengths[:, None]
+
+
+def ema_many(source, lengths):
+    """ema of source for each length, one per row.
+
+    Rows are aligned to the bars of source: the first value of a length, the average of its first
+    length bars, is at index length - 1, and the values before it are NaN.
+    """
+    lengths = numpy.asarray(lengths)
+    multiplier = 2 / (lengths + 1)
+
+    # Starting from zero, the first value is reached with an input of first / multiplier
+    values = numpy.where(numpy.arange(len(source))[None, :] < lengths[:, None], 0., source)
+    first = numpy.array([source[0:x].sum() / x for x in lengths])
+    values[numpy.arange(len(lengths)), lengths - 1] = first / multiplier
+
+    result = _recurrences(numpy.zeros(len(lengths)), values, 1 - multiplier, multiplier)
+    result[numpy.arange(len(source))[None, :] < lengths[:, None] - 1] = numpy.nan
+
+    return result
+
+
+def rsi_many(source, lengths):
+    """rsi of source for each length, one per row, source being longer than every length."""
+    lengths = numpy.asarray(lengths)
+    change = numpy.concatenate(([0.], numpy.diff(source)))
+
+    gain = numpy.where(change > sys.float_info.epsilon, numpy.abs(change), 0.)
+    loss = numpy.where(change < -sys.float_info.epsilon, numpy.abs(change), 0.)
+
+    avg_gain = _wilder_many(gain, lengths)
+    avg_loss = _wilder_many(loss, lengths)
+
+    rel_strength = numpy.zeros_like(avg_gain)
+    numpy.divide(avg_gain, avg_loss, out=rel_strength, where=avg_loss > sys.float_info.epsilon)
+
+    return 100 - 100 / (1 + rel_strength)
+
+
+def crossover(source, source2):
+    previous, current = _last_two(source2)
+    return bool(source[-2] <= previous and source[-1] > current)
+
+
+def crossunder(source, source2):
+    previous, current = _last_two(source2)
+    return bool(source[-2] >= previous and source[-1] < current)
+
+
+def _wilder(values, length):
+    first = values[1:length + 1].sum() / length
+
+    return numpy.concatenate((numpy.zeros(length), [first], _recurrence(
+        first, values[length + 1:], (length - 1) / length, 1 / length)))
+
+
+def _wilder_many(values, lengths):
+    after = numpy.where(numpy.arange(len(values))[None, :] > lengths[:, None], values, 0.)
+    first = numpy.array([values[1:x + 1].sum() / x for x in lengths])
+
+    # Starting from zero, the first average is reached with an input of first * length
+    after[numpy.arange(len(lengths)), lengths] = first * lengths
+
+    return _recurrences(numpy.zeros(len(lengths)), after, (lengths - 1) / lengths, 1 / lengths)
+
+
+def _recurrence(initial, values, decay, weight):
+    """result[k] = decay * result[k - 1] + weight * values[k], with result[-1] = initial."""
+    return _recurrences(numpy.array([initial]), values[None, :], numpy.array([decay]),
+                        numpy.array([weight]))[0]
+
+
+def _recurrences(initial, values, decay, weight):
+    """_recurrence for each row of values, with a decay, weight and initial value per row.
+
+    Within a block, result[k] = decay ** (k + 1) * (initial + weight * sum(values[j] / decay **
+    (j + 1) for j <= k)), a cumulative sum. Blocks are short enough for the inverse powers of
+    every decay to stay within float64. Rows with no decay are just weighted values.
+    """
+    rows, count = values.shape
+    result = numpy.empty((rows, count))
+
+    decaying = decay > 0
+    decay = numpy.where(decaying, decay, 1.)
+
+    size = max(1, int(BLOCK_EXPONENT / -math.log10(decay.min())) if decay.min() < 1 else count)
+
+    for start in range(0, count, size):
+        block = values[:, start:start + size]
+        powers = decay[:, None] ** numpy.arange(1, block.shape[1] + 1)
+
+        result[:, start:start + block.shape[1]] = powers * (
+            initial[:, None] + weight[:, None] * numpy.cumsum(block / powers, axis=1))
+        initial = result[:, start + block.shape[1] - 1]
+
+    result[~decaying] = weight[~decaying, None] * values[~decaying]
+
+    return result
+
+
+def _last_two(source):
+    if isinstance(source, numpy.ndarray):
+        return source[-2], source[-1]
+
+    return source, source
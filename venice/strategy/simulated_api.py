@@ -1,4 +1,5 @@
 from .api import StrategyAPI
+from ..api.order_book import OrderBookException
 from ..api.order_status import OrderStatus
 
 
@@ -9,7 +10,20 @@ class SimulatedStrategyAPI(StrategyAPI):
     def _add_order(self, pair, direction, type_, volume=0, price=0, price2=0):
         return self._format_order(
             direction, type_, self.pair, volume, price=price, price2=price2,
-            avg_price=(price if type_ == self.LIMIT else self.ticker.last))
+            avg_price=(price if type_ == self.LIMIT else self._market_price(direction, volume)))
+
+    def _market_price(self, direction, volume):
+        """Price of a market order, walking the book when it is streamed."""
+        book = self.stream.book(self.pair) if self.stream else None
+
+        if book:
+            try:
+                return book.fill_price(direction, volume)
+
+            except OrderBookException:
+                pass
+
+        return self.ticker.last
 
     def _update_order(self, order_status):
         ticker = self.ticker
@@ -35,9 +35,9 @@ class SMAStrategy(Strategy):
     def run(self):
         logger = getLogger(__name__)
 
-        close = [x.close for x in self.api.ohlc(limit=80)]
-        sma_fast = sma(close, self.fast_sma)
-        sma_slow = sma(close, self.slow_sma)
+        close = self.api.close(limit=80)
+        sma_fast = self.api.indicator(sma, self.fast_sma, limit=80)
+        sma_slow = self.api.indicator(sma, self.slow_sma, limit=80)
 
         logger.debug('close={}, sma_fast={}, sma_slow={}'.format(
             close[-1], sma_fast[-1], sma_slow[-1]))
@@ -0,0 +1,27 @@
+class TickerSnapshot:
+    """Tickers of several pairs, fetched together with a single request and shared by every
+    StrategyAPI of a cycle.
+
+    The snapshot is kept until cleared, which its owner is expected to do once per cycle. A pair
+    missing from the bulk response is fetched on its own.
+    """
+    def __init__(self, api, pairs):
+        self.api = api
+        self.pairs = list(pairs)
+
+        self._tickers = {}
+
+    def clear(self):
+        self._tickers = {}
+
+    def get(self, pair):
+        if pair not in self.pairs:
+            self.pairs.append(pair)
+
+        if pair not in self._tickers:
+            self._tickers = dict(self.api.tickers(self.pairs))
+
+        if pair not in self._tickers:
+            self._tickers[pair] = self.api.ticker(pair)
+
+        return self._tickers[pair]
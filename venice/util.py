@@ -5,6 +5,11 @@ from decimal import Decimal
 EPSILON = Decimal.from_float(sys.float_info.epsilon)
 
 
+def to_decimal(value):
+    """Convert value to Decimal, without copying values that already are."""
+    return value if isinstance(value, Decimal) else Decimal(value)
+
+
 def decimal_places(precision):
     return Decimal('10') ** -precision
 
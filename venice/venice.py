@@ -31,10 +31,24 @@ def main():
 
     parser = argparse.ArgumentParser(description='bot based on a strategy')
     parser.add_argument('-l', '--live', action="store_true", help='enable live mode')
+    parser.add_argument('-s', '--stream', action="store_true",
+                        help='stream candles and ticker instead of polling (bitfinex only)')
+    parser.add_argument('--cache', metavar='FILE',
+                        help='keep cached fees, pairs and balances in a file across runs')
+    parser.add_argument('--backend', choices=strategy.StrategyAPI.BACKENDS,
+                        default=strategy.StrategyAPI.DECIMAL,
+                        help='compute indicators with Decimal, fixed-point integers or NumPy')
+    parser.add_argument('--record', metavar='FILE', help='record exchange requests to a file')
+    parser.add_argument('--telemetry', type=int, metavar='SECONDS',
+                        help='log request statistics periodically')
+    parser.add_argument('--replay', metavar='FILE',
+                        help='answer exchange requests from a recording instead of the exchange')
     parser.add_argument('exchange', choices=exchange_classes.keys(), help='exchange to be used')
     parser.add_argument('pair', choices=api.ExchangeAPI.PAIRS, help='asset pair')
     parser.add_argument('capital', type=float, help='available initial capital')
-    parser.add_argument('period', choices=api.ExchangeAPI.PERIODS, help='candle period')
+    parser.add_argument('period', type=period, metavar='period',
+                        help='candle period in minutes or with a unit suffix (m, h, d or w), '
+                             'e.g. {}'.format(', '.join(api.ExchangeAPI.PERIODS)))
     parser.add_argument('refresh', type=int, help='time between updates')
 
     # Configure the strategies' subparsers
@@ -62,15 +76,48 @@ def main():
     if args.exchange not in exchange_classes.keys():
         raise ValueError
 
-    chosen_exchange = exchange_classes[args.exchange]()
+    # Record or replay the exchange requests
+    recorder = None
+
+    if args.record:
+        recorder = connection.RequestRecorder(args.record)
+
+    elif args.replay:
+        recorder = connection.RequestReplayer(args.replay)
+
+    cache = api.TTLCache(api.ExchangeAPI.CACHE_TTLS, args.cache) if args.cache else None
+
+    chosen_exchange = exchange_classes[args.exchange](recorder=recorder, cache=cache)
+
+    # Initialize market data streaming
+    stream = None
+
+    if args.stream:
+        if args.exchange != 'bitfinex':
+            parser.error('streaming is only supported for bitfinex')
+
+        stream = api.BitfinexStream()
+
+        # Aggregated periods are polled
+        if args.period in api.bitfinex.BitfinexAPI.PERIOD_KEYS:
+            stream.subscribe_candles(args.pair, args.period)
+
+        stream.subscribe_ticker(args.pair)
+        stream.subscribe_book(args.pair)
+        stream.start()
+
+    # Tickers shared by the strategy APIs, refreshed every cycle
+    tickers = strategy.TickerSnapshot(chosen_exchange, [args.pair])
 
     # Initialize the strategy API
     if args.live:
-        strategy_api = strategy.StrategyAPI(
-            chosen_exchange, args.pair, args.period, args.capital)
+        strategy_api = strategy.LiveStrategyAPI(
+            chosen_exchange, args.pair, args.period, args.capital, stream=stream, tickers=tickers,
+            backend=args.backend)
     else:
         strategy_api = strategy.SimulatedStrategyAPI(
-            chosen_exchange, args.pair, args.period, args.capital)
+            chosen_exchange, args.pair, args.period, args.capital, stream=stream, tickers=tickers,
+            backend=args.backend)
 
     # Initialize the strategy
     chosen_strategy = strategy_classes[args.strategy](strategy_api, **vars(args))
@@ -78,11 +125,19 @@ def main():
     # Add a handler for a strategy specific file
     add_log_file(chosen_strategy)
 
+    telemetry_time = time.time()
+
     while run:
         start_time = time.time()
+        tickers.clear()
+
+        if args.telemetry and start_time - telemetry_time >= args.telemetry:
+            chosen_exchange.telemetry.dump()
+            telemetry_time = start_time
 
         try:
-            new_strategy = chosen_strategy.run()
+            with chosen_exchange.deadline(args.refresh):
+                new_strategy = chosen_strategy.run()
 
             if new_strategy:
                 chosen_strategy = new_strategy
@@ -93,7 +148,8 @@ def main():
         time.sleep(max(args.refresh - (time.time() - start_time), MIN_SLEEP))
 
         try:
-            strategy_api.update()
+            with chosen_exchange.deadline(args.refresh):
+                strategy_api.update()
 
         except Exception:
             logger.exception('error updating strategy api')
@@ -112,6 +168,26 @@ def main():
     except Exception:
         logger.exception('error cleaning up the strategy api')
 
+    if stream:
+        stream.stop()
+
+    if args.record:
+        recorder.close()
+
+    if cache:
+        cache.close()
+
+
+def period(value):
+    """Validate a candle period argument."""
+    try:
+        api.ExchangeAPI.period_seconds(value)
+
+    except ValueError:
+        raise argparse.ArgumentTypeError('invalid period: {}'.format(value))
+
+    return value
+
 
 def configure_parsers(parsers, classes):
     for class_name, class_value in classes.items():